@@ -6,11 +6,29 @@ __version__ = "0.1.0"
 __author__ = "Codeium"
 __email__ = "support@codeium.com"
 
-from socratic.core.agent import SocraticLM
-from socratic.core.dialogue import SocraticDialogue
-from socratic.core.judge import ReasoningJudge
-from socratic.games.reasoning import ReasoningGame
-from socratic.games.creativity import CreativityGame
+from typing import TYPE_CHECKING
+
+from .utils._lazy import make_lazy
+
+if TYPE_CHECKING:
+    from .core.agent import SocraticLM
+    from .core.dialogue import SocraticDialogue
+    from .core.judge import ReasoningJudge
+    from .games.reasoning import ReasoningGame
+    from .games.creativity import CreativityGame
+
+# Public names are imported on first access so that importing the package
+# (or a light submodule such as socratic.utils.monitoring) does not pull in
+# dspy, mem0 or openai.
+_LAZY_IMPORTS = {
+    'SocraticLM': '.core.agent',
+    'SocraticDialogue': '.core.dialogue',
+    'ReasoningJudge': '.core.judge',
+    'ReasoningGame': '.games.reasoning',
+    'CreativityGame': '.games.creativity',
+}
+
+__getattr__, __dir__ = make_lazy(globals(), _LAZY_IMPORTS)
 
 __all__ = [
     'SocraticLM',
@@ -0,0 +1,195 @@
+"""Deterministic stand-ins for the language model and the Mem0 client.
+
+FakeLM answers any DSPy signature in the ChatAdapter output format, with a
+configurable fixed latency and token generation rate. FakeMemory holds a
+synthetic store of configurable size with configurable search and add
+latency. Both produce the same output for the same input on every run, so
+benchmark differences come from the framework, not from the backends.
+"""
+
+import re
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import dspy
+
+_OUTPUT_FIELDS_RE = re.compile(r"Your output fields are:\n(.*?)\n(?:All interactions|In adhering)", re.S)
+_FIELD_RE = re.compile(r"^\d+\. `(\w+)` \(([^)]*)\)", re.M)
+_INPUT_RE = re.compile(r"\[\[ ## (\w+) ## \]\]\n(.*?)(?=\n\n\[\[ ## |\n\nRespond with|\Z)", re.S)
+_WORDS = ("reason", "memory", "context", "question", "answer", "evidence", "socratic",
+          "insight", "premise", "inference", "claim", "example", "because", "therefore")
+
+def _digest(text: str) -> int:
+    """Stable integer hash of a text."""
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+
+def _words(seed: int, count: int) -> str:
+    """Deterministic filler text."""
+    return " ".join(_WORDS[(seed >> (i % 48)) % len(_WORDS)] for i in range(max(1, count)))
+
+class FakeLM(dspy.BaseLM):
+    """Deterministic language model with simulated latency.
+
+    Each call takes latency + completion_tokens / tokens_per_second
+    seconds and returns ChatAdapter-formatted values for the requested
+    output fields: text for str fields, 0.75 for floats, True for bools and
+    JSON lists for list fields.
+    """
+
+    def __init__(self, latency: float = 0.05, tokens_per_second: float = 500.0,
+                 completion_tokens: int = 60, model: str = "fake-lm"):
+        """Initialize the model.
+
+        Args:
+            latency: Fixed seconds per call (time to first token)
+            tokens_per_second: Simulated generation rate
+            completion_tokens: Words generated for each text field
+            model: Model name reported to DSPy
+        """
+        super().__init__(model=model, model_type="chat", temperature=0.0, max_tokens=1000, cache=False)
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _value(self, annotation: str, seed: int, inputs: Dict[str, str]) -> str:
+        """Produce a value for one output field."""
+        annotation = annotation.replace(" ", "").lower()
+        if annotation.startswith("list["):
+            # Listwise fields get one item per element of the first list input
+            count = 3
+            for value in inputs.values():
+                try:
+                    parsed = json.loads(value)
+                except ValueError:
+                    continue
+                if isinstance(parsed, list):
+                    count = len(parsed)
+                    break
+            item = annotation[5:-1]
+            if item in ("float", "int"):
+                return json.dumps([0.75] * count)
+            return json.dumps([_words(seed + i, 8) + "?" for i in range(count)])
+        if annotation in ("float", "int"):
+            return "0.75"
+        if annotation == "bool":
+            return "True" if seed % 2 else "False"
+        return _words(seed, self.completion_tokens)
+
+    def _respond(self, messages: List[Dict[str, Any]]) -> SimpleNamespace:
+        """Build an OpenAI-style response for a chat request."""
+        system = next((m["content"] for m in messages if m["role"] == "system"), "")
+        user = messages[-1]["content"] if messages else ""
+        match = _OUTPUT_FIELDS_RE.search(system)
+        fields = _FIELD_RE.findall(match.group(1)) if match else [("answer", "str")]
+        inputs = dict(_INPUT_RE.findall(user))
+        seed = _digest(user)
+        sections = [f"[[ ## {name} ## ]]\n{self._value(annotation, seed, inputs)}"
+                    for name, annotation in fields]
+        content = "\n\n".join(sections + ["[[ ## completed ## ]]"])
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in messages)
+        completion_tokens = len(content.split())
+        with self._lock:
+            self.calls += 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content, tool_calls=None),
+                                     finish_reason="stop")],
+            usage={"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                   "total_tokens": prompt_tokens + completion_tokens},
+            model=self.model
+        )
+
+    def _delay(self) -> float:
+        """Simulated duration of one call."""
+        return self.latency + self.completion_tokens / self.tokens_per_second
+
+    def forward(self, prompt=None, messages=None, **kwargs):
+        time.sleep(self._delay())
+        return self._respond(messages or [{"role": "user", "content": prompt or ""}])
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        await asyncio.sleep(self._delay())
+        return self._respond(messages or [{"role": "user", "content": prompt or ""}])
+
+class FakeMemory:
+    """Deterministic in-process Mem0 stand-in with simulated latency."""
+
+    def __init__(self, store_size: int = 1000, search_latency: float = 0.02,
+                 add_latency: float = 0.01, user_id: Optional[str] = None):
+        """Initialize the store.
+
+        Args:
+            store_size: Synthetic memories created up front
+            search_latency: Seconds added to each search
+            add_latency: Seconds added to each add
+            user_id: User the synthetic memories belong to (defaults to
+                MEM0_CONFIG["user_id"])
+        """
+        if user_id is None:
+            from socratic.utils.config import MEM0_CONFIG
+            user_id = MEM0_CONFIG["user_id"]
+        self.search_latency = search_latency
+        self.add_latency = add_latency
+        self._lock = threading.Lock()
+        self._memories: List[Dict[str, Any]] = []
+        self._index: Dict[str, set] = {}
+        for i in range(store_size):
+            kind = "insight" if i % 2 else "reasoning_output"
+            self._insert(f"Memory {i}: {_words(_digest(str(i)), 12)}", user_id, {"type": kind})
+
+    def _insert(self, text: str, user_id: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a memory and index its words."""
+        with self._lock:
+            memory = {"id": str(len(self._memories)), "memory": text,
+                      "user_id": user_id, "metadata": dict(metadata)}
+            self._memories.append(memory)
+            for word in set(text.lower().split()):
+                self._index.setdefault(word, set()).add(len(self._memories) - 1)
+        return memory
+
+    def add(self, text: str, user_id: Optional[str] = None,
+            metadata: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        time.sleep(self.add_latency)
+        memory = self._insert(text, user_id, metadata or {})
+        return {"results": [{"id": memory["id"], "memory": text, "event": "ADD"}]}
+
+    def _matches(self, memory: Dict[str, Any], user_id: Optional[str],
+                 filters: Optional[Dict[str, Any]]) -> bool:
+        if user_id is not None and memory["user_id"] != user_id:
+            return False
+        return all(memory["metadata"].get(k) == v for k, v in (filters or {}).items())
+
+    def search(self, query: str, user_id: Optional[str] = None, limit: int = 5,
+               filters: Optional[Dict[str, Any]] = None, **kwargs) -> List[Dict[str, Any]]:
+        time.sleep(self.search_latency)
+        words = set(query.lower().split())
+        scores: Dict[int, int] = {}
+        with self._lock:
+            for word in words:
+                for row in self._index.get(word, ()):
+                    scores[row] = scores.get(row, 0) + 1
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            results = []
+            for row, hits in ranked:
+                memory = self._memories[row]
+                if self._matches(memory, user_id, filters):
+                    results.append(dict(memory, score=hits / max(1, len(words))))
+                    if len(results) >= limit:
+                        break
+        return results
+
+    def get_all(self, user_id: Optional[str] = None, limit: int = 100,
+                filters: Optional[Dict[str, Any]] = None, **kwargs) -> List[Dict[str, Any]]:
+        time.sleep(self.search_latency)
+        with self._lock:
+            matches = [dict(m) for m in self._memories if self._matches(m, user_id, filters)]
+        return matches[:limit]
+
+    def __len__(self) -> int:
+        return len(self._memories)
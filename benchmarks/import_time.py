@@ -0,0 +1,127 @@
+"""Measure cold-start import cost of the Socratic package.
+
+Each target is imported in a fresh interpreter with `python -X importtime`,
+so results reflect a cold start. For every target the benchmark records
+the cumulative import time of the target module, the wall time of the
+interpreter run, and which heavy dependencies (dspy, mem0, openai, numpy)
+were loaded as a side effect.
+
+Usage:
+    python benchmarks/import_time.py [--repeat N] [--output results.json]
+                                     [--max-ms TARGET=MS ...]
+
+Exits with status 1 if a target exceeds its --max-ms threshold.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Any, Dict, List
+
+# Directory that contains the `socratic` package
+PACKAGE_PARENT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+HEAVY_MODULES = ("dspy", "mem0", "openai", "numpy")
+
+DEFAULT_TARGETS = [
+    "socratic",
+    "socratic.utils.config",
+    "socratic.utils.monitoring",
+    "socratic.memory",
+    "socratic.core.agent",
+    "socratic.games.reasoning",
+]
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S.*)$")
+
+def measure(target: str) -> Dict[str, Any]:
+    """Import a module in a fresh interpreter and measure the cost.
+
+    Args:
+        target: Dotted module name to import
+
+    Returns:
+        Dictionary with cumulative import time, wall time and heavy
+        modules loaded
+    """
+    probe = (
+        f"import {target}, sys, json; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PACKAGE_PARENT, env.get("PYTHONPATH")]))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True, text=True, env=env
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative_us = 0
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match and match.group(3).strip() == target:
+            cumulative_us = int(match.group(2))
+    return {
+        'import_ms': cumulative_us / 1000,
+        'wall_ms': wall_ms,
+        'heavy_modules': json.loads(proc.stdout.strip().splitlines()[-1])
+    }
+
+def run(targets: List[str], repeat: int) -> Dict[str, Dict[str, Any]]:
+    """Measure each target several times and keep the median.
+
+    Args:
+        targets: Module names to import
+        repeat: Fresh-interpreter runs per target
+
+    Returns:
+        Mapping from target to its median measurements
+    """
+    results = {}
+    for target in targets:
+        runs = [measure(target) for _ in range(repeat)]
+        results[target] = {
+            'import_ms': statistics.median(r['import_ms'] for r in runs),
+            'wall_ms': statistics.median(r['wall_ms'] for r in runs),
+            'heavy_modules': runs[-1]['heavy_modules']
+        }
+    return results
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--max-ms", action="append", default=[], metavar="TARGET=MS",
+                        help="Fail if TARGET's median import time exceeds MS")
+    args = parser.parse_args()
+
+    results = run(args.targets, args.repeat)
+    for target, result in results.items():
+        heavy = ", ".join(result['heavy_modules']) or "-"
+        print(f"{target:32s} {result['import_ms']:9.1f} ms import "
+              f"{result['wall_ms']:9.1f} ms wall  heavy: {heavy}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2)
+
+    failed = False
+    for threshold in args.max_ms:
+        target, _, limit = threshold.partition("=")
+        if target in results and results[target]['import_ms'] > float(limit):
+            print(f"REGRESSION: {target} imports in {results[target]['import_ms']:.1f} ms "
+                  f"(limit {float(limit):.1f} ms)")
+            failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
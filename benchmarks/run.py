@@ -0,0 +1,256 @@
+"""Offline throughput and latency benchmarks for the Socratic hot paths.
+
+Runs ReasoningGame.forward, ReasoningJudge.forward,
+SocraticDialogue.generate_questions, CreativityGame.forward and
+SocraticSession.run_turn (a full pipelined Socratic turn) against the
+deterministic FakeLM and FakeMemory backends at several concurrency
+levels, and reports throughput and p50/p95/p99 latency per benchmark and
+concurrency level.
+
+Usage:
+    python benchmarks/run.py [--requests N] [--concurrency 1 4 16]
+                             [--lm-latency S] [--search-latency S]
+                             [--store-size N] [--rate-limit] [--output results.json]
+                             [--baseline baseline.json] [--max-regression 0.2]
+
+With --baseline, each result is compared with the matching baseline entry
+and the run exits with status 1 if p95 latency grew, or throughput fell,
+by more than --max-regression (a fraction).
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+# Make the `socratic` package and the benchmark helpers importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# SocraticLM requires a key even though FakeLM never sends a request
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+import dspy
+
+# DSPy warns on every direct predictor.forward() call, which the games make
+logging.getLogger("dspy").setLevel(logging.ERROR)
+
+from fakes import FakeLM, FakeMemory
+from socratic.core.agent import SocraticPredictor
+from socratic.core.dialogue import SocraticDialogue
+from socratic.core.judge import ReasoningJudge
+from socratic.games.creativity import CreativityGame
+from socratic.games.reasoning import ReasoningGame
+from socratic.games.session import SocraticSession
+from socratic.utils.monitoring import PerformanceMonitor
+from socratic.utils.ratelimit import get_scheduler
+
+QUESTIONS = [
+    "When was Barack Obama born?",
+    "How old was Obama when he became president?",
+    "What is the capital of France?",
+    "Why do seasons change?",
+    "What makes an argument valid?",
+    "How does memory improve reasoning?",
+    "What is the difference between evidence and inference?",
+    "Which premise supports this claim?",
+]
+
+def install_lm(component: Any, lm: dspy.BaseLM, depth: int = 2) -> None:
+    """Point every predictor of a component at a language model.
+
+    Args:
+        component: Game, judge or dialogue
+        lm: Language model to use
+        depth: How many attribute levels to search for predictors
+    """
+    for value in list(vars(component).values()):
+        if isinstance(value, SocraticPredictor):
+            value.lm = lm
+        elif depth > 0 and hasattr(value, "__dict__") and value.__class__.__module__.startswith("socratic"):
+            install_lm(value, lm, depth - 1)
+    if hasattr(component, "lm"):
+        component.lm = lm
+
+def build_benchmarks(lm: FakeLM, memory: FakeMemory) -> Dict[str, Callable[[int], Any]]:
+    """Build the benchmarked operations.
+
+    Args:
+        lm: Fake language model
+        memory: Fake memory client
+
+    Returns:
+        Mapping from benchmark name to a function of the request index
+    """
+    game = ReasoningGame(memory_client=memory, search_cache_size=0)
+    judge = ReasoningJudge()
+    dialogue = SocraticDialogue()
+    creativity = CreativityGame()
+    for component in (game, judge, dialogue, creativity):
+        install_lm(component, lm)
+    session = SocraticSession(game)
+
+    def reasoning(i: int) -> Any:
+        result = game.forward(f"{QUESTIONS[i % len(QUESTIONS)]} (#{i})")
+        if isinstance(result, dict) and 'error' in result:
+            raise RuntimeError(result['error'])
+        return result
+
+    return {
+        'reasoning_game.forward': reasoning,
+        'reasoning_judge.forward': lambda i: judge.forward(
+            f"Answer {i}: Barack Obama was born on August 4, 1961 in Honolulu, Hawaii."
+        ),
+        'socratic_dialogue.generate_questions': lambda i: dialogue.generate_questions(
+            f"Context {i}: {QUESTIONS[i % len(QUESTIONS)]}"
+        ),
+        'creativity_game.forward': lambda i: creativity.forward(
+            f"Write a short poem about {QUESTIONS[i % len(QUESTIONS)].lower()} (#{i})"
+        ),
+        'socratic_session.run_turn': lambda i: session.run_turn(
+            f"{QUESTIONS[i % len(QUESTIONS)]} (#{i})"
+        ),
+    }
+
+def run_benchmark(name: str, operation: Callable[[int], Any], requests: int,
+                  concurrency: int) -> Dict[str, Any]:
+    """Run one benchmark at one concurrency level.
+
+    Args:
+        name: Benchmark name
+        operation: Function of the request index
+        requests: Number of requests to issue
+        concurrency: Requests in flight at once
+
+    Returns:
+        Throughput and latency results
+    """
+    monitor = PerformanceMonitor()
+    errors = 0
+
+    def issue(i: int) -> bool:
+        with monitor.span(name) as span:
+            try:
+                operation(i)
+                return True
+            except Exception:
+                span.end(success=False)
+                return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        errors = sum(not ok for ok in executor.map(issue, range(requests)))
+    wall = time.perf_counter() - start
+
+    metrics = monitor.get_metrics(name)
+    return {
+        'benchmark': name,
+        'concurrency': concurrency,
+        'requests': requests,
+        'errors': errors,
+        'wall_s': wall,
+        'throughput_rps': requests / wall if wall else 0.0,
+        'p50_ms': metrics['p50_duration'] * 1000,
+        'p95_ms': metrics['p95_duration'] * 1000,
+        'p99_ms': metrics['p99_duration'] * 1000,
+        'max_ms': metrics['max_duration'] * 1000
+    }
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any],
+            max_regression: float) -> List[str]:
+    """Find results that regressed against a baseline.
+
+    Args:
+        results: Current results
+        baseline: Baseline results file contents
+        max_regression: Allowed fractional slowdown
+
+    Returns:
+        Descriptions of regressions
+    """
+    previous = {(r['benchmark'], r['concurrency']): r for r in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        base = previous.get((result['benchmark'], result['concurrency']))
+        if base is None:
+            continue
+        label = f"{result['benchmark']} @ {result['concurrency']}"
+        if result['p95_ms'] > base['p95_ms'] * (1 + max_regression):
+            regressions.append(f"{label}: p95 {base['p95_ms']:.1f} -> {result['p95_ms']:.1f} ms")
+        if result['throughput_rps'] < base['throughput_rps'] * (1 - max_regression):
+            regressions.append(f"{label}: throughput {base['throughput_rps']:.1f} -> "
+                               f"{result['throughput_rps']:.1f} req/s")
+        if result['errors'] > base.get('errors', 0):
+            regressions.append(f"{label}: errors {base.get('errors', 0)} -> {result['errors']}")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=64, help="Requests per benchmark and level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--only", nargs="+", help="Run only these benchmarks")
+    parser.add_argument("--lm-latency", type=float, default=0.05, help="FakeLM seconds per call")
+    parser.add_argument("--tokens-per-second", type=float, default=500.0)
+    parser.add_argument("--completion-tokens", type=int, default=60)
+    parser.add_argument("--store-size", type=int, default=1000, help="FakeMemory memories")
+    parser.add_argument("--search-latency", type=float, default=0.02, help="FakeMemory seconds per search")
+    parser.add_argument("--rate-limit", action="store_true",
+                        help="Keep the configured LM and Mem0 rate limits (off by default so "
+                             "results reflect framework overhead, not the provider quota)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare with a previous results file")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    lm = FakeLM(latency=args.lm_latency, tokens_per_second=args.tokens_per_second,
+                completion_tokens=args.completion_tokens)
+    memory = FakeMemory(store_size=args.store_size, search_latency=args.search_latency)
+    dspy.settings.configure(lm=lm)
+    if not args.rate_limit:
+        for name in ("lm", "mem0"):
+            get_scheduler(name).limiter = None
+    benchmarks = build_benchmarks(lm, memory)
+    if args.only:
+        benchmarks = {name: op for name, op in benchmarks.items() if name in args.only}
+
+    results = []
+    for name, operation in benchmarks.items():
+        operation(0)  # warm up
+        for concurrency in args.concurrency:
+            result = run_benchmark(name, operation, args.requests, concurrency)
+            results.append(result)
+            print(f"{name:40s} c={concurrency:<3d} {result['throughput_rps']:8.1f} req/s  "
+                  f"p50 {result['p50_ms']:8.1f} ms  p95 {result['p95_ms']:8.1f} ms  "
+                  f"p99 {result['p99_ms']:8.1f} ms  errors {result['errors']}")
+
+    report = {
+        'meta': {
+            'timestamp': time.time(),
+            'python': platform.python_version(),
+            'dspy': getattr(dspy, "__version__", "unknown"),
+            'config': vars(args)
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
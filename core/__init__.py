@@ -1,7 +1,21 @@
 """Core components of the Socratic framework."""
 
-from .agent import SocraticLM
-from .dialogue import SocraticDialogue
-from .judge import ReasoningJudge
+from typing import TYPE_CHECKING
+
+from ..utils._lazy import make_lazy
+
+if TYPE_CHECKING:
+    from .agent import SocraticLM
+    from .dialogue import SocraticDialogue
+    from .judge import ReasoningJudge
+
+# Imported on first access to keep `import socratic.core` cheap
+_LAZY_IMPORTS = {
+    'SocraticLM': '.agent',
+    'SocraticDialogue': '.dialogue',
+    'ReasoningJudge': '.judge',
+}
+
+__getattr__, __dir__ = make_lazy(globals(), _LAZY_IMPORTS)
 
 __all__ = ['SocraticLM', 'SocraticDialogue', 'ReasoningJudge']
@@ -1,9 +1,38 @@
 """Base agent components for the Socratic framework."""
 
 import os
+import queue
+import contextvars
+import asyncio
+import threading
 import dspy
-from typing import Optional
-from ..utils.config import load_config
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+from ..utils.cache import TieredCache, build_cache, hash_key
+from ..utils.config import load_config, CACHE_CONFIG
+from ..utils import monitoring
+from ..utils.ratelimit import RetryScheduler, get_scheduler
+from ..utils.trace import get_trace, is_replaying
+
+_response_cache: Optional[TieredCache] = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> Optional[TieredCache]:
+    """Get the process-wide LM response cache.
+    
+    The cache is opt-in: it is only built when CACHE_CONFIG["enabled"]
+    is set (e.g. via the SOCRATIC_CACHE environment variable).
+    
+    Returns:
+        The shared response cache, or None if caching is disabled
+    """
+    global _response_cache
+    if not CACHE_CONFIG["enabled"]:
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = build_cache(CACHE_CONFIG, namespace="lm_response")
+        return _response_cache
 
 class SocraticLM(dspy.LM):
     """Language model wrapper for Socratic reasoning."""
@@ -34,27 +63,341 @@ class SocraticLM(dspy.LM):
             api_key=self.api_key
         )
 
+_lm_registry: Dict[tuple, SocraticLM] = {}
+_lm_registry_lock = threading.RLock()
+
+def get_lm(model: str = "gpt-4", temperature: float = 0.0,
+           max_tokens: int = 1000) -> SocraticLM:
+    """Get the shared language model client for a configuration.
+    
+    One SocraticLM is created per (model, temperature, max_tokens) and
+    shared by every component in the process, so client setup and the
+    underlying HTTP connection pool are reused across games and judges.
+    
+    Args:
+        model: The OpenAI model to use
+        temperature: Temperature for generation
+        max_tokens: Maximum tokens to generate
+        
+    Returns:
+        The shared SocraticLM instance
+    """
+    if is_replaying() and not os.getenv("OPENAI_API_KEY"):
+        # Replayed calls never reach the provider, so no key is needed;
+        # the placeholder client is not shared beyond the replay
+        return SocraticLM(model=model, temperature=temperature,
+                          max_tokens=max_tokens, api_key="replay")
+    key = (model, temperature, max_tokens)
+    with _lm_registry_lock:
+        lm = _lm_registry.get(key)
+        if lm is None:
+            lm = SocraticLM(model=model, temperature=temperature, max_tokens=max_tokens)
+            _lm_registry[key] = lm
+        return lm
+
+def configure_default_lm(lm: Optional[dspy.LM] = None) -> dspy.LM:
+    """Make sure DSPy has a default language model configured.
+    
+    Leaves an existing dspy.settings.lm in place, so components created
+    per request do not reconfigure DSPy globally each time.
+    
+    Args:
+        lm: Model to configure if none is set (defaults to get_lm())
+        
+    Returns:
+        The configured default language model
+    """
+    with _lm_registry_lock:
+        if dspy.settings.lm is None:
+            dspy.settings.configure(lm=lm or get_lm())
+        return dspy.settings.lm
+
+@contextmanager
+def count_token_usage():
+    """Report tokens used by LM calls in the block to the global monitor.
+    
+    Prompt and completion tokens are counted as "lm.prompt_tokens" and
+    "lm.completion_tokens". Does nothing when instrumentation is disabled
+    or the installed DSPy cannot track usage.
+    """
+    monitor = monitoring.get_monitor()
+    try:
+        from dspy.utils.usage_tracker import track_usage
+    except ImportError:
+        track_usage = None
+    if monitor is None or track_usage is None:
+        yield
+        return
+    with track_usage() as tracker:
+        yield
+    for usage in tracker.get_total_tokens().values():
+        monitor.increment("lm.prompt_tokens", usage.get("prompt_tokens") or 0)
+        monitor.increment("lm.completion_tokens", usage.get("completion_tokens") or 0)
+
+def _encode_prediction(prediction: dspy.Prediction) -> Dict[str, Any]:
+    """Convert a prediction to trace data."""
+    return prediction.toDict()
+
+def _decode_prediction(fields: Dict[str, Any]) -> dspy.Prediction:
+    """Rebuild a prediction from trace data."""
+    return dspy.Prediction(**fields)
+
 class SocraticPredictor(dspy.Predict):
     """Base predictor for Socratic reasoning tasks."""
     
     def __init__(self, signature: Optional[str] = None, 
-                 instructions: Optional[str] = None):
+                 instructions: Optional[str] = None,
+                 cache: Optional[TieredCache] = None,
+                 cache_nondeterministic: bool = False,
+                 scheduler: Optional[RetryScheduler] = None):
         """Initialize the predictor.
         
         Args:
             signature: The signature for the predictor
             instructions: Instructions for the predictor
+            cache: Optional response cache (defaults to the process-wide
+                cache when CACHE_CONFIG["enabled"] is set)
+            cache_nondeterministic: Whether to also cache responses
+                generated with a non-zero temperature
+            scheduler: Optional rate limiter and retry scheduler for model
+                calls (defaults to the process-wide "lm" scheduler)
         """
         if signature is None:
             signature = "input -> output"
         super().__init__(signature)
         if instructions and hasattr(self.signature, 'with_instructions'):
             self.signature = self.signature.with_instructions(instructions)
-        self.lm = dspy.settings.lm
+        self.cache = cache if cache is not None else get_response_cache()
+        self.cache_nondeterministic = cache_nondeterministic
+        self.scheduler = scheduler or get_scheduler("lm")
+        
+    def resolve_lm(self) -> dspy.LM:
+        """Get the language model for a call.
+        
+        The LM is resolved on every call rather than fixed at construction:
+        the predictor's own lm if one was assigned, else the configured
+        dspy.settings.lm (including dspy.context overrides), else the shared
+        default client from get_lm().
+        
+        Returns:
+            Language model to call
+        """
+        return self.lm or dspy.settings.lm or get_lm()
+        
+    def _cache_key(self, inputs: Dict[str, Any]) -> Optional[str]:
+        """Build the response cache key for a call.
+        
+        Args:
+            inputs: Keyword arguments of the call
+            
+        Returns:
+            Cache key, or None if the call should not be cached
+        """
+        if self.cache is None:
+            return None
+        lm = self.resolve_lm()
+        model = getattr(lm, "model", None)
+        temperature = getattr(lm, "kwargs", {}).get("temperature")
+        config = inputs.get("config") or {}
+        temperature = config.get("temperature", temperature)
+        if temperature and not self.cache_nondeterministic:
+            return None
+        return hash_key(
+            getattr(self.signature, "signature", str(self.signature)),
+            getattr(self.signature, "instructions", None),
+            model,
+            temperature,
+            inputs
+        )
+        
+    def _cached_response(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Look up a cached response.
+        
+        Args:
+            key: Cache key, or None if the call is not cacheable
+            
+        Returns:
+            The cached prediction fields, or None on a miss
+        """
+        if key is None:
+            return None
+        cached = self.cache.get(key)
+        monitoring.increment("lm_cache.hits" if cached is not None else "lm_cache.misses")
+        return cached
+        
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get response cache statistics.
+        
+        Returns:
+            Hit/miss statistics, or an empty dict if caching is disabled
+        """
+        return self.cache.get_stats() if self.cache is not None else {}
+        
+    def _trace_request(self, inputs: Dict[str, Any]) -> tuple:
+        """Describe a call for record/replay.
+        
+        Args:
+            inputs: Keyword arguments of the call
+            
+        Returns:
+            (operation, request) identifying the call in a trace
+        """
+        signature = getattr(self.signature, "signature", str(self.signature))
+        request = {
+            'instructions': getattr(self.signature, "instructions", None),
+            'inputs': inputs
+        }
+        return signature, request
+        
+    def _predict(self, kwargs: Dict[str, Any]) -> dspy.Prediction:
+        """Serve a call from the response cache or the language model."""
+        key = self._cache_key(kwargs)
+        cached = self._cached_response(key)
+        if cached is not None:
+            return dspy.Prediction(**cached)
+        with count_token_usage():
+            result = self.scheduler.call(super().forward, **{'lm': self.resolve_lm(), **kwargs})
+        if key is not None:
+            self.cache.set(key, result.toDict())
+        return result
+        
+    async def _apredict(self, kwargs: Dict[str, Any]) -> dspy.Prediction:
+        """Asynchronous counterpart of _predict."""
+        key = self._cache_key(kwargs)
+        cached = self._cached_response(key)
+        if cached is not None:
+            return dspy.Prediction(**cached)
+        parent = getattr(super(), "aforward", None) or super().forward
+        with count_token_usage():
+            result = await self.scheduler.acall(parent, **{'lm': self.resolve_lm(), **kwargs})
+        if key is not None:
+            self.cache.set(key, result.toDict())
+        return result
         
     def forward(self, **kwargs):
-        """Forward pass for prediction."""
+        """Forward pass for prediction.
+        
+        When a trace session is active (see utils/trace.py) the call is
+        recorded, or served from the recording instead of the model.
+        """
+        try:
+            trace = get_trace()
+            if trace is None:
+                return self._predict(kwargs)
+            operation, request = self._trace_request(kwargs)
+            return trace.call("lm", operation, request, lambda: self._predict(kwargs),
+                              encode=_encode_prediction, decode=_decode_prediction)
+        except Exception as e:
+            raise RuntimeError(f"Prediction failed: {str(e)}")
+
+    async def aforward(self, **kwargs):
+        """Asynchronous forward pass for prediction.
+
+        Uses DSPy's native async path when available and otherwise runs
+        the blocking forward pass in the default executor. Calls go through
+        the same rate limiter, retry scheduler and trace session as forward.
+        """
         try:
-            return super().forward(**kwargs)
+            trace = get_trace()
+            if trace is None:
+                return await self._apredict(kwargs)
+            operation, request = self._trace_request(kwargs)
+            return await trace.acall("lm", operation, request, lambda: self._apredict(kwargs),
+                                     encode=_encode_prediction, decode=_decode_prediction)
         except Exception as e:
             raise RuntimeError(f"Prediction failed: {str(e)}")
+
+    async def astream(self, field: str, **kwargs) -> AsyncIterator[Any]:
+        """Stream the text of one output field as it is generated.
+        
+        Yields text chunks (str) for the given output field as they arrive
+        from the language model, followed by the final dspy.Prediction. If
+        token streaming is unavailable (older DSPy, cached response, or a
+        model that does not stream), the whole field text is yielded as a
+        single chunk before the prediction.
+        
+        Args:
+            field: Name of the output field to stream
+            **kwargs: Inputs for the prediction
+            
+        Yields:
+            Text chunks, then the final prediction
+        """
+        streamify = getattr(dspy, "streamify", None)
+        if streamify is None:
+            result = await self.aforward(**kwargs)
+            yield str(getattr(result, field, ""))
+            yield result
+            return
+            
+        from dspy.streaming import StreamListener, StreamResponse
+        program = streamify(
+            self,
+            stream_listeners=[StreamListener(signature_field_name=field, predict=self)],
+            is_async_program=True
+        )
+        streamed = False
+        async for item in program(**kwargs):
+            if isinstance(item, StreamResponse):
+                if item.signature_field_name == field and item.chunk:
+                    streamed = True
+                    yield item.chunk
+            elif isinstance(item, dspy.Prediction):
+                if not streamed:
+                    yield str(getattr(item, field, ""))
+                yield item
+                
+    def stream(self, field: str, **kwargs) -> Iterator[Any]:
+        """Stream the text of one output field from synchronous code.
+        
+        Runs astream on a private event loop in a worker thread, so it can
+        be used whether or not the caller has an event loop running.
+        
+        Args:
+            field: Name of the output field to stream
+            **kwargs: Inputs for the prediction
+            
+        Yields:
+            Text chunks, then the final prediction
+        """
+        return iterate_in_thread(self.astream(field, **kwargs))
+
+_DONE = object()
+
+def iterate_in_thread(agen: AsyncIterator[Any]) -> Iterator[Any]:
+    """Consume an async generator from synchronous code.
+    
+    The generator runs on its own event loop in a daemon thread, with a
+    copy of the caller's context variables, and its items are handed over
+    through a queue as they are produced. Exceptions raised by the
+    generator are re-raised in the caller.
+    
+    Args:
+        agen: Async generator to consume
+        
+    Yields:
+        Items produced by the generator
+    """
+    items: "queue.Queue[Any]" = queue.Queue()
+    
+    async def pump():
+        try:
+            async for item in agen:
+                items.put(item)
+        except BaseException as e:
+            items.put(e if isinstance(e, Exception) else RuntimeError(str(e)))
+        finally:
+            items.put(_DONE)
+            
+    # Run in a copy of the caller's context so dspy.context() overrides apply
+    context = contextvars.copy_context()
+    worker = threading.Thread(target=context.run, args=(asyncio.run, pump()), daemon=True)
+    worker.start()
+    while True:
+        item = items.get()
+        if item is _DONE:
+            break
+        if isinstance(item, Exception):
+            raise item
+        yield item
+    worker.join()
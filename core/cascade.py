@@ -0,0 +1,166 @@
+"""Heuristic first stage for the cascading reasoning judge.
+
+HeuristicScorer settles clear-cut ratings in-process so that only
+uncertain outputs are sent to the language model judge:
+
+1. Empty, too long or (with min_words above 1) too short outputs score 0
+2. Refusals (configurable regular expressions) score 0
+3. Outputs that echo the prompt score 0
+4. Exact duplicates of previously rated outputs reuse their score
+5. Near-duplicates of graded reference outputs reuse the reference score
+
+A verdict whose score falls inside the uncertainty band is not settled and
+is escalated to the language model judge.
+"""
+
+import re
+import logging
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .context import jaccard, shingles
+from ..utils.cache import LRUCache, hash_key
+from ..utils.config import JUDGE_CASCADE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class HeuristicVerdict:
+    """Outcome of the heuristic stage for one output."""
+
+    __slots__ = ("score", "reason", "settled")
+
+    def __init__(self, score: Optional[float], reason: str, settled: bool):
+        """Initialize the verdict.
+
+        Args:
+            score: Heuristic score, or None if no rule applied
+            reason: Name of the rule that produced the score
+            settled: Whether the score is final (outside the uncertainty band)
+        """
+        self.score = score
+        self.reason = reason
+        self.settled = settled
+
+    def __repr__(self) -> str:
+        return f"HeuristicVerdict(score={self.score}, reason={self.reason!r}, settled={self.settled})"
+
+class HeuristicScorer:
+    """Cheap in-process scorer for clear-cut outputs."""
+
+    def __init__(self, min_words: Optional[int] = None, max_chars: Optional[int] = None,
+                 refusal_patterns: Optional[Iterable[str]] = None,
+                 echo_threshold: Optional[float] = None,
+                 references: Optional[Iterable[Tuple[str, float]]] = None,
+                 reference_threshold: Optional[float] = None,
+                 uncertainty_band: Optional[Tuple[float, float]] = None,
+                 remembered_verdicts: Optional[int] = None):
+        """Initialize the scorer.
+
+        Unset arguments default to the values in JUDGE_CASCADE_CONFIG.
+
+        Args:
+            min_words: Outputs with fewer words score 0
+            max_chars: Outputs longer than this score 0 (None disables)
+            refusal_patterns: Regular expressions matching refusals
+            echo_threshold: Shingle similarity to the prompt at or above
+                which an output is an echo
+            references: Graded (output, score) examples
+            reference_threshold: Shingle similarity at or above which an
+                output reuses a reference score
+            uncertainty_band: (low, high) scores strictly inside which the
+                verdict is escalated to the language model judge
+            remembered_verdicts: Rated outputs kept for duplicate detection
+        """
+        config = JUDGE_CASCADE_CONFIG
+        self.min_words = min_words if min_words is not None else config["min_words"]
+        self.max_chars = max_chars if max_chars is not None else config["max_chars"]
+        patterns = refusal_patterns if refusal_patterns is not None else config["refusal_patterns"]
+        self.refusal_patterns = [re.compile(p, re.IGNORECASE) for p in patterns]
+        self.echo_threshold = echo_threshold if echo_threshold is not None else config["echo_threshold"]
+        self.reference_threshold = (reference_threshold if reference_threshold is not None
+                                    else config["reference_threshold"])
+        self.uncertainty_band = tuple(uncertainty_band if uncertainty_band is not None
+                                      else config["uncertainty_band"])
+        size = remembered_verdicts if remembered_verdicts is not None else config["remembered_verdicts"]
+        self._verdicts = LRUCache(max_size=max(1, size))
+        # Reference shingles are computed once and reused for every output
+        self._references: List[Tuple[FrozenSet[str], float]] = []
+        # Shingles of the last prompt, reused while rating its candidates
+        self._prompt_shingles: Dict[str, FrozenSet[str]] = {}
+        for text, score in references or []:
+            self.add_reference(text, score)
+
+    def add_reference(self, text: str, score: float) -> None:
+        """Add a graded reference output.
+
+        Args:
+            text: Reference output
+            score: Its score (0-1)
+        """
+        features = shingles(text)
+        if features:
+            self._references.append((features, float(score)))
+
+    def remember(self, output: str, score: float) -> None:
+        """Record the final score of an output for duplicate detection.
+
+        Args:
+            output: Rated output
+            score: Its score (0-1)
+        """
+        self._verdicts.set(hash_key(output.strip()), float(score))
+
+    def _settle(self, score: float, reason: str) -> HeuristicVerdict:
+        """Wrap a heuristic score, escalating it if it is uncertain.
+
+        Args:
+            score: Heuristic score
+            reason: Rule that produced it
+
+        Returns:
+            The verdict
+        """
+        low, high = self.uncertainty_band
+        return HeuristicVerdict(score, reason, settled=not low < score < high)
+
+    def score(self, output: str, prompt: Optional[str] = None) -> HeuristicVerdict:
+        """Score an output with the heuristic rules.
+
+        Args:
+            output: Output to evaluate
+            prompt: Optional prompt the output answers (for echo detection)
+
+        Returns:
+            Verdict; unsettled verdicts should go to the language model judge
+        """
+        text = (output or "").strip()
+        if not text:
+            return HeuristicVerdict(0.0, "empty", settled=True)
+        if len(text.split()) < self.min_words:
+            return HeuristicVerdict(0.0, "too_short", settled=True)
+        if self.max_chars is not None and len(text) > self.max_chars:
+            return HeuristicVerdict(0.0, "too_long", settled=True)
+        if any(pattern.search(text) for pattern in self.refusal_patterns):
+            return HeuristicVerdict(0.0, "refusal", settled=True)
+
+        remembered = self._verdicts.get(hash_key(text))
+        if remembered is not None:
+            return HeuristicVerdict(remembered, "duplicate", settled=True)
+
+        features = shingles(text)
+        if prompt:
+            prompt_features = self._prompt_shingles.get(prompt)
+            if prompt_features is None:
+                prompt_features = shingles(prompt)
+                self._prompt_shingles = {prompt: prompt_features}
+            if jaccard(features, prompt_features) >= self.echo_threshold:
+                return HeuristicVerdict(0.0, "echo", settled=True)
+
+        best: Optional[Tuple[float, float]] = None
+        for reference, reference_score in self._references:
+            similarity = jaccard(features, reference)
+            if similarity >= self.reference_threshold and (best is None or similarity > best[0]):
+                best = (similarity, reference_score)
+        if best is not None:
+            return self._settle(best[1], "reference")
+
+        return HeuristicVerdict(None, "uncertain", settled=False)
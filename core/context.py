@@ -0,0 +1,225 @@
+"""Token-budgeted memory context assembly.
+
+ContextBuilder turns memory search results into the context string sent to
+the language model:
+
+1. Rank memories by their search score (highest first)
+2. Drop exact and near-duplicate memories (word-shingle Jaccard similarity)
+3. Pack the remaining memories greedily into a token budget
+
+Token counts use tiktoken for the configured model when it is installed
+and fall back to a characters-per-token estimate otherwise.
+"""
+
+import re
+import logging
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+from ..utils.config import DEFAULTS
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+
+# Words ignored when comparing retrieval queries
+STOPWORDS = frozenset(
+    "a an and are as at be by did do does for from had has have how i in is it "
+    "its of on or s that the their them they this to was we were what when where "
+    "which who whom why will with you your".split()
+)
+
+# Characters per token used when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+
+def get_token_counter(model: Optional[str] = None) -> Callable[[str], int]:
+    """Get a token counting function for a model.
+
+    Args:
+        model: Model name used to pick the tokenizer
+
+    Returns:
+        Function mapping text to its token count
+    """
+    try:
+        import tiktoken
+        try:
+            encoding = tiktoken.encoding_for_model(model or "")
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    except Exception:
+        return lambda text: (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def memory_text(memory: Dict[str, Any]) -> str:
+    """Extract the text of a memory search result.
+
+    Args:
+        memory: Memory dictionary from the memory client
+
+    Returns:
+        The memory text ("memory" for Mem0, "text" otherwise)
+    """
+    return memory.get("memory") or memory.get("text") or ""
+
+def shingles(text: str, size: int = 3) -> FrozenSet[str]:
+    """Get the set of word shingles of a text.
+
+    Args:
+        text: Input text
+        size: Words per shingle (shorter texts yield one shingle)
+
+    Returns:
+        Set of shingles
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return frozenset([" ".join(words)]) if words else frozenset()
+    return frozenset(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+def query_terms(text: str) -> FrozenSet[str]:
+    """Get the content words of a retrieval query.
+
+    Args:
+        text: Query text
+
+    Returns:
+        Lowercased words that are not stopwords
+    """
+    return frozenset(w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS)
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard similarity of two sets.
+
+    Args:
+        a: First set
+        b: Second set
+
+    Returns:
+        Similarity between 0 and 1
+    """
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class BuiltContext:
+    """Result of assembling a memory context."""
+
+    __slots__ = ("text", "memories", "tokens_used", "tokens_dropped",
+                 "dropped", "duplicates", "budget")
+
+    def __init__(self, text: str, memories: List[Dict[str, Any]], tokens_used: int,
+                 tokens_dropped: int, dropped: int, duplicates: int, budget: int):
+        """Initialize the result.
+
+        Args:
+            text: Assembled context text
+            memories: Memories included, in context order
+            tokens_used: Tokens in the assembled context
+            tokens_dropped: Tokens of memories left out for the budget
+            dropped: Number of memories left out for the budget
+            duplicates: Number of memories removed as near-duplicates
+            budget: Token budget the context was packed into
+        """
+        self.text = text
+        self.memories = memories
+        self.tokens_used = tokens_used
+        self.tokens_dropped = tokens_dropped
+        self.dropped = dropped
+        self.duplicates = duplicates
+        self.budget = budget
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the context statistics as a dictionary.
+
+        Returns:
+            Dictionary of token and memory counts
+        """
+        return {
+            'included': len(self.memories),
+            'tokens_used': self.tokens_used,
+            'tokens_dropped': self.tokens_dropped,
+            'dropped': self.dropped,
+            'duplicates': self.duplicates,
+            'budget': self.budget
+        }
+
+class ContextBuilder:
+    """Assemble ranked, deduplicated memories into a token budget."""
+
+    def __init__(self, max_tokens: Optional[int] = None, model: Optional[str] = None,
+                 dedup_threshold: Optional[float] = None, separator: str = "\n"):
+        """Initialize the builder.
+
+        Args:
+            max_tokens: Token budget for the context (defaults to
+                DEFAULTS["context_token_budget"])
+            model: Model name used to pick the tokenizer
+            dedup_threshold: Shingle similarity at or above which a memory
+                is a near-duplicate (defaults to DEFAULTS["context_dedup_threshold"])
+            separator: Text placed between memories
+        """
+        self.max_tokens = max_tokens if max_tokens is not None else DEFAULTS["context_token_budget"]
+        self.dedup_threshold = (dedup_threshold if dedup_threshold is not None
+                                else DEFAULTS["context_dedup_threshold"])
+        self.separator = separator
+        self.count_tokens = get_token_counter(model)
+        self._separator_tokens = self.count_tokens(separator) if separator else 0
+
+    def rank(self, memories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Order memories by descending search score.
+
+        Memories without a score keep their original relative order after
+        the scored ones.
+
+        Args:
+            memories: Memory search results
+
+        Returns:
+            Ranked memories
+        """
+        return sorted(
+            memories,
+            key=lambda m: -m["score"] if isinstance(m.get("score"), (int, float)) else float("inf")
+        )
+
+    def build(self, memories: List[Dict[str, Any]]) -> BuiltContext:
+        """Assemble a context from memory search results.
+
+        Args:
+            memories: Memory search results
+
+        Returns:
+            The assembled context with token statistics
+        """
+        included: List[Dict[str, Any]] = []
+        texts: List[str] = []
+        seen: List[FrozenSet[str]] = []
+        used = dropped_tokens = dropped = duplicates = 0
+
+        for memory in self.rank(memories):
+            text = memory_text(memory).strip()
+            if not text:
+                continue
+            features = shingles(text)
+            if any(jaccard(features, other) >= self.dedup_threshold for other in seen):
+                duplicates += 1
+                continue
+            tokens = self.count_tokens(text) + (self._separator_tokens if texts else 0)
+            if used + tokens > self.max_tokens:
+                dropped += 1
+                dropped_tokens += tokens
+                continue
+            seen.append(features)
+            included.append(memory)
+            texts.append(text)
+            used += tokens
+
+        return BuiltContext(
+            text=self.separator.join(texts),
+            memories=included,
+            tokens_used=used,
+            tokens_dropped=dropped_tokens,
+            dropped=dropped,
+            duplicates=duplicates,
+            budget=self.max_tokens
+        )
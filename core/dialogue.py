@@ -1,8 +1,9 @@
 """Dialogue management for Socratic reasoning."""
 
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .agent import SocraticPredictor
+from ..utils.history import ConversationHistory
 
 logger = logging.getLogger(__name__)
 
@@ -38,14 +39,35 @@ class QuestionGenerator(SocraticPredictor):
         except Exception as e:
             logger.error(f"Question generation failed: {str(e)}")
             return []
+            
+    async def aforward(self, context: str) -> List[str]:
+        """Asynchronously generate Socratic questions based on the given context.
+        
+        Args:
+            context: The context to generate questions from
+            
+        Returns:
+            List of generated questions
+        """
+        try:
+            result = await super().aforward(context=context)
+            return result.questions if hasattr(result, 'questions') else []
+        except Exception as e:
+            logger.error(f"Question generation failed: {str(e)}")
+            return []
 
 class SocraticDialogue:
     """Manages Socratic dialogue flow."""
     
-    def __init__(self):
-        """Initialize dialogue manager."""
+    def __init__(self, history_size: Optional[int] = None):
+        """Initialize dialogue manager.
+        
+        Args:
+            history_size: Conversation turns kept (defaults to
+                DEFAULTS["history_size"])
+        """
         self.generate = QuestionGenerator()
-        self.conversation_history: List[Dict[str, Any]] = []
+        self.conversation_history = ConversationHistory(history_size)
         
     def generate_questions(self, context: str) -> List[str]:
         """Generate relevant Socratic questions based on context.
@@ -56,7 +78,29 @@ class SocraticDialogue:
         Returns:
             List of generated questions
         """
-        questions = self.generate.forward(context)
+        return self._record_questions(self.generate.forward(context), context)
+        
+    async def agenerate_questions(self, context: str) -> List[str]:
+        """Asynchronously generate relevant Socratic questions based on context.
+        
+        Args:
+            context: Current conversation context
+            
+        Returns:
+            List of generated questions
+        """
+        return self._record_questions(await self.generate.aforward(context), context)
+        
+    def _record_questions(self, questions: List[str], context: str) -> List[str]:
+        """Append generated questions to the conversation history.
+        
+        Args:
+            questions: Generated questions
+            context: Context they were generated from
+            
+        Returns:
+            The questions
+        """
         if questions:
             self.conversation_history.append({
                 'type': 'questions',
@@ -71,8 +115,8 @@ class SocraticDialogue:
         Returns:
             List of conversation turns
         """
-        return self.conversation_history
+        return self.conversation_history.to_list()
         
     def clear_history(self):
         """Clear conversation history."""
-        self.conversation_history = []
+        self.conversation_history.clear()
@@ -1,8 +1,16 @@
 """Reasoning evaluation and judgment module."""
 
+import math
 import logging
-from typing import Optional, Union, Any
-from .agent import SocraticLM
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union, Any
+from .agent import SocraticPredictor, get_lm
+from .cascade import HeuristicScorer
+from ..utils import monitoring
+from ..utils.cache import TieredCache, build_cache, hash_key
+from ..utils.config import DEFAULTS, JUDGE_CACHE_CONFIG
 import dspy
 
 logger = logging.getLogger(__name__)
@@ -10,9 +18,18 @@ logger = logging.getLogger(__name__)
 class ReasoningJudge:
     """Judge module for evaluating reasoning outputs with preference learning."""
     
-    def __init__(self):
-        """Initialize the reasoning judge."""
-        self.lm = SocraticLM()
+    def __init__(self, verdict_cache: Optional[TieredCache] = None,
+                 cascade: Optional[HeuristicScorer] = None):
+        """Initialize the reasoning judge.
+        
+        Args:
+            verdict_cache: Optional persistent store of ratings and
+                preferences (defaults to a cache built from
+                JUDGE_CACHE_CONFIG when it is enabled)
+            cascade: Optional heuristic scorer that settles clear-cut
+                ratings before the language model judge is consulted
+        """
+        self.lm = get_lm()
         
         # Rating predictor for single outputs
         rating_instructions = """Rate this solution from 0 to 1, where 1 is perfect.
@@ -23,10 +40,27 @@ class ReasoningJudge:
         4. Completeness
         Only respond with a number."""
         
-        self.rating_judge = dspy.Predict("output -> rating: float")
-        self.rating_judge.signature = self.rating_judge.signature.with_instructions(rating_instructions)
+        self.rating_judge = SocraticPredictor(
+            signature="output -> rating: float",
+            instructions=rating_instructions
+        )
         self.rating_judge.lm = self.lm
         
+        # Listwise rating predictor for scoring several outputs in one call
+        batch_rating_instructions = """Rate each of these solutions from 0 to 1, where 1 is perfect.
+        Rate every solution independently, using the same criteria:
+        1. Accuracy of information
+        2. Clarity of explanation
+        3. Logical coherence
+        4. Completeness
+        Respond with exactly one number per solution, in the same order."""
+        
+        self.batch_rating_judge = SocraticPredictor(
+            signature="outputs: list[str] -> ratings: list[float]",
+            instructions=batch_rating_instructions
+        )
+        self.batch_rating_judge.lm = self.lm
+        
         # Preference predictor for comparing outputs
         preference_instructions = """Compare these two solutions and respond with only 'true' or 'false'.
         Consider:
@@ -36,16 +70,117 @@ class ReasoningJudge:
         4. Completeness
         Is Solution 1 better than Solution 2?"""
         
-        self.preference_judge = dspy.Predict("output1: str, output2: str -> output_1_better: bool")
-        self.preference_judge.signature = self.preference_judge.signature.with_instructions(preference_instructions)
+        self.preference_judge = SocraticPredictor(
+            signature="output1: str, output2: str -> output_1_better: bool",
+            instructions=preference_instructions
+        )
         self.preference_judge.lm = self.lm
         
-    def forward(self, output1: str, output2: Optional[str] = None) -> Any:
+        # Content-addressed verdicts, one namespace per model
+        if verdict_cache is None and JUDGE_CACHE_CONFIG["enabled"]:
+            verdict_cache = build_cache(
+                JUDGE_CACHE_CONFIG, namespace=f"judge_verdict:{self.lm.model}"
+            )
+        self.verdict_cache = verdict_cache
+            
+        # Rating cascade: heuristics, then cached verdicts, then the model
+        self.cascade = cascade
+        self._stages: Counter = Counter()
+        self._reasons: Counter = Counter()
+        self._stages_lock = threading.Lock()
+            
+    @staticmethod
+    def _instructions(predictor: Any) -> str:
+        """Get the instructions of a judge predictor.
+        
+        Args:
+            predictor: Judge predictor
+            
+        Returns:
+            The predictor's instructions, or an empty string
+        """
+        return getattr(getattr(predictor, "signature", None), "instructions", "") or ""
+        
+    def _fingerprint(self) -> str:
+        """Hash the model and instructions that verdicts depend on.
+        
+        Returns:
+            Fingerprint of the current judge configuration
+        """
+        return hash_key(
+            self.lm.model,
+            self._instructions(self.rating_judge),
+            self._instructions(self.batch_rating_judge),
+            self._instructions(self.preference_judge)
+        )
+        
+    def invalidate_verdicts(self) -> None:
+        """Remove all cached verdicts for this judge's model."""
+        if self.verdict_cache is not None:
+            self.verdict_cache.clear()
+            
+    def _verdict_key(self, kind: str, *outputs: str) -> str:
+        """Build the cache key of a verdict.
+        
+        The key includes the fingerprint of the model and all judge
+        instructions, so verdicts given under other instructions are never
+        served, without clearing them: judges with different instructions
+        can share one cache, and switching back reuses the old verdicts.
+        
+        Args:
+            kind: "rating" or "preference"
+            *outputs: Output text(s) the verdict is about
+            
+        Returns:
+            Content hash of the judge configuration and outputs
+        """
+        return hash_key(kind, self._fingerprint(), outputs)
+        
+    def _cached_verdict(self, kind: str, *outputs: str) -> Any:
+        """Look up a cached verdict.
+        
+        Args:
+            kind: "rating" or "preference"
+            *outputs: Output text(s) the verdict is about
+            
+        Returns:
+            The cached score or preference, or None on a miss
+        """
+        if self.verdict_cache is None:
+            return None
+        verdict = self.verdict_cache.get(self._verdict_key(kind, *outputs))
+        monitoring.increment("judge_verdict_cache.hits" if verdict is not None
+                             else "judge_verdict_cache.misses")
+        return verdict
+        
+    def _store_verdict(self, kind: str, verdict: Any, *outputs: str) -> None:
+        """Store a verdict in the cache.
+        
+        Args:
+            kind: "rating" or "preference"
+            verdict: Score or preference to store
+            *outputs: Output text(s) the verdict is about
+        """
+        if self.verdict_cache is not None:
+            self.verdict_cache.set(self._verdict_key(kind, *outputs), verdict)
+            
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get verdict cache statistics.
+        
+        Returns:
+            Hit/miss statistics, or an empty dict if caching is disabled
+        """
+        return self.verdict_cache.get_stats() if self.verdict_cache is not None else {}
+        
+    def forward(self, output1: str, output2: Optional[str] = None,
+                prompt: Optional[str] = None) -> Any:
         """Judge outputs either by rating a single output or comparing two outputs.
         
         Args:
             output1: First output to evaluate
             output2: Optional second output for comparison
+            prompt: Optional prompt the output answers (used by the
+                cascade to detect echoes)
             
         Returns:
             For single output: Rating prediction (0-1)
@@ -54,17 +189,305 @@ class ReasoningJudge:
         try:
             if output2 is None:
                 # Single output rating
-                if not output1:
-                    return dspy.Prediction(score=0.0)
-                rating = self.rating_judge(output=output1)
-                return dspy.Prediction(score=float(rating.rating))
+                return self._rate_one(output1, prompt)
             else:
                 # Comparison between two outputs
                 if not output1 or not output2:
                     raise ValueError("Both outputs must be provided for comparison")
-                return self.preference_judge(output1=output1, output2=output2)
+                return self._compare(output1, output2)[0]
         except Exception as e:
             logger.error(f"Judgment failed: {str(e)}")
             if output2 is None:
                 return dspy.Prediction(score=0.0)
             raise
+
+    def _count_stage(self, stage: str, reason: Optional[str] = None) -> None:
+        """Count a rating settled by a cascade stage.
+        
+        Args:
+            stage: "heuristic", "verdict_cache" or "lm"
+            reason: Heuristic rule that settled the rating
+        """
+        with self._stages_lock:
+            self._stages[stage] += 1
+            if reason:
+                self._reasons[reason] += 1
+        monitoring.increment(f"judge.rating.{stage}")
+        if reason:
+            monitoring.increment(f"judge.heuristic.{reason}")
+                
+    def get_stage_stats(self) -> Dict[str, Any]:
+        """Get how many ratings each cascade stage settled.
+        
+        Returns:
+            Counts and hit rates per stage, plus counts per heuristic rule
+        """
+        with self._stages_lock:
+            total = sum(self._stages.values())
+            stats: Dict[str, Any] = {'total': total}
+            for stage in ("heuristic", "verdict_cache", "lm"):
+                stats[stage] = self._stages[stage]
+                stats[f"{stage}_rate"] = self._stages[stage] / total if total else 0.0
+            stats['reasons'] = dict(self._reasons)
+            return stats
+            
+    def _prescreen(self, output: str, prompt: Optional[str] = None) -> Optional[float]:
+        """Settle a rating without the language model if possible.
+        
+        Args:
+            output: Output to evaluate
+            prompt: Optional prompt the output answers
+            
+        Returns:
+            The score, or None if the output must go to the model
+        """
+        if not output:
+            self._count_stage("heuristic", "empty")
+            return 0.0
+        if self.cascade is not None:
+            verdict = self.cascade.score(output, prompt)
+            if verdict.settled:
+                self._count_stage("heuristic", verdict.reason)
+                return verdict.score
+        cached = self._cached_verdict("rating", output)
+        if cached is not None:
+            self._count_stage("verdict_cache")
+            return cached
+        return None
+        
+    def _record_rating(self, output: str, score: float) -> None:
+        """Record a rating produced by the language model.
+        
+        Args:
+            output: Rated output
+            score: Its score
+        """
+        self._count_stage("lm")
+        self._store_verdict("rating", score, output)
+        if self.cascade is not None:
+            self.cascade.remember(output, score)
+            
+    def _lm_rate(self, output: str) -> float:
+        """Rate a single output with the rating judge.
+        
+        Args:
+            output: Output to evaluate
+            
+        Returns:
+            Score (0-1)
+        """
+        rating = self.rating_judge(output=output)
+        score = float(rating.rating)
+        self._record_rating(output, score)
+        return score
+        
+    def _rate_one(self, output: str, prompt: Optional[str] = None) -> dspy.Prediction:
+        """Rate a single output through the cascade.
+        
+        Args:
+            output: Output to evaluate
+            prompt: Optional prompt the output answers
+            
+        Returns:
+            Rating prediction (0-1)
+        """
+        score = self._prescreen(output, prompt)
+        if score is None:
+            score = self._lm_rate(output)
+        return dspy.Prediction(score=score)
+        
+    def _compare(self, output1: str, output2: str) -> Tuple[dspy.Prediction, bool]:
+        """Compare two outputs with the preference judge.
+        
+        Args:
+            output1: First output
+            output2: Second output
+            
+        Returns:
+            Preference prediction and whether it came from the verdict cache
+        """
+        cached = self._cached_verdict("preference", output1, output2)
+        if cached is not None:
+            monitoring.increment("judge.preference.verdict_cache")
+            return dspy.Prediction(output_1_better=cached), True
+        monitoring.increment("judge.preference.lm")
+        result = self.preference_judge(output1=output1, output2=output2)
+        self._store_verdict("preference", self._is_true(result.output_1_better), output1, output2)
+        return result, False
+        
+    @staticmethod
+    def _parse_ratings(ratings: Any, expected: int) -> Optional[List[float]]:
+        """Validate the ratings returned by the listwise judge.
+        
+        Args:
+            ratings: Raw ratings field of the batched prediction
+            expected: Number of outputs in the batch
+            
+        Returns:
+            One score per output, or None if the response is unusable
+        """
+        if not isinstance(ratings, (list, tuple)) or len(ratings) != expected:
+            return None
+        scores = []
+        for rating in ratings:
+            try:
+                score = float(rating)
+            except (TypeError, ValueError):
+                return None
+            if not math.isfinite(score) or not 0.0 <= score <= 1.0:
+                return None
+            scores.append(score)
+        return scores
+        
+    def rate_many(self, outputs: List[str], chunk_size: Optional[int] = None,
+                  prompt: Optional[str] = None) -> List[dspy.Prediction]:
+        """Rate many outputs, several per language model call.
+        
+        Outputs are rated listwise in chunks of chunk_size with one call per
+        chunk. If a chunk's response cannot be parsed into one rating in
+        [0, 1] per output, that chunk falls back to rating each output on
+        its own. Empty outputs, outputs settled by the heuristic cascade and
+        outputs with a cached verdict are not sent to the model.
+        
+        Args:
+            outputs: Outputs to evaluate
+            chunk_size: Outputs rated per call (defaults to
+                DEFAULTS["judge_batch_size"])
+            prompt: Optional prompt the outputs answer (used by the
+                cascade to detect echoes)
+            
+        Returns:
+            Rating predictions (0-1), one per output in input order
+        """
+        if chunk_size is None:
+            chunk_size = DEFAULTS["judge_batch_size"]
+        chunk_size = max(1, chunk_size)
+        
+        results: List[dspy.Prediction] = [dspy.Prediction(score=0.0) for _ in outputs]
+        pending = []
+        for i, output in enumerate(outputs):
+            score = self._prescreen(output, prompt)
+            if score is not None:
+                results[i] = dspy.Prediction(score=score)
+            else:
+                pending.append(i)
+        
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            scores = None
+            if len(chunk) > 1:
+                try:
+                    batch = self.batch_rating_judge(outputs=[outputs[i] for i in chunk])
+                    scores = self._parse_ratings(getattr(batch, "ratings", None), len(chunk))
+                    if scores is None:
+                        logger.warning(f"Unparseable batch rating for {len(chunk)} outputs; rating individually")
+                except Exception as e:
+                    logger.warning(f"Batch rating failed ({str(e)}); rating individually")
+            if scores is not None:
+                for i, score in zip(chunk, scores):
+                    results[i] = dspy.Prediction(score=score)
+                    self._record_rating(outputs[i], score)
+                continue
+            for i in chunk:
+                try:
+                    results[i] = dspy.Prediction(score=self._lm_rate(outputs[i]))
+                except Exception as e:
+                    logger.error(f"Judgment failed: {str(e)}")
+        return results
+
+    @staticmethod
+    def _is_true(verdict: Any) -> bool:
+        """Interpret a preference verdict as a boolean.
+        
+        Args:
+            verdict: output_1_better field of a preference prediction
+            
+        Returns:
+            Whether the verdict says the first output is better
+        """
+        if isinstance(verdict, bool):
+            return verdict
+        return str(verdict).strip().lower() in ("true", "yes", "1")
+        
+    def rank(self, candidates: List[str], infer_reverse: bool = True,
+             max_workers: Optional[int] = None) -> dspy.Prediction:
+        """Rank candidates from best to worst with pairwise comparisons.
+        
+        Uses a bottom-up merge sort, so ranking N candidates takes about
+        N log2 N comparisons instead of one per pair. Verdicts are memoized
+        by candidate text; with infer_reverse, a verdict for (a, b) also
+        answers (b, a) without another call. Merges at the same level are
+        independent and run concurrently. Candidates whose comparison fails
+        keep their relative order.
+        
+        Args:
+            candidates: Outputs to rank
+            infer_reverse: Whether to reuse a verdict for the reversed pair
+            max_workers: Maximum concurrent merges (defaults to
+                DEFAULTS["max_workers"])
+            
+        Returns:
+            Prediction with ranking (candidates, best first), order (their
+            input indices), lm_calls (preference judge calls made),
+            memo_hits (comparisons answered from memoized verdicts) and
+            cache_hits (comparisons answered from the verdict cache)
+        """
+        if max_workers is None:
+            max_workers = DEFAULTS["max_workers"]
+        verdicts: Dict[Tuple[str, str], bool] = {}
+        lock = threading.Lock()
+        stats = {'lm_calls': 0, 'memo_hits': 0, 'cache_hits': 0}
+        
+        def better(i: int, j: int) -> bool:
+            a, b = candidates[i], candidates[j]
+            if a == b:
+                return False
+            with lock:
+                if (a, b) in verdicts:
+                    stats['memo_hits'] += 1
+                    return verdicts[(a, b)]
+            try:
+                result, cached = self._compare(a, b)
+                verdict = self._is_true(result.output_1_better)
+            except Exception as e:
+                logger.error(f"Judgment failed: {str(e)}")
+                with lock:
+                    stats['lm_calls'] += 1
+                return False
+            with lock:
+                stats['cache_hits' if cached else 'lm_calls'] += 1
+                verdicts[(a, b)] = verdict
+                if infer_reverse:
+                    verdicts.setdefault((b, a), not verdict)
+            return verdict
+            
+        def merge(left: List[int], right: List[int]) -> List[int]:
+            merged: List[int] = []
+            li = ri = 0
+            while li < len(left) and ri < len(right):
+                # Prefer the earlier run unless the right item wins outright (stable)
+                if better(right[ri], left[li]):
+                    merged.append(right[ri])
+                    ri += 1
+                else:
+                    merged.append(left[li])
+                    li += 1
+            return merged + left[li:] + right[ri:]
+            
+        runs = [[i] for i in range(len(candidates))]
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            while len(runs) > 1:
+                pairs = [(runs[k], runs[k + 1]) for k in range(0, len(runs) - 1, 2)]
+                merged = list(executor.map(lambda pair: merge(*pair), pairs))
+                if len(runs) % 2:
+                    merged.append(runs[-1])
+                runs = merged
+                
+        order = runs[0] if runs else []
+        return dspy.Prediction(
+            ranking=[candidates[i] for i in order],
+            order=order,
+            lm_calls=stats['lm_calls'],
+            memo_hits=stats['memo_hits'],
+            cache_hits=stats['cache_hits']
+        )
@@ -1,6 +1,21 @@
 """Game modules for different reasoning tasks."""
 
-from .reasoning import ReasoningGame
-from .creativity import CreativityGame
+from typing import TYPE_CHECKING
 
-__all__ = ['ReasoningGame', 'CreativityGame']
+from ..utils._lazy import make_lazy
+
+if TYPE_CHECKING:
+    from .reasoning import ReasoningGame
+    from .creativity import CreativityGame
+    from .session import SocraticSession
+
+# Imported on first access to keep `import socratic.games` cheap
+_LAZY_IMPORTS = {
+    'ReasoningGame': '.reasoning',
+    'CreativityGame': '.creativity',
+    'SocraticSession': '.session',
+}
+
+__getattr__, __dir__ = make_lazy(globals(), _LAZY_IMPORTS)
+
+__all__ = ['ReasoningGame', 'CreativityGame', 'SocraticSession']
@@ -1,16 +1,35 @@
 """Creativity game implementation."""
 
+import time
+import uuid
+import asyncio
 import logging
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, List, Optional
+import dspy
 from ..core.agent import SocraticPredictor
+from ..utils.config import MEM0_CONFIG, DEFAULTS
+from ..utils.history import ConversationHistory
+from ..utils.ratelimit import get_scheduler
+
+if TYPE_CHECKING:
+    from ..core.judge import ReasoningJudge
 
 logger = logging.getLogger(__name__)
 
 class CreativityGame:
     """Game focused on creative reasoning and generation."""
-    
-    def __init__(self):
-        """Initialize creativity game."""
+
+    def __init__(self, memory_client: Optional[Any] = None,
+                 history_size: Optional[int] = None):
+        """Initialize creativity game.
+
+        Args:
+            memory_client: Optional memory client used to store outputs
+                when store_output is requested
+            history_size: Conversation turns kept (defaults to
+                DEFAULTS["history_size"])
+        """
         self.create = SocraticPredictor(
             signature="prompt: str -> creative_output: str",
             instructions="""Generate creative and insightful outputs that:
@@ -20,19 +39,310 @@ class CreativityGame:
             4. Consider multiple perspectives
             5. Balance novelty with usefulness"""
         )
-        
+        self.memory = memory_client
+        self.memory_scheduler = get_scheduler("mem0")
+        self.user_id = MEM0_CONFIG["user_id"]
+        self.conversation_history = ConversationHistory(history_size)
+        self.judge: Optional["ReasoningJudge"] = None
+
+    def _record_turn(self, prompt: str, result: Any) -> str:
+        """Append a prompt-output turn to the conversation history.
+
+        Args:
+            prompt: The prompt that was answered
+            result: Prediction returned by the creative predictor
+
+        Returns:
+            The creative output text
+        """
+        output = result.creative_output if hasattr(result, 'creative_output') else str(result)
+        self.conversation_history.append({
+            'type': 'creative',
+            'question': prompt,
+            'answer': output
+        })
+        return output
+
+    def store_output(self, output: str, prompt: str):
+        """Store a creative output in memory.
+
+        Args:
+            output: The creative output to store
+            prompt: The prompt that produced it
+
+        Returns:
+            Result from memory.add operation, or None if no memory client
+            is set or the write failed
+        """
+        if self.memory is None:
+            logger.warning("No memory client configured; creative output not stored")
+            return None
+        try:
+            return self.memory_scheduler.call(
+                self.memory.add,
+                output,
+                user_id=self.user_id,
+                metadata={"type": "creative_output", "prompt": prompt}
+            )
+        except Exception as e:
+            logger.error(f"Error storing creative output: {str(e)}")
+            return None
+
+    async def astore_output(self, output: str, prompt: str):
+        """Asynchronously store a creative output in memory.
+
+        Args:
+            output: The creative output to store
+            prompt: The prompt that produced it
+
+        Returns:
+            Result from memory.add operation, or None if no memory client
+            is set or the write failed
+        """
+        if self.memory is None:
+            logger.warning("No memory client configured; creative output not stored")
+            return None
+        try:
+            return await self.memory_scheduler.acall(
+                self.memory.add,
+                output,
+                user_id=self.user_id,
+                metadata={"type": "creative_output", "prompt": prompt}
+            )
+        except Exception as e:
+            logger.error(f"Error storing creative output: {str(e)}")
+            return None
+
     def forward(self, prompt: str) -> Any:
         """Generate creative output for a prompt.
-        
+
         Args:
             prompt: Input prompt for creative generation
-            
+
         Returns:
             Generated creative output
         """
         try:
             result = self.create.forward(prompt=prompt)
-            return result.creative_output if hasattr(result, 'creative_output') else str(result)
+            return self._record_turn(prompt, result)
         except Exception as e:
             logger.error(f"Creative generation failed: {str(e)}")
             return str(e)
+
+    def _default_judge(self) -> "ReasoningJudge":
+        """Get the judge used to score best-of-N candidates."""
+        if self.judge is None:
+            # Imported here so the judge is only built when it is used
+            from ..core.judge import ReasoningJudge
+            self.judge = ReasoningJudge()
+        return self.judge
+
+    async def _sample(self, prompt: str, index: int, run: int, temperature: float,
+                      judge: "ReasoningJudge", executor: ThreadPoolExecutor) -> Dict[str, Any]:
+        """Generate and score one best-of-N candidate.
+
+        Args:
+            prompt: Input prompt for creative generation
+            index: Candidate number
+            run: Random nonce of this best-of-N call; with the index in
+                its low 16 bits it forms the rollout ID, so that samples are
+                not served from the LM cache within a call or across
+                repeated calls
+            temperature: Sampling temperature
+            judge: Judge scoring the candidate
+            executor: Threads running the synchronous judge
+
+        Returns:
+            Candidate with its index, output and score
+        """
+        result = await self.create.aforward(
+            prompt=prompt, config={"temperature": temperature, "rollout_id": (run << 16) + index}
+        )
+        output = result.creative_output if hasattr(result, 'creative_output') else str(result)
+        rating = await asyncio.get_running_loop().run_in_executor(
+            executor, lambda: judge.forward(output, prompt=prompt)
+        )
+        return {'index': index, 'creative_output': output, 'score': float(rating.score)}
+
+    async def aforward_best_of(self, prompt: str, n: Optional[int] = None,
+                               judge: Optional["ReasoningJudge"] = None,
+                               temperature: Optional[float] = None,
+                               target_score: Optional[float] = None,
+                               time_budget: Optional[float] = None,
+                               store_output: bool = False) -> Any:
+        """Sample candidates concurrently and keep the best one.
+
+        All N candidates are generated at once and scored by the judge as
+        they finish. Sampling stops early, cancelling the candidates still
+        in flight, once one scores at least target_score or time_budget
+        seconds have passed.
+
+        The judge is synchronous, so candidates are scored on a thread pool
+        owned by this call rather than the event loop's default executor.
+        Cancelling a candidate stops its generation, but a judge call that
+        has already started runs to completion in its thread and its score
+        is discarded.
+
+        Args:
+            prompt: Input prompt for creative generation
+            n: Candidates to sample (defaults to DEFAULTS["best_of_n"])
+            judge: Judge scoring candidates (defaults to a ReasoningJudge)
+            temperature: Sampling temperature (defaults to
+                DEFAULTS["best_of_temperature"])
+            target_score: Score at which to stop and accept a candidate
+            time_budget: Seconds after which to stop and take the best
+                candidate so far
+            store_output: Whether to store the winning output in memory
+
+        Returns:
+            Prediction with the winning creative_output and its score,
+            candidates (every scored candidate in finishing order), scores
+            (per candidate index, None if unfinished), stopped ("target",
+            "time_budget" or "exhausted") and elapsed seconds, or the error
+            message if no candidate was produced
+        """
+        n = n or DEFAULTS["best_of_n"]
+        if n >= 1 << 16:
+            raise ValueError("n must be below 65536")
+        temperature = DEFAULTS["best_of_temperature"] if temperature is None else temperature
+        judge = judge or self._default_judge()
+        started = time.monotonic()
+        deadline = None if time_budget is None else started + time_budget
+        executor = ThreadPoolExecutor(max_workers=n, thread_name_prefix="best-of-judge")
+        run = uuid.uuid4().int >> 80
+        pending = {
+            asyncio.ensure_future(self._sample(prompt, i, run, temperature, judge, executor))
+            for i in range(n)
+        }
+        candidates: List[Dict[str, Any]] = []
+        errors: List[str] = []
+        stopped = "exhausted"
+        try:
+            while pending:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, pending = await asyncio.wait(pending, timeout=timeout,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    stopped = "time_budget"
+                    break
+                for task in done:
+                    try:
+                        candidates.append(task.result())
+                    except Exception as e:
+                        logger.error(f"Best-of-N candidate failed: {str(e)}")
+                        errors.append(str(e))
+                if target_score is not None and any(c['score'] >= target_score for c in candidates):
+                    stopped = "target"
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+            executor.shutdown(wait=False)
+
+        if not candidates:
+            return errors[0] if errors else "No candidate finished within the time budget"
+        best = max(candidates, key=lambda c: c['score'])
+        scores: List[Optional[float]] = [None] * n
+        for candidate in candidates:
+            scores[candidate['index']] = candidate['score']
+        output = self._record_turn(prompt, dspy.Prediction(creative_output=best['creative_output']))
+        if store_output:
+            await self.astore_output(output, prompt)
+        return dspy.Prediction(
+            creative_output=output,
+            score=best['score'],
+            candidates=candidates,
+            scores=scores,
+            stopped=stopped,
+            elapsed=time.monotonic() - started
+        )
+
+    def forward_best_of(self, prompt: str, n: Optional[int] = None,
+                        judge: Optional["ReasoningJudge"] = None,
+                        temperature: Optional[float] = None,
+                        target_score: Optional[float] = None,
+                        time_budget: Optional[float] = None,
+                        store_output: bool = False) -> Any:
+        """Sample candidates concurrently and keep the best one.
+
+        Synchronous counterpart of aforward_best_of; must not be called
+        from a running event loop.
+
+        Args:
+            prompt: Input prompt for creative generation
+            n: Candidates to sample (defaults to DEFAULTS["best_of_n"])
+            judge: Judge scoring candidates (defaults to a ReasoningJudge)
+            temperature: Sampling temperature (defaults to
+                DEFAULTS["best_of_temperature"])
+            target_score: Score at which to stop and accept a candidate
+            time_budget: Seconds after which to stop and take the best
+                candidate so far
+            store_output: Whether to store the winning output in memory
+
+        Returns:
+            Winning candidate and scores (see aforward_best_of)
+        """
+        return asyncio.run(self.aforward_best_of(
+            prompt, n=n, judge=judge, temperature=temperature, target_score=target_score,
+            time_budget=time_budget, store_output=store_output
+        ))
+
+    def stream(self, prompt: str, store_output: bool = False) -> Iterator[str]:
+        """Generate creative output, yielding text as it is generated.
+
+        Once the stream finishes, the full output is appended to the
+        conversation history and, when store_output is set, stored in memory.
+
+        Args:
+            prompt: Input prompt for creative generation
+            store_output: Whether to store the output in memory
+
+        Yields:
+            Partial creative output text
+        """
+        try:
+            for item in self.create.stream("creative_output", prompt=prompt):
+                if isinstance(item, str):
+                    yield item
+                else:
+                    output = self._record_turn(prompt, item)
+                    if store_output:
+                        self.store_output(output, prompt)
+        except Exception as e:
+            logger.error(f"Creative generation failed: {str(e)}")
+            raise
+
+    async def astream(self, prompt: str, store_output: bool = False) -> AsyncIterator[str]:
+        """Asynchronously generate creative output, yielding text as it is generated.
+
+        Once the stream finishes, the full output is appended to the
+        conversation history and, when store_output is set, stored in memory.
+
+        Args:
+            prompt: Input prompt for creative generation
+            store_output: Whether to store the output in memory
+
+        Yields:
+            Partial creative output text
+        """
+        try:
+            async for item in self.create.astream("creative_output", prompt=prompt):
+                if isinstance(item, str):
+                    yield item
+                else:
+                    output = self._record_turn(prompt, item)
+                    if store_output:
+                        await self.astore_output(output, prompt)
+        except Exception as e:
+            logger.error(f"Creative generation failed: {str(e)}")
+            raise
+
+    def get_conversation_history(self) -> List[Dict[str, Any]]:
+        """Get the conversation history.
+
+        Returns:
+            List of conversation turns
+        """
+        return self.conversation_history.to_list()
@@ -5,8 +5,12 @@ It provides memory-enhanced reasoning capabilities through the following feature
 
 1. Memory Management:
    - Store and retrieve insights and reasoning outputs
-   - Search memories by content and type
-   - Update memory context based on relevant memories
+   - Search memories by content and type (type listings use metadata filters)
+   - Update memory context from memories relevant to the current question,
+     ranked, deduplicated and packed into a token budget
+   - Cache search results per user, invalidated on writes
+   - Optionally queue writes and send them in bulk (write-behind)
+   - Optionally suppress near-duplicate writes, merging their metadata
 
 2. Reasoning Operations:
    - Process questions with memory-enhanced context
@@ -14,19 +18,43 @@ It provides memory-enhanced reasoning capabilities through the following feature
    - Calculate ages and other numerical data
 
 3. Conversation Management:
-   - Maintain conversation history
+   - Maintain bounded conversation history with shared context strings
    - Track question-answer pairs
    - Update memory context based on conversation flow
+
+4. Async Operations:
+   - Non-blocking memory search and storage
+   - Non-blocking reasoning for running many questions on one event loop
+   - Background memory writes after answers are produced
+   - Stream answers as they are generated (sync and async)
+   - Memory calls share a process-wide rate limiter with jittered retries
+   - Memory and model calls can be recorded to a trace and replayed offline
+
+5. Batch Operations:
+   - Process many questions with bounded thread parallelism
+   - Return results in input order with per-item errors
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from mem0 import Memory
-import dspy
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, AsyncIterator, Iterator, List, Dict, Any, Optional, Set
 
-from ..core.agent import SocraticPredictor, SocraticLM
+from ..core.agent import SocraticPredictor, configure_default_lm
+from ..core.context import BuiltContext, ContextBuilder, jaccard, query_terms
 from ..core.dialogue import SocraticDialogue
-from ..utils.config import MEM0_CONFIG, MEMORY_CONFIG
+from ..memory.buffer import WriteBehindMemory
+from ..memory.dedup import DedupMemory
+from ..memory.traced import TracedMemory
+from ..utils.cache import LRUCache
+from ..utils.config import MEM0_CONFIG, MEMORY_CONFIG, DEFAULTS
+from ..utils.history import ConversationHistory
+from ..utils.monitoring import PerformanceMonitor, get_monitor, span
+from ..utils.ratelimit import get_scheduler
+from ..utils.trace import get_trace, is_replaying
+
+if TYPE_CHECKING:
+    from mem0 import Memory
 
 logger = logging.getLogger(__name__)
 
@@ -48,22 +76,56 @@ class ReasoningGame:
     - get: Retrieve specific memories
     """
     
-    def __init__(self, memory_client: Optional[Memory] = None):
+    def __init__(self, memory_client: Optional["Memory"] = None,
+                 monitor: Optional[PerformanceMonitor] = None,
+                 search_cache_size: Optional[int] = None,
+                 write_behind: bool = False,
+                 history_size: Optional[int] = None,
+                 context_token_budget: Optional[int] = None,
+                 dedup: Optional[bool] = None):
         """Initialize the reasoning game.
         
         Args:
-            memory_client: Optional memory client (creates new if None)
+            memory_client: Optional memory client (creates new if None;
+                not needed while a trace is replayed)
+            monitor: Optional performance monitor receiving cache counters
+            search_cache_size: Cached search results per user (defaults to
+                MEM0_CONFIG["search_cache"]["max_size"]; 0 disables caching)
+            write_behind: Whether to queue memory writes and send them in
+                bulk (see WriteBehindMemory); call flush() or close() to
+                force pending writes out
+            history_size: Conversation turns kept (defaults to
+                DEFAULTS["history_size"])
+            context_token_budget: Token budget for the memory context sent
+                to the model (defaults to DEFAULTS["context_token_budget"])
+            dedup: Whether to suppress near-duplicate memory writes (see
+                DedupMemory; defaults to MEM0_CONFIG["dedup"]["enabled"])
         """
         try:
             # Initialize memory client
-            self.memory = memory_client or Memory()
+            if memory_client is None and not is_replaying():
+                # Imported here so mem0 is only loaded when it is used
+                from mem0 import Memory
+                memory_client = Memory()
+            self.memory = memory_client
+            if get_trace() is not None:
+                # Record memory calls, or serve them from the replayed trace
+                self.memory = TracedMemory(self.memory)
+            if dedup is None:
+                dedup = MEM0_CONFIG["dedup"]["enabled"]
+            self.dedup = DedupMemory(self.memory) if dedup else None
+            if self.dedup is not None:
+                self.memory = self.dedup
+            if write_behind:
+                self.memory = WriteBehindMemory(self.memory)
+            # Shared rate limiter and retry scheduler for memory calls
+            self.memory_scheduler = get_scheduler("mem0")
             self.memory.api_key = MEMORY_CONFIG["api_key"]  # Set OpenAI API key for memory operations
             self.agent_id = MEM0_CONFIG["agent_id"]
             self.user_id = MEM0_CONFIG["user_id"]
             
-            # Initialize language model
-            self.lm = SocraticLM()
-            dspy.settings.configure(lm=self.lm)
+            # Borrow the shared language model (configures DSPy only once)
+            self.lm = configure_default_lm()
             
             # Initialize dialogue system
             self.dialogue = SocraticDialogue()
@@ -80,59 +142,276 @@ class ReasoningGame:
             )
             
             # Initialize conversation history and memory context
-            self.conversation_history: List[Dict[str, Any]] = []
+            self.conversation_history = ConversationHistory(history_size)
             self.memory_context = ""
             
+            # Background memory writes scheduled by the async path
+            self._pending_writes: Set[asyncio.Future] = set()
+            
+            # Per-user memory search result cache
+            self.monitor = monitor
+            if search_cache_size is None:
+                search_cache_size = MEM0_CONFIG["search_cache"]["max_size"]
+            self.search_cache_size = search_cache_size
+            self._search_caches: Dict[str, LRUCache] = {}
+            
+            # Memory context assembly within the model's token budget
+            self.context_builder = ContextBuilder(
+                max_tokens=context_token_budget,
+                model=self.lm.model
+            )
+            self.last_context: Optional[BuiltContext] = None
+            
+            # Terms and hits of the last retrieval, reused by overlapping follow-ups
+            self._last_retrieval: Optional[tuple] = None
+            
         except Exception as e:
             logger.error(f"Error initializing ReasoningGame: {str(e)}")
             raise
             
-    def update_memory_context(self):
+    def _assemble_context(self, memories: List[Dict[str, Any]]) -> BuiltContext:
+        """Assemble memories into a token-budgeted context.
+        
+        Memories are ranked by search score, near-duplicates are removed and
+        the rest are packed into the context token budget. Statistics for
+        the assembled context are reported to the performance monitor. No
+        instance state is modified, so this is safe to call concurrently.
+        
+        Args:
+            memories: Memory search results
+            
+        Returns:
+            Assembled context
+        """
+        built = self.context_builder.build(memories)
+        self._count("memory_context.tokens_used", built.tokens_used)
+        self._count("memory_context.tokens_dropped", built.tokens_dropped)
+        self._count("memory_context.duplicates", built.duplicates)
+        return built
+        
+    def _build_context(self, memories: List[Dict[str, Any]]) -> str:
+        """Assemble memories into a context string and keep it in last_context.
+        
+        Args:
+            memories: Memory search results
+            
+        Returns:
+            Context text
+        """
+        built = self._assemble_context(memories)
+        self.last_context = built
+        return built.text
+        
+    def _retrieval_query(self, question: Optional[str]) -> str:
+        """Build the memory search query for a question.
+        
+        The query is the question itself, optionally preceded by the last
+        DEFAULTS["retrieval_history_turns"] questions from the conversation.
+        Without a question, the most recent question is used, and before
+        any question has been asked the current memory context is used.
+        
+        Args:
+            question: The incoming question
+            
+        Returns:
+            Search query string
+        """
+        turns = DEFAULTS["retrieval_history_turns"]
+        recent = [t['question'] for t in self.conversation_history[-turns:]
+                  if t.get('question')] if turns else []
+        if question is None:
+            last = [t['question'] for t in self.conversation_history[-1:] if t.get('question')]
+            if not last:
+                return self.memory_context
+            question = last[0]
+        return " ".join(recent + [question])
+        
+    def _reusable_memories(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the previous retrieval's memories if the query overlaps it.
+        
+        Args:
+            query: Search query string
+            
+        Returns:
+            Previously retrieved memories, or None if a new search is needed
+        """
+        if self._last_retrieval is None:
+            return None
+        last_terms, memories = self._last_retrieval
+        if jaccard(query_terms(query), last_terms) >= DEFAULTS["retrieval_reuse_threshold"]:
+            self._count("memory_retrieval.reused")
+            return memories
+        return None
+        
+    def _remember_retrieval(self, query: str, memories: List[Dict[str, Any]]) -> None:
+        """Keep a retrieval for reuse by overlapping follow-up questions.
+        
+        Args:
+            query: Search query string
+            memories: Retrieved memories
+        """
+        self._last_retrieval = (query_terms(query), memories)
+        
+    def update_memory_context(self, question: Optional[str] = None):
         """Update memory context from stored memories.
         
         This method:
-        1. Searches for memories relevant to current context
-        2. Extracts text content from memories
-        3. Updates memory_context with concatenated text
+        1. Searches for memories relevant to the question (reusing the
+           previous hits when the question overlaps the previous one)
+        2. Ranks, deduplicates and packs them into the token budget
+        3. Updates memory_context with the assembled text
+        
+        Args:
+            question: The incoming question (defaults to the last question)
+        """
+        try:
+            query = self._retrieval_query(question)
+            memories = self._reusable_memories(query)
+            if memories is None:
+                memories = self.get_relevant_memories(query)
+                self._remember_retrieval(query, memories)
+            self.memory_context = self._build_context(memories)
+        except Exception as e:
+            logger.error(f"Error updating memory context: {str(e)}")
+            self.memory_context = ""
+            
+    async def aupdate_memory_context(self, question: Optional[str] = None):
+        """Asynchronously update memory context from stored memories.
+        
+        Async counterpart of update_memory_context.
+        
+        Args:
+            question: The incoming question (defaults to the last question)
         """
         try:
-            memories = self.get_relevant_memories(self.memory_context)
-            self.memory_context = "\n".join([m.get("text", "") for m in memories])
+            query = self._retrieval_query(question)
+            memories = self._reusable_memories(query)
+            if memories is None:
+                memories = await self.asearch_memories(query)
+                self._remember_retrieval(query, memories)
+            self.memory_context = self._build_context(memories)
         except Exception as e:
             logger.error(f"Error updating memory context: {str(e)}")
             self.memory_context = ""
             
-    def reason_with_memory(self, question: str) -> Dict[str, Any]:
+    async def aretrieve_context(self, question: Optional[str] = None) -> str:
+        """Asynchronously retrieve memory context without updating the game.
+        
+        Like aupdate_memory_context, but the context is returned instead of
+        stored, and neither memory_context, last_context nor the retrieval
+        kept for reuse is modified, so concurrent turns cannot overwrite
+        each other's context. Hits of the last synchronous retrieval are
+        still reused when the question overlaps it.
+        
+        Args:
+            question: The incoming question (defaults to the last question)
+            
+        Returns:
+            Context text (empty if retrieval failed)
+        """
+        try:
+            query = self._retrieval_query(question)
+            memories = self._reusable_memories(query)
+            if memories is None:
+                memories = await self.asearch_memories(query)
+            return self._assemble_context(memories).text
+        except Exception as e:
+            logger.error(f"Error retrieving memory context: {str(e)}")
+            return ""
+            
+    def _record_turn(self, question: str, result: Any, context: str) -> str:
+        """Append a question-answer turn to the conversation history.
+        
+        Args:
+            question: The question that was answered
+            result: Prediction returned by the reasoning predictor
+            context: Memory context used to produce the answer
+            
+        Returns:
+            The answer text
+        """
+        answer = result.answer if hasattr(result, 'answer') else str(result)
+        self.conversation_history.append({
+            'question': question,
+            'answer': answer,
+            'context': context
+        })
+        return answer
+        
+    def reason_with_memory(self, question: str, store_output: bool = False) -> Dict[str, Any]:
         """Reason about a question using memory.
         
         Args:
             question: The question to reason about
+            store_output: Whether to store the answer as a reasoning output
             
         Returns:
             Dictionary containing the answer and related metadata
         """
-        try:
-            # Update memory context
-            self.update_memory_context()
+        with span("reasoning.turn") as turn:
+            try:
+                # Update memory context
+                self.update_memory_context(question)
             
-            # Generate answer using context
-            result = self.reason.forward(
-                question=question,
-                context=self.memory_context
-            )
+                # Generate answer using context
+                result = self.reason.forward(
+                    question=question,
+                    context=self.memory_context
+                )
             
-            # Store the interaction
-            self.conversation_history.append({
-                'question': question,
-                'answer': result.answer if hasattr(result, 'answer') else str(result),
-                'context': self.memory_context
-            })
+                # Store the interaction
+                answer = self._record_turn(question, result, self.memory_context)
+                if store_output:
+                    self.store_reasoning_output(answer, metadata={"question": question})
             
-            return result
+                return result
             
-        except Exception as e:
-            logger.error(f"Error in reasoning: {str(e)}")
-            return {'error': str(e)}
+            except Exception as e:
+                turn.end(success=False)
+                logger.error(f"Error in reasoning: {str(e)}")
+                return {'error': str(e)}
+            
+    async def areason_with_memory(self, question: str, store_output: bool = False) -> Dict[str, Any]:
+        """Asynchronously reason about a question using memory.
+        
+        The memory search and the language model call are awaited rather
+        than blocking, so many questions can share one event loop. The
+        retrieved context is local to the call (see aretrieve_context), so
+        concurrent calls on one game do not interfere. When
+        store_output is set, the answer is written to memory in a background
+        task; use wait_for_writes() to wait for pending writes.
+        
+        Args:
+            question: The question to reason about
+            store_output: Whether to store the answer as a reasoning output
+            
+        Returns:
+            Dictionary containing the answer and related metadata
+        """
+        with span("reasoning.turn") as turn:
+            try:
+                # Retrieve memory context for this turn only
+                context = await self.aretrieve_context(question)
+            
+                # Generate answer using context
+                result = await self.reason.aforward(
+                    question=question,
+                    context=context
+                )
+            
+                # Store the interaction
+                answer = self._record_turn(question, result, context)
+                if store_output:
+                    self._schedule_write(
+                        self.astore_reasoning_output(answer, metadata={"question": question})
+                    )
+            
+                return result
+            
+            except Exception as e:
+                turn.end(success=False)
+                logger.error(f"Error in reasoning: {str(e)}")
+                return {'error': str(e)}
             
     def forward(self, question: str) -> Any:
         """Process reasoning step.
@@ -145,6 +424,164 @@ class ReasoningGame:
         """
         return self.reason_with_memory(question)
         
+    def forward_batch(self, questions: List[str], max_workers: Optional[int] = None) -> List[Any]:
+        """Process many reasoning steps concurrently.
+        
+        Each question retrieves its own memory context (searched with the
+        question itself) and is answered on a bounded thread pool. Results
+        are returned in input order; a failing question yields an
+        {'error': ...} dict in its slot without aborting the batch. Workers
+        do not modify the game (memory_context and last_context are left
+        as they were); turns are appended to the conversation history in
+        input order once the pool has finished.
+        
+        Args:
+            questions: The input questions
+            max_workers: Maximum concurrent questions (defaults to
+                DEFAULTS["max_workers"])
+            
+        Returns:
+            List of reasoning results, one per question
+        """
+        if max_workers is None:
+            max_workers = DEFAULTS["max_workers"]
+        if not questions:
+            return []
+            
+        def process(question: str):
+            memories = self.get_relevant_memories(question)
+            context = self._assemble_context(memories).text
+            result = self.reason.forward(question=question, context=context)
+            return result, context
+            
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(questions)))) as executor:
+            futures = [executor.submit(process, question) for question in questions]
+            
+        results: List[Any] = []
+        for question, future in zip(questions, futures):
+            try:
+                result, context = future.result()
+                self._record_turn(question, result, context)
+                results.append(result)
+            except Exception as e:
+                logger.error(f"Error in batch reasoning: {str(e)}")
+                results.append({'error': str(e)})
+        return results
+        
+    async def aforward(self, question: str) -> Any:
+        """Asynchronously process reasoning step.
+        
+        Args:
+            question: The input question
+            
+        Returns:
+            Reasoning result
+        """
+        return await self.areason_with_memory(question)
+
+    def stream(self, question: str, store_output: bool = False) -> Iterator[str]:
+        """Reason about a question, yielding the answer as it is generated.
+
+        Once the stream finishes, the full answer is appended to the
+        conversation history and, when store_output is set, stored as a
+        reasoning output.
+
+        Args:
+            question: The question to reason about
+            store_output: Whether to store the answer as a reasoning output
+
+        Yields:
+            Partial answer text
+        """
+        try:
+            self.update_memory_context(question)
+            context = self.memory_context
+            for item in self.reason.stream("answer", question=question, context=context):
+                if isinstance(item, str):
+                    yield item
+                else:
+                    answer = self._record_turn(question, item, context)
+                    if store_output:
+                        self.store_reasoning_output(answer, metadata={"question": question})
+        except Exception as e:
+            logger.error(f"Error in streaming reasoning: {str(e)}")
+            raise
+
+    async def astream(self, question: str, store_output: bool = False) -> AsyncIterator[str]:
+        """Asynchronously reason about a question, yielding the answer as it is generated.
+
+        Once the stream finishes, the full answer is appended to the
+        conversation history and, when store_output is set, written to
+        memory in a background task (see wait_for_writes()).
+
+        Args:
+            question: The question to reason about
+            store_output: Whether to store the answer as a reasoning output
+
+        Yields:
+            Partial answer text
+        """
+        try:
+            context = await self.aretrieve_context(question)
+            async for item in self.reason.astream("answer", question=question, context=context):
+                if isinstance(item, str):
+                    yield item
+                else:
+                    answer = self._record_turn(question, item, context)
+                    if store_output:
+                        self._schedule_write(
+                            self.astore_reasoning_output(answer, metadata={"question": question})
+                        )
+        except Exception as e:
+            logger.error(f"Error in streaming reasoning: {str(e)}")
+            raise
+
+    def _schedule_write(self, coro) -> asyncio.Future:
+        """Run a memory write in the background of the current event loop.
+        
+        Args:
+            coro: Coroutine performing the write
+            
+        Returns:
+            The scheduled task
+        """
+        task = asyncio.ensure_future(coro)
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+        return task
+        
+    async def wait_for_writes(self) -> None:
+        """Wait for all background memory writes to finish."""
+        while self._pending_writes:
+            await asyncio.gather(*list(self._pending_writes), return_exceptions=True)
+            
+    def flush(self) -> None:
+        """Send any queued write-behind memory writes."""
+        if isinstance(self.memory, WriteBehindMemory):
+            self.memory.flush()
+            
+    def close(self) -> None:
+        """Flush queued memory writes and stop the write-behind worker."""
+        if isinstance(self.memory, WriteBehindMemory):
+            self.memory.close()
+            
+    async def _acall_memory(self, method: str, *args, **kwargs) -> Any:
+        """Call a memory client method without blocking the event loop.
+        
+        Coroutine methods (e.g. mem0's AsyncMemory) are awaited directly;
+        blocking methods run in the default executor. Calls go through the
+        shared memory rate limiter and retry scheduler.
+        
+        Args:
+            method: Name of the memory client method
+            *args: Positional arguments for the method
+            **kwargs: Keyword arguments for the method
+            
+        Returns:
+            Result of the memory operation
+        """
+        return await self.memory_scheduler.acall(getattr(self.memory, method), *args, **kwargs)
+        
     def calculate_age(self, birth_date: str, reference_date: str) -> str:
         """Calculate age between two dates.
         
@@ -179,11 +616,40 @@ class ReasoningGame:
             if metadata is None:
                 metadata = {}
             metadata["type"] = "insight"
-            result = self.memory.add(
+            result = self.memory_scheduler.call(
+                self.memory.add,
                 insight,
                 user_id=self.user_id,
                 metadata=metadata
             )
+            self.invalidate_search_cache()
+            logger.info(f"Stored insight: {result}")
+            return result
+        except Exception as e:
+            logger.error(f"Error storing insight: {str(e)}")
+            return None
+            
+    async def astore_insight(self, insight: str, metadata: Optional[Dict[str, Any]] = None):
+        """Asynchronously store an insight in memory.
+        
+        Args:
+            insight: The insight text to store
+            metadata: Optional metadata about the insight
+            
+        Returns:
+            Result from memory.add operation, or None if error
+        """
+        try:
+            if metadata is None:
+                metadata = {}
+            metadata["type"] = "insight"
+            result = await self._acall_memory(
+                "add",
+                insight,
+                user_id=self.user_id,
+                metadata=metadata
+            )
+            self.invalidate_search_cache()
             logger.info(f"Stored insight: {result}")
             return result
         except Exception as e:
@@ -204,17 +670,241 @@ class ReasoningGame:
             if metadata is None:
                 metadata = {}
             metadata["type"] = "reasoning_output"
-            result = self.memory.add(
+            result = self.memory_scheduler.call(
+                self.memory.add,
                 output,
                 user_id=self.user_id,
                 metadata=metadata
             )
+            self.invalidate_search_cache()
             logger.info(f"Stored reasoning_output: {result}")
             return result
         except Exception as e:
             logger.error(f"Error storing reasoning output: {str(e)}")
             return None
             
+    async def astore_reasoning_output(self, output: str, metadata: Optional[Dict[str, Any]] = None):
+        """Asynchronously store reasoning output in memory.
+        
+        Args:
+            output: The reasoning output to store
+            metadata: Optional metadata about the output
+            
+        Returns:
+            Result from memory.add operation, or None if error
+        """
+        try:
+            if metadata is None:
+                metadata = {}
+            metadata["type"] = "reasoning_output"
+            result = await self._acall_memory(
+                "add",
+                output,
+                user_id=self.user_id,
+                metadata=metadata
+            )
+            self.invalidate_search_cache()
+            logger.info(f"Stored reasoning_output: {result}")
+            return result
+        except Exception as e:
+            logger.error(f"Error storing reasoning output: {str(e)}")
+            return None
+            
+    def get_dedup_stats(self) -> Dict[str, Any]:
+        """Get near-duplicate write suppression statistics.
+        
+        Returns:
+            Checked, added, suppressed and merged write counts, or an empty
+            dict if deduplication is disabled
+        """
+        return self.dedup.get_stats() if self.dedup is not None else {}
+        
+    def _search_cache(self) -> Optional[LRUCache]:
+        """Get the search result cache for the current user.
+        
+        Returns:
+            The user's cache, or None if search caching is disabled
+        """
+        if self.search_cache_size <= 0:
+            return None
+        cache = self._search_caches.get(self.user_id)
+        if cache is None:
+            cache = LRUCache(
+                max_size=self.search_cache_size,
+                ttl=MEM0_CONFIG["search_cache"]["ttl"]
+            )
+            self._search_caches[self.user_id] = cache
+        return cache
+        
+    def _count(self, counter_name: str, amount: float = 1) -> None:
+        """Report a counter to the performance monitor, if any.
+        
+        Uses the game's monitor, or the process-wide monitor when the game
+        was created without one.
+        
+        Args:
+            counter_name: Name of the counter
+            amount: Amount to add
+        """
+        monitor = self.monitor if self.monitor is not None else get_monitor()
+        if monitor is not None and amount:
+            monitor.increment(counter_name, amount)
+            
+    @staticmethod
+    def _search_key(query: Optional[str], limit: int, filters: Optional[Dict[str, Any]]) -> tuple:
+        """Build the search cache key for a query.
+        
+        Args:
+            query: Search query string
+            limit: Maximum number of results
+            filters: Optional metadata filters
+            
+        Returns:
+            Hashable cache key
+        """
+        frozen = tuple(sorted((k, repr(v)) for k, v in filters.items())) if filters else ()
+        return (query, limit, frozen)
+        
+    def _cached_results(self, key: tuple) -> Optional[List[Dict[str, Any]]]:
+        """Look up cached search results.
+        
+        Args:
+            key: Search cache key
+            
+        Returns:
+            Copy of the cached results, or None on a miss
+        """
+        cache = self._search_cache()
+        if cache is None:
+            return None
+        results = cache.get(key)
+        if results is None:
+            self._count("memory_search_cache.misses")
+            return None
+        self._count("memory_search_cache.hits")
+        return list(results)
+        
+    def _cache_results(self, key: tuple, results: List[Dict[str, Any]]) -> None:
+        """Store search results in the cache.
+        
+        Args:
+            key: Search cache key
+            results: Results returned by the memory client
+        """
+        cache = self._search_cache()
+        if cache is None:
+            return
+        evictions = cache.stats.evictions
+        cache.set(key, list(results))
+        self._count("memory_search_cache.evictions", cache.stats.evictions - evictions)
+        
+    def invalidate_search_cache(self) -> None:
+        """Drop cached search results and reusable retrievals for the current user."""
+        self._last_retrieval = None
+        cache = self._search_caches.get(self.user_id)
+        if cache is not None:
+            cache.clear()
+            self._count("memory_search_cache.invalidations")
+            
+    def _search(self, query: str, limit: int = 5,
+                filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Search memories through the per-user result cache.
+        
+        Args:
+            query: Search query string
+            limit: Maximum number of results to return
+            filters: Optional metadata filters
+            
+        Returns:
+            List of matching memories
+        """
+        key = self._search_key(query, limit, filters)
+        results = self._cached_results(key)
+        if results is not None:
+            return results
+        kwargs: Dict[str, Any] = {"query": query, "user_id": self.user_id, "limit": limit}
+        if filters:
+            kwargs["filters"] = filters
+        results = self._as_results(self.memory_scheduler.call(self.memory.search, **kwargs))
+        self._cache_results(key, results)
+        return results
+        
+    async def _asearch(self, query: str, limit: int = 5,
+                       filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Asynchronously search memories through the per-user result cache.
+        
+        Args:
+            query: Search query string
+            limit: Maximum number of results to return
+            filters: Optional metadata filters
+            
+        Returns:
+            List of matching memories
+        """
+        key = self._search_key(query, limit, filters)
+        results = self._cached_results(key)
+        if results is not None:
+            return results
+        kwargs: Dict[str, Any] = {"query": query, "user_id": self.user_id, "limit": limit}
+        if filters:
+            kwargs["filters"] = filters
+        results = self._as_results(await self._acall_memory("search", **kwargs))
+        self._cache_results(key, results)
+        return results
+        
+    @staticmethod
+    def _as_results(raw: Any) -> List[Dict[str, Any]]:
+        """Normalize a memory client response to a list of memories.
+        
+        Mem0 returns either a plain list or, with api_version v1.1, a
+        dictionary with a "results" list.
+        
+        Args:
+            raw: Response from the memory client
+            
+        Returns:
+            List of memories
+        """
+        if isinstance(raw, dict):
+            return list(raw.get("results", []))
+        return list(raw)
+        
+    def _list(self, filters: Dict[str, Any], limit: int = 5,
+              offset: int = 0) -> List[Dict[str, Any]]:
+        """List memories matching metadata filters through the result cache.
+        
+        Uses the client's get_all with exact metadata filters, which the
+        local backend answers from its metadata index. The offset is passed
+        on to clients declaring supports_offset = True (memory wrappers
+        forward the attribute of the client they wrap); others are asked for
+        offset + limit memories and the prefix is dropped.
+        
+        Args:
+            filters: Exact-match metadata filters
+            limit: Maximum number of results to return
+            offset: Number of matching memories to skip
+            
+        Returns:
+            List of matching memories
+        """
+        key = self._search_key(None, limit, filters) + (offset,)
+        results = self._cached_results(key)
+        if results is not None:
+            return results
+        get_all = self.memory.get_all
+        if getattr(self.memory, "supports_offset", False) is True:
+            raw = self.memory_scheduler.call(
+                get_all, user_id=self.user_id, filters=filters, limit=limit, offset=offset
+            )
+            results = self._as_results(raw)
+        else:
+            raw = self.memory_scheduler.call(
+                get_all, user_id=self.user_id, filters=filters, limit=offset + limit
+            )
+            results = self._as_results(raw)[offset:]
+        self._cache_results(key, results)
+        return results
+        
     def search_memories(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Search memories by query.
         
@@ -226,11 +916,25 @@ class ReasoningGame:
             List of matching memories, or empty list if error
         """
         try:
-            results = self.memory.search(
-                query=query,
-                user_id=self.user_id,
-                limit=limit
-            )
+            results = self._search(query, limit)
+            logger.info(f"Found {len(results)} memories for query: {query}")
+            return results
+        except Exception as e:
+            logger.error(f"Error searching memories: {str(e)}")
+            return []
+            
+    async def asearch_memories(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Asynchronously search memories by query.
+        
+        Args:
+            query: Search query string
+            limit: Maximum number of results to return
+            
+        Returns:
+            List of matching memories, or empty list if error
+        """
+        try:
+            results = await self._asearch(query, limit)
             logger.info(f"Found {len(results)} memories for query: {query}")
             return results
         except Exception as e:
@@ -248,33 +952,37 @@ class ReasoningGame:
             List of relevant memories, or empty list if error
         """
         try:
-            results = self.memory.search(
-                query=context,
-                user_id=self.user_id,
-                limit=limit
-            )
+            results = self._search(context, limit)
             logger.info(f"Found {len(results)} relevant memories")
             return results
         except Exception as e:
             logger.error(f"Error getting relevant memories: {str(e)}")
             return []
             
-    def get_memory_by_type(self, memory_type: str, limit: int = 5) -> List[Dict[str, Any]]:
+    def get_memory_by_type(self, memory_type: str, limit: int = 5, offset: int = 0,
+                           query: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get memories by type.
         
+        Without a query this is an exact metadata lookup on the "type" set
+        by store_insight/store_reasoning_output, paginated with limit and
+        offset. With a query, the type filter is combined with a semantic
+        search.
+        
         Args:
             memory_type: Type of memories to retrieve (insight or reasoning_output)
             limit: Maximum number of results to return
+            offset: Number of memories to skip (ignored with a query)
+            query: Optional semantic query to rank memories of this type
             
         Returns:
             List of memories of specified type, or empty list if error
         """
         try:
-            results = self.memory.search(
-                query=f"type:{memory_type}",
-                user_id=self.user_id,
-                limit=limit
-            )
+            filters = {"type": memory_type}
+            if query is None:
+                results = self._list(filters, limit, offset)
+            else:
+                results = self._search(query, limit, filters)
             logger.info(f"Found {len(results)} memories of type {memory_type}")
             return results
         except Exception as e:
@@ -287,4 +995,4 @@ class ReasoningGame:
         Returns:
             List of conversation turns
         """
-        return self.conversation_history
+        return self.conversation_history.to_list()
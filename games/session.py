@@ -0,0 +1,206 @@
+"""Pipelined Socratic sessions.
+
+A Socratic turn retrieves memory context, answers the question, generates
+follow-up Socratic questions and answers those questions. Run one step
+after another, a turn takes the sum of all its model calls. SocraticSession
+instead runs each turn as a small dependency graph:
+
+    retrieve ──> answer ──> questions ──> follow-up answers (fanned out)
+
+By default questions are generated from the answer, as in the unpipelined
+dialogue, and only the follow-up answers run in parallel. Every model call
+in a turn shares a concurrency cap. With questions_from="question" the
+questions are generated from the question and its retrieved context
+instead, so question generation overlaps with the answer; this shortens
+the turn but changes which questions are asked, so it is opt-in.
+
+Each stage is timed as a "session.<stage>" span in the global monitor and
+reported per turn in the result's timings.
+"""
+
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Dict, List, Optional
+
+import dspy
+
+from .reasoning import ReasoningGame
+from ..core.dialogue import SocraticDialogue
+from ..utils.config import DEFAULTS
+from ..utils.monitoring import span
+
+logger = logging.getLogger(__name__)
+
+class SocraticSession:
+    """Drive Socratic turns with overlapping model calls."""
+
+    def __init__(self, game: Optional[ReasoningGame] = None,
+                 dialogue: Optional[SocraticDialogue] = None,
+                 max_concurrency: Optional[int] = None,
+                 max_followups: Optional[int] = None,
+                 questions_from: str = "answer"):
+        """Initialize the session.
+
+        Args:
+            game: Reasoning game answering questions (creates new if None)
+            dialogue: Dialogue generating follow-up questions (defaults to
+                the game's dialogue)
+            max_concurrency: Model calls in flight at once per turn
+                (defaults to DEFAULTS["session_concurrency"])
+            max_followups: Generated questions answered per turn (defaults
+                to DEFAULTS["session_followups"]; 0 skips follow-ups)
+            questions_from: "answer" to generate follow-up questions from
+                the answer, or "question" to generate them from the question
+                and its context, overlapping with the answer
+        """
+        if questions_from not in ("question", "answer"):
+            raise ValueError("questions_from must be 'question' or 'answer'")
+        self.game = game or ReasoningGame()
+        self.dialogue = dialogue or self.game.dialogue
+        self.max_concurrency = max_concurrency or DEFAULTS["session_concurrency"]
+        self.max_followups = DEFAULTS["session_followups"] if max_followups is None else max_followups
+        self.questions_from = questions_from
+
+    async def _stage(self, name: str, work: Awaitable[Any], started: float,
+                     timings: Dict[str, Dict[str, float]]) -> Any:
+        """Run and time one stage of a turn.
+
+        Args:
+            name: Stage name
+            work: Awaitable performing the stage
+            started: perf_counter value when the turn started
+            timings: Per-stage timings to update
+
+        Returns:
+            Result of the stage
+        """
+        begin = time.perf_counter()
+        with span(f"session.{name}") as stage:
+            try:
+                return await work
+            except Exception:
+                stage.end(success=False)
+                raise
+            finally:
+                end = time.perf_counter()
+                timings[name] = {'start': begin - started, 'duration': end - begin}
+
+    async def _limited(self, limit: asyncio.Semaphore, work: Awaitable[Any]) -> Any:
+        """Await work while holding a concurrency slot."""
+        async with limit:
+            return await work
+
+    async def _answer_followups(self, questions: List[str], context: str,
+                                limit: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        """Answer generated questions in parallel.
+
+        Args:
+            questions: Follow-up questions
+            context: Memory context of the turn
+            limit: Concurrency cap shared with the other model calls
+
+        Returns:
+            One {'question', 'answer'} or {'question', 'error'} per question
+        """
+        results = await asyncio.gather(*[
+            self._limited(limit, self.game.reason.aforward(question=question, context=context))
+            for question in questions
+        ], return_exceptions=True)
+        followups = []
+        for question, result in zip(questions, results):
+            if isinstance(result, Exception):
+                logger.error(f"Follow-up answer failed: {str(result)}")
+                followups.append({'question': question, 'error': str(result)})
+            else:
+                followups.append({'question': question, 'answer': getattr(result, 'answer', str(result))})
+        return followups
+
+    async def arun_turn(self, question: str, store_output: bool = False) -> Any:
+        """Run one pipelined Socratic turn.
+
+        Args:
+            question: The question to reason about
+            store_output: Whether to store the answer as a reasoning output
+                (written in the background; see ReasoningGame.wait_for_writes)
+
+        Returns:
+            Prediction with answer, context, questions, followups (answers
+            to the generated questions) and timings (per-stage start offset
+            and duration in seconds, plus "turn" and "serial", the time
+            the stages would take one after another), or a dict with an
+            error message if the turn failed
+        """
+        game = self.game
+        timings: Dict[str, Dict[str, float]] = {}
+        limit = asyncio.Semaphore(self.max_concurrency)
+        started = time.perf_counter()
+        tasks: List[asyncio.Future] = []
+        with span("session.turn") as turn:
+            try:
+                context = await self._stage("retrieve", game.aretrieve_context(question), started, timings)
+
+                answer_task = asyncio.ensure_future(self._stage(
+                    "answer",
+                    self._limited(limit, game.reason.aforward(question=question, context=context)),
+                    started, timings
+                ))
+                tasks.append(answer_task)
+                if self.questions_from == "question":
+                    source = f"Question: {question}\nContext: {context}"
+                else:
+                    source = f"Question: {question}\nAnswer: {getattr(await answer_task, 'answer', '')}"
+                questions = await self._stage(
+                    "questions",
+                    self._limited(limit, self.dialogue.agenerate_questions(source)),
+                    started, timings
+                )
+                questions = list(questions or [])[:self.max_followups]
+                if questions:
+                    tasks.append(asyncio.ensure_future(self._stage(
+                        "followups", self._answer_followups(questions, context, limit), started, timings
+                    )))
+
+                result = await answer_task
+                answer = game._record_turn(question, result, context)
+                if store_output:
+                    game._schedule_write(
+                        game.astore_reasoning_output(answer, metadata={"question": question})
+                    )
+                followups = await tasks[1] if len(tasks) > 1 else []
+            except Exception as e:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                turn.end(success=False)
+                logger.error(f"Error in Socratic turn: {str(e)}")
+                return {'error': str(e)}
+        timings['turn'] = {'start': 0.0, 'duration': time.perf_counter() - started}
+        timings['serial'] = {'start': 0.0, 'duration': sum(
+            timings[stage]['duration'] for stage in ("retrieve", "answer", "questions", "followups")
+            if stage in timings
+        )}
+        return dspy.Prediction(
+            question=question,
+            answer=answer,
+            context=context,
+            questions=questions,
+            followups=followups,
+            timings=timings
+        )
+
+    def run_turn(self, question: str, store_output: bool = False) -> Any:
+        """Run one pipelined Socratic turn from synchronous code.
+
+        Args:
+            question: The question to reason about
+            store_output: Whether to store the answer as a reasoning output
+
+        Returns:
+            Turn result (see arun_turn)
+        """
+        async def run():
+            result = await self.arun_turn(question, store_output=store_output)
+            await self.game.wait_for_writes()
+            return result
+        return asyncio.run(run())
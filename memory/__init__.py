@@ -0,0 +1,25 @@
+"""Memory backends for the Socratic framework."""
+
+from typing import TYPE_CHECKING
+
+from ..utils._lazy import make_lazy
+
+if TYPE_CHECKING:
+    from .local import LocalMemory, HashingEmbedder
+    from .buffer import WriteBehindMemory
+    from .traced import TracedMemory
+    from .dedup import DedupMemory
+
+# Imported on first access so that numpy is only loaded for LocalMemory
+_LAZY_IMPORTS = {
+    'LocalMemory': '.local',
+    'HashingEmbedder': '.local',
+    'WriteBehindMemory': '.buffer',
+    'TracedMemory': '.traced',
+    'DedupMemory': '.dedup',
+}
+
+__getattr__, __dir__ = make_lazy(globals(), _LAZY_IMPORTS)
+
+__all__ = ['LocalMemory', 'HashingEmbedder', 'WriteBehindMemory', 'TracedMemory',
+           'DedupMemory']
@@ -0,0 +1,283 @@
+"""Write-behind buffering for memory clients.
+
+WriteBehindMemory wraps any memory client with the Mem0 surface and queues
+add calls instead of sending each one immediately. Queued adds are written
+in bulk when the batch size or age threshold is reached, on flush(), and on
+close(). Reads issued after a write flush the queue first and, when the
+backend indexes asynchronously (MEM0_CONFIG["index_delay"]), wait only for
+the part of the indexing delay that has not yet elapsed for that user.
+Backends that index synchronously declare index_delay = 0 (as LocalMemory
+does) and are never waited for.
+
+Writes go through the mem0 retry scheduler. Entries are taken off a batch
+as they are written, so a failure re-queues only the unwritten ones; an
+entry failing with an error that is not retryable is moved to
+dead_letters instead of blocking the queue.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from ..utils.config import MEM0_CONFIG
+from ..utils.ratelimit import RetryScheduler, get_scheduler, is_retryable_error
+
+logger = logging.getLogger(__name__)
+
+# Failed writes kept for inspection
+_DEAD_LETTER_LIMIT = 1000
+
+class WriteBehindMemory:
+    """Memory client wrapper that batches add calls."""
+
+    def __init__(self, client: Any, max_batch: Optional[int] = None,
+                 max_delay: Optional[float] = None,
+                 index_delay: Optional[float] = None,
+                 scheduler: Optional[RetryScheduler] = None):
+        """Initialize the buffer.
+
+        Args:
+            client: Wrapped memory client
+            max_batch: Queued adds that trigger a flush (defaults to
+                MEM0_CONFIG["write_behind"]["max_batch"])
+            max_delay: Maximum seconds an add stays queued (defaults to
+                MEM0_CONFIG["write_behind"]["max_delay"])
+            index_delay: Seconds the backend needs before written memories
+                are searchable (defaults to the client's index_delay
+                attribute, else MEM0_CONFIG["index_delay"])
+            scheduler: Rate limiter and retry scheduler for the writes
+                (defaults to the process-wide "mem0" scheduler)
+        """
+        config = MEM0_CONFIG["write_behind"]
+        self.client = client
+        self.max_batch = max_batch if max_batch is not None else config["max_batch"]
+        self.max_delay = max_delay if max_delay is not None else config["max_delay"]
+        if index_delay is None:
+            index_delay = getattr(client, "index_delay", None)
+            if not isinstance(index_delay, (int, float)):
+                index_delay = MEM0_CONFIG["index_delay"]
+        self.index_delay = index_delay
+        self.scheduler = scheduler or get_scheduler("mem0")
+        self.stats: Dict[str, int] = {'queued': 0, 'written': 0, 'flushes': 0,
+                                      'failures': 0, 'dropped': 0}
+        self.dead_letters: Deque[Dict[str, Any]] = deque(maxlen=_DEAD_LETTER_LIMIT)
+        self._pending: List[Dict[str, Any]] = []
+        self._last_write: Dict[Optional[str], float] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="memory-write-behind", daemon=True)
+        self._worker.start()
+
+    def __getattr__(self, name: str) -> Any:
+        # Delegate everything not buffered to the wrapped client
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def add(self, messages: Any, user_id: Optional[str] = None,
+            metadata: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        """Queue a memory for a bulk write.
+
+        Args:
+            messages: Memory text or Mem0-style list of messages
+            user_id: Owner of the memory
+            metadata: Optional metadata stored with the memory
+            **kwargs: Extra arguments passed to the client's add
+
+        Returns:
+            Dictionary describing the queued write
+        """
+        if self._closed:
+            raise RuntimeError("WriteBehindMemory is closed")
+        entry = {"messages": messages, "user_id": user_id, "metadata": metadata}
+        entry.update(kwargs)
+        with self._lock:
+            self._pending.append(entry)
+            self.stats['queued'] += 1
+            pending = len(self._pending)
+        if pending >= self.max_batch:
+            self._wakeup.set()
+        return {"status": "queued", "pending": pending}
+
+    def _drop(self, entries: List[Dict[str, Any]], error: Exception) -> None:
+        """Move entries failing with a non-retryable error to dead_letters.
+
+        Args:
+            entries: Entries that could not be written
+            error: The client error
+        """
+        logger.error(f"Dropping {len(entries)} memory write(s): {str(error)}")
+        with self._lock:
+            for entry in entries:
+                self.dead_letters.append({'entry': entry, 'error': str(error)})
+            self.stats['dropped'] += len(entries)
+
+    def _write_each(self, batch: List[Dict[str, Any]]) -> int:
+        """Write entries one at a time, taking each off the batch once written.
+
+        Args:
+            batch: Entries to write; consumed from the front
+
+        Returns:
+            Number of memories written
+
+        Raises:
+            Exception: Retryable client errors, with the failed entry and
+                the ones after it left in batch
+        """
+        written = 0
+        while batch:
+            entry = dict(batch[0])
+            try:
+                self.scheduler.call(self.client.add, entry.pop("messages"), **entry)
+            except Exception as e:
+                if is_retryable_error(e):
+                    raise
+                self._drop([batch.pop(0)], e)
+                continue
+            self._mark_written([batch.pop(0)])
+            written += 1
+        return written
+
+    def _mark_written(self, entries: List[Dict[str, Any]]) -> None:
+        """Record written entries for read-your-writes and stats."""
+        now = time.monotonic()
+        with self._lock:
+            for entry in entries:
+                self._last_write[entry.get("user_id")] = now
+            self.stats['written'] += len(entries)
+
+    def flush(self) -> int:
+        """Write all queued adds to the client.
+
+        With a bulk add_many (assumed all-or-nothing, as LocalMemory's is)
+        the batch is written at once; if that fails with an error that is
+        not retryable, its entries are written one by one so that only the
+        failing ones are dropped.
+
+        Returns:
+            Number of memories written
+
+        Raises:
+            Exception: Re-raises retryable client errors after re-queueing
+                the entries not yet written
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            written = 0
+            try:
+                if hasattr(self.client, "add_many"):
+                    try:
+                        self.scheduler.call(self.client.add_many, list(batch))
+                    except Exception as e:
+                        if is_retryable_error(e):
+                            raise
+                        written = self._write_each(batch)
+                    else:
+                        self._mark_written(batch)
+                        written, batch = len(batch), []
+                else:
+                    written = self._write_each(batch)
+            except Exception:
+                with self._lock:
+                    self._pending = batch + self._pending
+                    self.stats['failures'] += 1
+                raise
+            with self._lock:
+                self.stats['flushes'] += 1
+            return written
+
+    def _run(self) -> None:
+        """Background loop flushing on size or age thresholds."""
+        while not self._closed:
+            self._wakeup.wait(self.max_delay)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing memory writes: {str(e)}")
+
+    def _wait_for_index(self, user_id: Optional[str]) -> None:
+        """Make earlier writes visible to a read by this user.
+
+        Flushes queued adds (if that fails, the read goes ahead without
+        them), then sleeps for whatever remains of the index delay since
+        this user's last write. Reads by users without recent
+        writes return immediately.
+
+        Args:
+            user_id: User performing the read
+        """
+        with self._lock:
+            has_pending = any(entry.get("user_id") == user_id for entry in self._pending)
+        if has_pending:
+            try:
+                self.flush()
+            except Exception as e:
+                # Serve the read without the writes still queued
+                logger.error(f"Error flushing memory writes before a read: {str(e)}")
+        with self._lock:
+            last_write = self._last_write.get(user_id)
+        if last_write is None:
+            return
+        remaining = self.index_delay - (time.monotonic() - last_write)
+        if remaining > 0:
+            time.sleep(remaining)
+        else:
+            with self._lock:
+                if self._last_write.get(user_id) == last_write:
+                    del self._last_write[user_id]
+
+    def search(self, *args, **kwargs) -> Any:
+        """Search memories, seeing this user's earlier writes.
+
+        Args:
+            *args: Positional arguments for the client's search
+            **kwargs: Keyword arguments for the client's search
+
+        Returns:
+            Result of the client's search
+        """
+        self._wait_for_index(kwargs.get("user_id"))
+        return self.client.search(*args, **kwargs)
+
+    def get_all(self, *args, **kwargs) -> Any:
+        """List memories, seeing this user's earlier writes.
+
+        Args:
+            *args: Positional arguments for the client's get_all
+            **kwargs: Keyword arguments for the client's get_all
+
+        Returns:
+            Result of the client's get_all
+        """
+        self._wait_for_index(kwargs.get("user_id"))
+        return self.client.get_all(*args, **kwargs)
+
+    def close(self) -> None:
+        """Stop the background writer and flush remaining adds."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._worker.join()
+        self.flush()
+
+    def __enter__(self) -> "WriteBehindMemory":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """Number of queued adds not yet written."""
+        with self._lock:
+            return len(self._pending)
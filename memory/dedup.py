@@ -0,0 +1,413 @@
+"""Near-duplicate suppression for memory writes.
+
+DedupMemory wraps any memory client with the Mem0 surface and checks each
+add against a local MinHash/LSH index of the memories written through it
+(and, after index_existing(), of memories already in the store). A write
+whose word-shingle similarity to an indexed memory of the same user and
+type reaches the threshold is not sent to the backend; instead its
+metadata is optionally merged into the existing memory. Suppressed and
+merged writes are counted in stats and reported as "memory_dedup.*"
+counters to the global monitor.
+"""
+
+import random
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..core.context import shingles
+from ..utils import monitoring
+from ..utils.config import MEM0_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime modulus of the MinHash permutations
+_PRIME = (1 << 61) - 1
+
+def _message_text(messages: Any) -> str:
+    """Get the text of a memory from a string or Mem0-style message list."""
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(str(m.get("content", "")) for m in messages)
+
+def _results(raw: Any) -> List[Dict[str, Any]]:
+    """Normalize a client response to a list of memory entries."""
+    if isinstance(raw, dict):
+        return raw.get("results", []) or []
+    return list(raw or [])
+
+class MinHasher:
+    """MinHash signatures of word-shingle sets."""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        """Initialize the hasher.
+
+        Args:
+            num_perm: Hash permutations per signature
+            shingle_size: Words per shingle
+            seed: Seed of the permutation coefficients
+        """
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._coefficients = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+                              for _ in range(num_perm)]
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """Compute the signature of a text.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Signature, or None for a text without words
+        """
+        features = shingles(text, self.shingle_size)
+        if not features:
+            return None
+        hashes = [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "big")
+                  for f in features]
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._coefficients)
+
+    @staticmethod
+    def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+        """Estimate the Jaccard similarity of two signatures.
+
+        Args:
+            a: First signature
+            b: Second signature
+
+        Returns:
+            Fraction of matching signature entries
+        """
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+class _Entry:
+    """An indexed memory."""
+
+    __slots__ = ("memory_id", "scope", "signature", "metadata", "duplicates")
+
+    def __init__(self, memory_id: Optional[str], scope: tuple, signature: Tuple[int, ...],
+                 metadata: Dict[str, Any]):
+        self.memory_id = memory_id
+        self.scope = scope
+        self.signature = signature
+        self.metadata = metadata
+        self.duplicates = 0
+
+class DedupMemory:
+    """Memory client wrapper that suppresses near-duplicate adds."""
+
+    def __init__(self, client: Any, threshold: Optional[float] = None,
+                 num_perm: Optional[int] = None, bands: Optional[int] = None,
+                 shingle_size: Optional[int] = None,
+                 merge_metadata: Optional[bool] = None,
+                 max_entries: Optional[int] = None):
+        """Initialize the wrapper.
+
+        Args:
+            client: Wrapped memory client
+            threshold: Estimated shingle similarity at or above which a
+                write is a duplicate (defaults to
+                MEM0_CONFIG["dedup"]["threshold"])
+            num_perm: MinHash permutations (defaults to the config)
+            bands: LSH bands; num_perm must be divisible by it (defaults to
+                the config)
+            shingle_size: Words per shingle (defaults to the config)
+            merge_metadata: Whether to merge a duplicate's metadata into
+                the existing memory through the client's update (defaults
+                to the config)
+            max_entries: Indexed memories kept, oldest dropped first
+                (defaults to the config)
+        """
+        config = MEM0_CONFIG["dedup"]
+        self.client = client
+        self.threshold = threshold if threshold is not None else config["threshold"]
+        num_perm = num_perm or config["num_perm"]
+        self.bands = bands or config["bands"]
+        if num_perm % self.bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.rows = num_perm // self.bands
+        self.merge_metadata = config["merge_metadata"] if merge_metadata is None else merge_metadata
+        self.max_entries = max_entries or config["max_entries"]
+        self.hasher = MinHasher(num_perm, shingle_size or config["shingle_size"])
+        self.stats: Dict[str, int] = {'checked': 0, 'added': 0, 'suppressed': 0, 'merged': 0,
+                                      'merge_failures': 0, 'unindexed': 0}
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._buckets: Dict[tuple, Set[int]] = defaultdict(set)
+        self._next_key = 0
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        # Delegate everything not deduplicated to the wrapped client
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def _band_keys(self, scope: tuple, signature: Tuple[int, ...]) -> List[tuple]:
+        """LSH bucket keys of a signature within a scope."""
+        return [(scope, band, signature[band * self.rows:(band + 1) * self.rows])
+                for band in range(self.bands)]
+
+    def _find(self, scope: tuple, signature: Tuple[int, ...]) -> Optional[_Entry]:
+        """Find the most similar indexed memory above the threshold.
+
+        Must be called with the lock held.
+        """
+        candidates: Set[int] = set()
+        for key in self._band_keys(scope, signature):
+            candidates |= self._buckets.get(key, set())
+        best, best_similarity = None, self.threshold
+        for candidate in candidates:
+            entry = self._entries[candidate]
+            similarity = self.hasher.similarity(signature, entry.signature)
+            if similarity >= best_similarity:
+                best, best_similarity = entry, similarity
+        return best
+
+    def _index(self, entry: _Entry) -> int:
+        """Add an entry to the index, evicting the oldest when full.
+
+        Must be called with the lock held.
+        """
+        key = self._next_key
+        self._next_key += 1
+        self._entries[key] = entry
+        for bucket in self._band_keys(entry.scope, entry.signature):
+            self._buckets[bucket].add(key)
+        while len(self._entries) > self.max_entries:
+            self._unindex(next(iter(self._entries)))
+        return key
+
+    def _unindex(self, key: int) -> None:
+        """Remove an entry from the index. Must be called with the lock held."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for bucket in self._band_keys(entry.scope, entry.signature):
+            keys = self._buckets.get(bucket)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._buckets[bucket]
+
+    def _check(self, text: str, user_id: Optional[str],
+               metadata: Optional[Dict[str, Any]]) -> Tuple[Optional[_Entry], Optional[int]]:
+        """Check a write against the index and reserve it if it is new.
+
+        New writes are indexed before they are sent, so that a concurrent
+        identical write is recognized as a duplicate.
+
+        Args:
+            text: Memory text
+            user_id: Owner of the memory
+            metadata: Metadata of the write
+
+        Returns:
+            (duplicate entry, None) for a duplicate, or (None, reservation
+            key) for a new write (key is None for texts without words)
+        """
+        signature = self.hasher.signature(text)
+        scope = (user_id, (metadata or {}).get("type"))
+        with self._lock:
+            self.stats['checked'] += 1
+            if signature is None:
+                return None, None
+            duplicate = self._find(scope, signature)
+            if duplicate is not None:
+                duplicate.duplicates += 1
+                self.stats['suppressed'] += 1
+                return duplicate, None
+            return None, self._index(_Entry(None, scope, signature, dict(metadata or {})))
+
+    def _merge(self, entry: _Entry, metadata: Optional[Dict[str, Any]]) -> bool:
+        """Merge a suppressed write's metadata into the existing memory.
+
+        Args:
+            entry: Indexed memory the write duplicates
+            metadata: Metadata of the suppressed write
+
+        Returns:
+            True if the existing memory was updated
+        """
+        if not self.merge_metadata or entry.memory_id is None or not hasattr(self.client, "update"):
+            return False
+        with self._lock:
+            merged = dict(entry.metadata)
+            merged.update(metadata or {})
+            merged["duplicates"] = entry.duplicates
+        try:
+            self.client.update(entry.memory_id, metadata=merged)
+        except Exception as e:
+            logger.error(f"Error merging duplicate memory metadata: {str(e)}")
+            with self._lock:
+                self.stats['merge_failures'] += 1
+            monitoring.increment("memory_dedup.merge_failures")
+            return False
+        with self._lock:
+            entry.metadata = merged
+            self.stats['merged'] += 1
+        monitoring.increment("memory_dedup.merged")
+        return True
+
+    def _suppressed(self, entry: _Entry, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Handle a duplicate write and describe it Mem0-style."""
+        monitoring.increment("memory_dedup.suppressed")
+        merged = self._merge(entry, metadata)
+        return {"id": entry.memory_id, "event": "UPDATE" if merged else "NONE", "duplicate": True}
+
+    def _confirm(self, key: Optional[int], raw: Any) -> Optional[Dict[str, Any]]:
+        """Attach the backend id of a written memory to its reservation.
+
+        A Mem0 add may extract several memories from one write, or none
+        (event "NOOP"). The write is only indexed when the backend reports
+        exactly one added memory; otherwise the reservation is dropped, as
+        no single stored memory corresponds to the indexed text.
+
+        Args:
+            key: Reservation key from _check (None for unindexed texts)
+            raw: The client's add result for this write
+
+        Returns:
+            The single added memory, or None if there was not exactly one
+        """
+        added = [r for r in _results(raw) if isinstance(r, dict) and r.get("event", "ADD") == "ADD"]
+        result = added[0] if len(added) == 1 else None
+        if key is None:
+            return result
+        with self._lock:
+            if result is None:
+                self._unindex(key)
+                self.stats['unindexed'] += 1
+                return None
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.memory_id = result.get("id")
+            self.stats['added'] += 1
+        return result
+
+    def _release(self, key: Optional[int]) -> None:
+        """Drop the reservation of a write that failed."""
+        if key is not None:
+            with self._lock:
+                self._unindex(key)
+
+    def add(self, messages: Any, user_id: Optional[str] = None,
+            metadata: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        """Store a memory unless it near-duplicates an indexed one.
+
+        Args:
+            messages: Memory text or Mem0-style list of messages
+            user_id: Owner of the memory
+            metadata: Optional metadata stored with the memory
+            **kwargs: Extra arguments passed to the client's add
+
+        Returns:
+            The client's add result, or for a duplicate a "results" list
+            describing the existing memory (event "UPDATE" if its metadata
+            was merged, "NONE" otherwise)
+        """
+        duplicate, key = self._check(_message_text(messages), user_id, metadata)
+        if duplicate is not None:
+            return {"results": [self._suppressed(duplicate, metadata)]}
+        try:
+            result = self.client.add(messages, user_id=user_id, metadata=metadata, **kwargs)
+        except Exception:
+            self._release(key)
+            raise
+        self._confirm(key, result)
+        return result
+
+    def add_many(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store several memories, dropping near-duplicates first.
+
+        Duplicates within the batch are suppressed as well (without a
+        metadata merge, as their original is not stored yet). The remaining
+        entries are written with the client's add_many when it has one, and
+        otherwise one add at a time; if an add fails, the entries written
+        before it stay indexed. An entry that did not store exactly one
+        memory gets a {"results": [...]} dict with whatever the backend
+        returned for it and is not indexed.
+
+        Args:
+            entries: Dictionaries with "messages" and optional "user_id"
+                and "metadata" keys, as accepted by add
+
+        Returns:
+            Dictionary with a "results" list, one entry per input entry
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(entries)
+        fresh: List[Tuple[int, Optional[int], Dict[str, Any]]] = []
+        for i, entry in enumerate(entries):
+            duplicate, key = self._check(_message_text(entry["messages"]),
+                                         entry.get("user_id"), entry.get("metadata"))
+            if duplicate is not None:
+                results[i] = self._suppressed(duplicate, entry.get("metadata"))
+            else:
+                fresh.append((i, key, entry))
+        if fresh and hasattr(self.client, "add_many"):
+            try:
+                written = _results(self.client.add_many([entry for _, _, entry in fresh]))
+            except Exception:
+                for _, key, _ in fresh:
+                    self._release(key)
+                raise
+            if len(written) != len(fresh):
+                # Results cannot be matched to entries; index none of them
+                written = [None] * len(fresh)
+            for (i, key, _), result in zip(fresh, written):
+                raw = {"results": [result] if result is not None else []}
+                added = self._confirm(key, raw)
+                results[i] = added if added is not None else raw
+        elif fresh:
+            for position, (i, key, entry) in enumerate(fresh):
+                entry = dict(entry)
+                try:
+                    raw = self.client.add(entry.pop("messages"), **entry)
+                except Exception:
+                    for _, pending_key, _ in fresh[position:]:
+                        self._release(pending_key)
+                    raise
+                added = self._confirm(key, raw)
+                results[i] = added if added is not None else {"results": _results(raw)}
+        return {"results": results}
+
+    def index_existing(self, user_id: Optional[str] = None, limit: int = 1000) -> int:
+        """Index memories already in the store.
+
+        Args:
+            user_id: User whose memories to index
+            limit: Maximum memories to index
+
+        Returns:
+            Number of memories indexed
+        """
+        indexed = 0
+        for memory in _results(self.client.get_all(user_id=user_id, limit=limit)):
+            text = memory.get("memory") or memory.get("text") or ""
+            signature = self.hasher.signature(text)
+            if signature is None:
+                continue
+            metadata = dict(memory.get("metadata") or {})
+            scope = (memory.get("user_id", user_id), metadata.get("type"))
+            with self._lock:
+                self._index(_Entry(memory.get("id"), scope, signature, metadata))
+            indexed += 1
+        return indexed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get deduplication statistics.
+
+        Returns:
+            Checked, added, suppressed and merged write counts, failed
+            merges, writes left unindexed because the backend did not store
+            exactly one memory, the suppression rate and the number of
+            indexed memories
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.stats)
+            stats['indexed'] = len(self._entries)
+        stats['suppression_rate'] = stats['suppressed'] / stats['checked'] if stats['checked'] else 0.0
+        return stats
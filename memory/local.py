@@ -0,0 +1,619 @@
+"""In-process vector memory backend.
+
+This module provides LocalMemory, a drop-in replacement for the Mem0 client
+surface used by the games (add, search, get, get_all, delete, plus a bulk
+add_many) that runs entirely in-process:
+
+1. Embeddings are kept in one contiguous float32 matrix. When a path is
+   given the matrix is a memory-mapped file, so a worker can open a large
+   store without reading it into Python objects.
+2. Search is a single vectorized cosine-similarity pass over the
+   contiguous matrix (or over the matching rows only, for selective
+   filters) followed by a partial sort for the top-k rows.
+3. Text and metadata live in a compact SQLite side table keyed by row,
+   with a secondary index on metadata["type"] so type listings are index
+   lookups and type filters can be combined with semantic search.
+
+Embeddings come from a caller-supplied embed_fn or, by default, from a
+deterministic feature-hashing embedder that needs no network access.
+"""
+
+import os
+import re
+import json
+import uuid
+import hashlib
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Searches matching at most this fraction of rows gather the matching rows;
+# broader searches score the contiguous matrix and mask out the rest, which
+# avoids copying most of a (possibly memory-mapped) matrix per query.
+_GATHER_FRACTION = 0.25
+
+def _require_numpy() -> None:
+    """Raise a helpful error if NumPy is not installed."""
+    if np is None:
+        raise ImportError(
+            "LocalMemory requires numpy; install it with `pip install socratic[local]`"
+        )
+
+class HashingEmbedder:
+    """Deterministic bag-of-words embedder using feature hashing.
+
+    Unigrams and bigrams are hashed into a fixed number of signed buckets
+    and the result is L2-normalized, so cosine similarity reduces to a dot
+    product.
+    """
+
+    def __init__(self, dim: int = 256):
+        """Initialize the embedder.
+
+        Args:
+            dim: Embedding dimension
+        """
+        _require_numpy()
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        """Extract hashed features from text.
+
+        Args:
+            text: Input text
+
+        Returns:
+            List of unigram and bigram features
+        """
+        tokens = _TOKEN_RE.findall(text.lower())
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def __call__(self, texts: Sequence[str]) -> "np.ndarray":
+        """Embed a batch of texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Array of shape (len(texts), dim) with unit-norm rows
+        """
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                vectors[row, value % self.dim] += 1.0 if (value >> 63) else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+class LocalMemory:
+    """In-process vector memory with a Mem0-compatible surface.
+
+    Without a path the store lives entirely in memory. With a path, the
+    directory holds:
+    - embeddings.f32: memory-mapped float32 matrix of shape (capacity, dim)
+    - memories.sqlite: side table with ids, user ids, text and metadata
+    """
+
+    EMBEDDINGS_FILE = "embeddings.f32"
+    METADATA_FILE = "memories.sqlite"
+
+    # Metadata field kept in a dedicated indexed column
+    TYPE_FIELD = "type"
+
+    # Writes are searchable as soon as add returns
+    index_delay = 0
+
+    # get_all accepts an offset for pagination
+    supports_offset = True
+
+    def __init__(self, path: Optional[str] = None, dim: int = 256,
+                 embed_fn: Optional[Callable[[Sequence[str]], Any]] = None,
+                 initial_capacity: int = 1024):
+        """Initialize the memory store.
+
+        Args:
+            path: Optional directory for persistent storage
+            dim: Embedding dimension (must match embed_fn output)
+            embed_fn: Optional function mapping texts to an (n, dim) array
+            initial_capacity: Rows allocated before the matrix first grows
+        """
+        _require_numpy()
+        self.path = path
+        self.dim = dim
+        self.embed_fn = embed_fn or HashingEmbedder(dim)
+        self._lock = threading.RLock()
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            db_path = os.path.join(path, self.METADATA_FILE)
+        else:
+            db_path = ":memory:"
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._init_schema()
+
+        # Row bookkeeping kept as compact arrays for vectorized masking
+        self._user_codes: Dict[str, int] = {}
+        self._type_codes: Dict[str, int] = {}
+        rows = self._conn.execute(
+            "SELECT row, user_id, type, deleted FROM memories ORDER BY row"
+        ).fetchall()
+        self._count = rows[-1][0] + 1 if rows else 0
+        capacity = max(initial_capacity, self._count)
+        self._users = np.full(capacity, -1, dtype=np.int32)
+        self._types = np.full(capacity, -1, dtype=np.int32)
+        self._alive = np.zeros(capacity, dtype=bool)
+        for row, user_id, memory_type, deleted in rows:
+            self._users[row] = self._code(self._user_codes, user_id)
+            self._types[row] = self._code(self._type_codes, memory_type)
+            self._alive[row] = not deleted
+        self._vectors = self._open_vectors(capacity)
+
+    def _init_schema(self) -> None:
+        """Create the side table and check the stored dimension."""
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS memories ("
+                " row INTEGER PRIMARY KEY,"
+                " id TEXT NOT NULL UNIQUE,"
+                " user_id TEXT,"
+                " text TEXT NOT NULL,"
+                " metadata TEXT,"
+                " type TEXT,"
+                " created_at TEXT NOT NULL,"
+                " deleted INTEGER NOT NULL DEFAULT 0)"
+            )
+            columns = {c[1] for c in self._conn.execute("PRAGMA table_info(memories)")}
+            if "type" not in columns:
+                # Stores created before the type index existed
+                self._conn.execute("ALTER TABLE memories ADD COLUMN type TEXT")
+                self._conn.execute(
+                    "UPDATE memories SET type = json_extract(metadata, '$.type')"
+                )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS memories_type"
+                " ON memories (user_id, type, deleted, row)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO settings (name, value) VALUES ('dim', ?)",
+                (str(self.dim),)
+            )
+        stored = int(self._conn.execute(
+            "SELECT value FROM settings WHERE name = 'dim'"
+        ).fetchone()[0])
+        if stored != self.dim:
+            raise ValueError(f"Store was created with dim={stored}, not {self.dim}")
+
+    def _open_vectors(self, capacity: int) -> "np.ndarray":
+        """Open (or allocate) the embedding matrix.
+
+        Args:
+            capacity: Number of rows to allocate
+
+        Returns:
+            Array or memory map of shape (capacity, dim)
+        """
+        if not self.path:
+            return np.zeros((capacity, self.dim), dtype=np.float32)
+        file_path = os.path.join(self.path, self.EMBEDDINGS_FILE)
+        size = capacity * self.dim * 4
+        with open(file_path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        return np.memmap(file_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _grow(self, needed: int) -> None:
+        """Grow capacity to hold at least `needed` rows.
+
+        Args:
+            needed: Required number of rows
+        """
+        capacity = len(self._alive)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self._users = np.concatenate(
+            [self._users, np.full(capacity - len(self._users), -1, dtype=np.int32)]
+        )
+        self._types = np.concatenate(
+            [self._types, np.full(capacity - len(self._types), -1, dtype=np.int32)]
+        )
+        self._alive = np.concatenate(
+            [self._alive, np.zeros(capacity - len(self._alive), dtype=bool)]
+        )
+        if self.path:
+            self._vectors.flush()
+            del self._vectors
+            self._vectors = self._open_vectors(capacity)
+        else:
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown[:self._count] = self._vectors[:self._count]
+            self._vectors = grown
+
+    @staticmethod
+    def _code(codes: Dict[str, int], value: Optional[Any]) -> int:
+        """Map a user id or type to a compact integer code.
+
+        Args:
+            codes: Code table to look up or extend
+            value: Value to encode (None maps to -1)
+
+        Returns:
+            Integer code for the value
+        """
+        if value is None:
+            return -1
+        key = str(value)
+        code = codes.get(key)
+        if code is None:
+            code = len(codes)
+            codes[key] = code
+        return code
+
+    def _embed(self, texts: Sequence[str]) -> "np.ndarray":
+        """Embed texts and normalize rows for cosine similarity.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Float32 array of shape (len(texts), dim)
+        """
+        vectors = np.asarray(self.embed_fn(list(texts)), dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"embed_fn must return shape (n, {self.dim})")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    @staticmethod
+    def _message_text(messages: Union[str, List[Dict[str, Any]]]) -> str:
+        """Extract text from a Mem0-style messages argument.
+
+        Args:
+            messages: A string or a list of {"role", "content"} dicts
+
+        Returns:
+            The text to store
+        """
+        if isinstance(messages, str):
+            return messages
+        return "\n".join(str(m.get("content", "")) for m in messages)
+
+    def _insert(self, texts: List[str], user_ids: List[Optional[str]],
+                metadatas: List[Optional[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Insert a batch of memories.
+
+        Args:
+            texts: Texts to store
+            user_ids: User id for each text
+            metadatas: Metadata for each text
+
+        Returns:
+            Mem0-style result entries for the new memories
+        """
+        vectors = self._embed(texts)
+        created_at = datetime.now(timezone.utc).isoformat()
+        results = []
+        with self._lock:
+            start = self._count
+            self._grow(start + len(texts))
+            rows = []
+            for offset, (text, user_id, metadata) in enumerate(zip(texts, user_ids, metadatas)):
+                row = start + offset
+                memory_id = str(uuid.uuid4())
+                memory_type = (metadata or {}).get(self.TYPE_FIELD)
+                rows.append((row, memory_id, user_id, text,
+                             json.dumps(metadata or {}, default=str),
+                             None if memory_type is None else str(memory_type),
+                             created_at))
+                results.append({"id": memory_id, "memory": text, "event": "ADD"})
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO memories (row, id, user_id, text, metadata, type, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+            self._vectors[start:start + len(texts)] = vectors
+            for offset, (user_id, entry) in enumerate(zip(user_ids, rows)):
+                self._users[start + offset] = self._code(self._user_codes, user_id)
+                self._types[start + offset] = self._code(self._type_codes, entry[5])
+            self._alive[start:start + len(texts)] = True
+            self._count = start + len(texts)
+        return results
+
+    def add(self, messages: Union[str, List[Dict[str, Any]]], user_id: Optional[str] = None,
+            metadata: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        """Store a new memory.
+
+        Args:
+            messages: Memory text or Mem0-style list of messages
+            user_id: Owner of the memory
+            metadata: Optional metadata stored with the memory
+            **kwargs: Accepted for Mem0 compatibility and ignored
+
+        Returns:
+            Dictionary with a "results" list describing the stored memory
+        """
+        text = self._message_text(messages)
+        return {"results": self._insert([text], [user_id], [metadata])}
+
+    def add_many(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store several memories with one embedding call and one transaction.
+
+        Args:
+            entries: Dictionaries with "messages" and optional "user_id"
+                and "metadata" keys, as accepted by add
+
+        Returns:
+            Dictionary with a "results" list describing the stored memories
+        """
+        if not entries:
+            return {"results": []}
+        return {"results": self._insert(
+            [self._message_text(e["messages"]) for e in entries],
+            [e.get("user_id") for e in entries],
+            [e.get("metadata") for e in entries]
+        )}
+
+    def _row_mask(self, user_id: Optional[str],
+                  filters: Optional[Dict[str, Any]] = None) -> "np.ndarray":
+        """Build a boolean mask of searchable rows.
+
+        The type filter and the user restriction use the in-memory code
+        arrays; other metadata filters are resolved in the side table.
+
+        Args:
+            user_id: Optional user to restrict rows to
+            filters: Optional exact-match metadata filters
+
+        Returns:
+            Boolean array over the used rows
+        """
+        mask = self._alive[:self._count].copy()
+        if user_id is not None:
+            code = self._user_codes.get(user_id)
+            if code is None:
+                return np.zeros(self._count, dtype=bool)
+            mask &= self._users[:self._count] == code
+        for key, value in (filters or {}).items():
+            if key == self.TYPE_FIELD:
+                code = self._type_codes.get(str(value))
+                if code is None:
+                    return np.zeros(self._count, dtype=bool)
+                mask &= self._types[:self._count] == code
+            else:
+                matching = np.zeros(self._count, dtype=bool)
+                rows = [r for (r,) in self._conn.execute(
+                    "SELECT row FROM memories WHERE json_extract(metadata, ?) = ?",
+                    (f"$.{key}", value)
+                )]
+                matching[rows] = True
+                mask &= matching
+        return mask
+
+    def _fetch(self, rows: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        """Load side-table records for rows.
+
+        Args:
+            rows: Row numbers to load
+
+        Returns:
+            Mapping from row number to memory record
+        """
+        if not len(rows):
+            return {}
+        placeholders = ",".join("?" * len(rows))
+        records = {}
+        for row, memory_id, user_id, text, metadata, created_at in self._conn.execute(
+            f"SELECT row, id, user_id, text, metadata, created_at FROM memories"
+            f" WHERE row IN ({placeholders})",
+            [int(r) for r in rows]
+        ):
+            records[row] = {
+                "id": memory_id,
+                "memory": text,
+                "user_id": user_id,
+                "metadata": json.loads(metadata) if metadata else {},
+                "created_at": created_at
+            }
+        return records
+
+    def search(self, query: str, user_id: Optional[str] = None, limit: int = 5,
+               filters: Optional[Dict[str, Any]] = None, **kwargs) -> List[Dict[str, Any]]:
+        """Search memories by cosine similarity.
+
+        Args:
+            query: Search query string
+            user_id: Optional user to restrict results to
+            limit: Maximum number of results to return
+            filters: Optional exact-match metadata filters, e.g. {"type": "insight"}
+            **kwargs: Accepted for Mem0 compatibility and ignored
+
+        Returns:
+            Matching memories ordered by descending score
+        """
+        query_vector = self._embed([query])[0]
+        with self._lock:
+            mask = self._row_mask(user_id, filters)
+            matches = int(mask.sum())
+            if not matches or limit <= 0:
+                return []
+            if matches <= _GATHER_FRACTION * self._count:
+                candidates = np.flatnonzero(mask)
+                scores = self._vectors[candidates] @ query_vector
+            else:
+                candidates = None
+                scores = self._vectors[:self._count] @ query_vector
+                scores[~mask] = -np.inf
+            k = min(limit, matches)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            rows = top if candidates is None else candidates[top]
+            records = self._fetch(rows)
+        results = []
+        for row, score in zip(rows, scores[top]):
+            record = records[int(row)]
+            record["score"] = float(score)
+            results.append(record)
+        return results
+
+    def get(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a memory by id.
+
+        Args:
+            memory_id: Memory identifier
+
+        Returns:
+            The memory record, or None if not found
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT row FROM memories WHERE id = ? AND deleted = 0", (memory_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            return self._fetch([row[0]])[row[0]]
+
+    def update(self, memory_id: str, text: Optional[str] = None,
+               metadata: Optional[Dict[str, Any]] = None, **kwargs) -> Optional[Dict[str, Any]]:
+        """Update the text and/or metadata of a memory.
+
+        Args:
+            memory_id: Memory identifier
+            text: New text (re-embedded), or None to keep the current text
+            metadata: New metadata (replaces the stored metadata), or None
+                to keep the current metadata
+            **kwargs: Accepted for Mem0 compatibility and ignored
+
+        Returns:
+            Dictionary with a "results" list describing the updated memory,
+            or None if not found
+        """
+        vector = self._embed([text])[0] if text is not None else None
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT row, text FROM memories WHERE id = ? AND deleted = 0", (memory_id,)
+            ).fetchone()
+            if found is None:
+                return None
+            row, current = found
+            with self._conn:
+                if text is not None:
+                    self._conn.execute("UPDATE memories SET text = ? WHERE row = ?", (text, row))
+                if metadata is not None:
+                    memory_type = metadata.get(self.TYPE_FIELD)
+                    memory_type = None if memory_type is None else str(memory_type)
+                    self._conn.execute(
+                        "UPDATE memories SET metadata = ?, type = ? WHERE row = ?",
+                        (json.dumps(metadata, default=str), memory_type, row)
+                    )
+                    self._types[row] = self._code(self._type_codes, memory_type)
+            if vector is not None:
+                self._vectors[row] = vector
+        return {"results": [{"id": memory_id, "memory": text if text is not None else current,
+                             "event": "UPDATE"}]}
+
+    def get_all(self, user_id: Optional[str] = None, limit: int = 100,
+                filters: Optional[Dict[str, Any]] = None, offset: int = 0,
+                **kwargs) -> List[Dict[str, Any]]:
+        """Retrieve stored memories in insertion order.
+
+        A type filter (alone or with a user) is answered from the
+        memories_type index without touching the embeddings.
+
+        Args:
+            user_id: Optional user to restrict results to
+            limit: Maximum number of results to return
+            filters: Optional exact-match metadata filters
+            offset: Number of matching memories to skip (for pagination)
+            **kwargs: Accepted for Mem0 compatibility and ignored
+
+        Returns:
+            List of memory records
+        """
+        filters = filters or {}
+        with self._lock:
+            if set(filters) <= {self.TYPE_FIELD}:
+                clauses, params = ["deleted = 0"], []
+                if user_id is not None:
+                    clauses.append("user_id = ?")
+                    params.append(user_id)
+                if self.TYPE_FIELD in filters:
+                    clauses.append("type = ?")
+                    params.append(str(filters[self.TYPE_FIELD]))
+                rows = [r for (r,) in self._conn.execute(
+                    f"SELECT row FROM memories WHERE {' AND '.join(clauses)}"
+                    f" ORDER BY row LIMIT ? OFFSET ?",
+                    params + [limit, offset]
+                )]
+            else:
+                rows = np.flatnonzero(self._row_mask(user_id, filters))[offset:offset + limit]
+            records = self._fetch(rows)
+        return [records[int(row)] for row in rows]
+
+    def count(self, user_id: Optional[str] = None,
+              filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count stored memories.
+
+        Args:
+            user_id: Optional user to restrict the count to
+            filters: Optional exact-match metadata filters
+
+        Returns:
+            Number of matching memories
+        """
+        with self._lock:
+            return int(self._row_mask(user_id, filters).sum())
+
+    def delete(self, memory_id: str) -> bool:
+        """Delete a memory.
+
+        Args:
+            memory_id: Memory identifier
+
+        Returns:
+            True if a memory was deleted
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT row FROM memories WHERE id = ? AND deleted = 0", (memory_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            with self._conn:
+                self._conn.execute("UPDATE memories SET deleted = 1 WHERE row = ?", row)
+            self._alive[row[0]] = False
+            return True
+
+    def flush(self) -> None:
+        """Flush the memory-mapped embeddings to disk."""
+        with self._lock:
+            if isinstance(self._vectors, np.memmap):
+                self._vectors.flush()
+
+    def close(self) -> None:
+        """Flush embeddings and close the side table."""
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._alive[:self._count].sum())
@@ -0,0 +1,62 @@
+"""Memory client wrapper that records or replays memory calls.
+
+TracedMemory routes search, add and get_all through the active trace
+session (see utils/trace.py). When recording, calls go to the wrapped
+client and are written to the trace. When replaying, recorded results are
+served and the wrapped client (which may be None) is never called.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from ..utils.trace import TraceSession, get_trace
+
+logger = logging.getLogger(__name__)
+
+class TracedMemory:
+    """Record or replay the calls made to a memory client."""
+
+    def __init__(self, client: Optional[Any] = None, trace: Optional[TraceSession] = None):
+        """Initialize the wrapper.
+
+        Args:
+            client: Memory client (may be None when replaying)
+            trace: Trace session (defaults to the active session)
+        """
+        self.client = client
+        self.trace = trace if trace is not None else get_trace()
+
+    def _call(self, operation: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        """Run a memory call through the trace session.
+
+        Args:
+            operation: Memory client method name
+            args: Positional arguments of the call
+            kwargs: Keyword arguments of the call
+
+        Returns:
+            Result of the call (or its recording)
+        """
+        def run():
+            if self.client is None:
+                raise RuntimeError(f"No memory client to run {operation} against")
+            return getattr(self.client, operation)(*args, **kwargs)
+        if self.trace is None:
+            return run()
+        return self.trace.call("memory", operation, {'args': list(args), 'kwargs': kwargs}, run)
+
+    def add(self, *args, **kwargs) -> Any:
+        return self._call("add", args, kwargs)
+
+    def search(self, *args, **kwargs) -> Any:
+        return self._call("search", args, kwargs)
+
+    def get_all(self, *args, **kwargs) -> Any:
+        return self._call("get_all", args, kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        # Bulk writes go through add() so that every write is traced
+        client = self.__dict__.get("client")
+        if client is None or name == "add_many":
+            raise AttributeError(name)
+        return getattr(client, name)
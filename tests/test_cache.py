@@ -0,0 +1,86 @@
+"""Test the caching utilities of the Socratic framework."""
+
+import os
+import sys
+import time
+from unittest.mock import patch
+import dspy
+
+# Add the package directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from socratic.core.agent import SocraticLM, SocraticPredictor
+from socratic.utils.cache import LRUCache, SQLiteCache, TieredCache, hash_key
+
+def test_lru_cache():
+    """Test LRU eviction, TTL expiry and statistics."""
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache, "Least recently used entry should be evicted"
+    assert cache.get("b") is None
+    assert cache.stats.as_dict()["evictions"] == 1
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+    expiring = LRUCache(max_size=2, ttl=0.01)
+    expiring.set("a", 1)
+    time.sleep(0.02)
+    assert expiring.get("a") is None
+    assert expiring.stats.expirations == 1
+
+def test_sqlite_cache(tmp_path):
+    """Test persistence, namespaces and size eviction of the disk tier."""
+    path = str(tmp_path / "cache.sqlite")
+    cache = SQLiteCache(path, max_entries=3)
+    cache.set("k", {"answer": "42"})
+    assert cache.get("k") == {"answer": "42"}
+
+    reopened = SQLiteCache(path)
+    assert reopened.get("k") == {"answer": "42"}, "Entries should persist"
+    other = SQLiteCache(path, namespace="other")
+    assert other.get("k") is None, "Namespaces should be isolated"
+
+    for i in range(10):
+        cache.set(f"key{i}", i)
+    cache.evict()
+    assert len(cache) == 3
+    assert cache.get("key9") == 9
+    assert cache.stats.evictions > 0
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    """Test that disk hits are promoted to the memory tier."""
+    disk = SQLiteCache(str(tmp_path / "cache.sqlite"))
+    disk.set("k", [1, 2])
+    cache = TieredCache(memory=LRUCache(max_size=4), disk=disk)
+    assert cache.get("k") == [1, 2]
+    assert "k" in cache.memory
+    assert cache.get("missing") is None
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["disk"]["hits"] == 1
+
+def test_predictor_response_cache():
+    """Test that identical deterministic calls are served from cache."""
+    dspy.settings.configure(lm=SocraticLM())
+    cache = TieredCache()
+    predictor = SocraticPredictor(
+        signature="question: str -> answer: str",
+        instructions="Answer briefly.",
+        cache=cache
+    )
+    with patch.object(dspy.Predict, "forward", return_value=dspy.Prediction(answer="4")) as forward:
+        first = predictor.forward(question="2 + 2?")
+        second = predictor.forward(question="2 + 2?")
+        predictor.forward(question="3 + 3?")
+    assert first.answer == second.answer == "4"
+    assert forward.call_count == 2, "Repeated input should not reach the model"
+    assert predictor.get_cache_stats()["hits"] == 1
+
+    # Sampled calls are not cached unless explicitly requested
+    with patch.object(dspy.Predict, "forward", return_value=dspy.Prediction(answer="x")) as forward:
+        predictor.forward(question="2 + 2?", config={"temperature": 0.7})
+        predictor.forward(question="2 + 2?", config={"temperature": 0.7})
+    assert forward.call_count == 2
+    assert hash_key("a", 1) == hash_key("a", 1) != hash_key("a", 2)
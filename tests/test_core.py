@@ -12,8 +12,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 # Load environment variables
 load_dotenv()
 
-from socratic.core.agent import SocraticLM
+from socratic.core.agent import SocraticLM, SocraticPredictor, get_lm
 from socratic.core.judge import ReasoningJudge
+from socratic.core.context import ContextBuilder
 
 # Set up logging
 logging.basicConfig(
@@ -37,6 +38,31 @@ def test_socratic_lm():
     assert lm.max_tokens == 1000, "Default max_tokens should be 1000"
     print("Basic LM configuration tests passed")
 
+def test_shared_lm_registry():
+    """Test that components borrow shared LM clients."""
+    print("\n=== Testing LM Registry ===\n")
+    
+    lm = get_lm()
+    assert get_lm() is lm, "Same configuration should return the same client"
+    assert get_lm(temperature=0.7) is not lm
+    assert get_lm(temperature=0.7).temperature == 0.7
+    
+    judge1, judge2 = ReasoningJudge(), ReasoningJudge()
+    assert judge1.lm is judge2.lm is lm
+    assert judge1.rating_judge.lm is lm
+    
+    dspy.settings.configure(lm=None)
+    predictor = SocraticPredictor(signature="question -> answer")
+    assert predictor.resolve_lm() is lm, "Predictors should fall back to the shared client"
+    
+    # The LM is resolved per call, so later configuration is honoured
+    other = get_lm(temperature=0.5)
+    with dspy.context(lm=other):
+        assert predictor.resolve_lm() is other
+    predictor.lm = other
+    assert predictor.resolve_lm() is other
+    print("LM registry tests passed")
+
 def test_reasoning_judge():
     """Test the ReasoningJudge functionality."""
     print("\n=== Testing Enhanced Reasoning Judge ===\n")
@@ -107,10 +133,148 @@ def test_reasoning_judge():
         print(f"Expected error occurred: {str(e)}")
         assert True, "Error was properly handled"
 
+def test_context_builder():
+    """Test ranking, deduplication and token budgeting of memory context."""
+    print("\n=== Testing ContextBuilder ===\n")
+    
+    builder = ContextBuilder(max_tokens=20, model="gpt-4", dedup_threshold=0.8)
+    builder.count_tokens = lambda text: len(text.split())
+    memories = [
+        {"memory": "Michelle Obama was born in 1964", "score": 0.4},
+        {"memory": "Barack Obama was born on August 4, 1961", "score": 0.9},
+        {"memory": "Barack Obama was born on August 4, 1961.", "score": 0.8},
+        {"text": "Obama served two terms as president of the United States "
+                 "from 2009 until 2017 after winning two elections", "score": 0.6},
+        {"memory": "", "score": 1.0},
+    ]
+    built = builder.build(memories)
+    
+    assert built.text.split("\n") == [
+        "Barack Obama was born on August 4, 1961",
+        "Michelle Obama was born in 1964"
+    ]
+    assert built.duplicates == 1, "Near-identical memory should be removed"
+    assert built.dropped == 1, "Memory exceeding the budget should be dropped"
+    assert built.tokens_used <= 20 and built.tokens_dropped > 0
+    assert built.as_dict()["included"] == 2
+    print("ContextBuilder tests passed")
+
+def test_predictor_stream():
+    """Test that predictor streams end with the final prediction."""
+    from dspy.utils import DummyLM
+    predictor = SocraticPredictor(signature="question -> answer")
+    predictor.lm = DummyLM([{"answer": "Paris"}])
+    with dspy.context(lm=predictor.lm):
+        items = list(predictor.stream("answer", question="Capital of France?"))
+    assert "".join(item for item in items if isinstance(item, str)) == "Paris"
+    assert isinstance(items[-1], dspy.Prediction) and items[-1].answer == "Paris"
+
+def test_rate_many():
+    """Test listwise batch rating with per-item fallback."""
+    from dspy.utils import DummyLM
+    judge = ReasoningJudge()
+    judge.batch_rating_judge.lm = DummyLM([
+        {"ratings": "[0.9, 0.4]"},
+        {"ratings": "[0.7]"},  # wrong length: falls back to single ratings
+    ])
+    judge.rating_judge.lm = DummyLM([{"rating": "0.6"}, {"rating": "0.3"}])
+    outputs = ["Good answer", "Weak answer", "", "Third answer", "Fourth answer"]
+    scores = [p.score for p in judge.rate_many(outputs, chunk_size=2)]
+    assert scores == [0.9, 0.4, 0.0, 0.6, 0.3]
+    assert judge.rate_many([]) == []
+
+def test_rank():
+    """Test merge-sort ranking uses few memoized comparisons."""
+    judge = ReasoningJudge()
+    quality = {f"answer {i}": i for i in range(8)}
+    calls = []
+    
+    def fake_preference(output1, output2):
+        calls.append((output1, output2))
+        return dspy.Prediction(output_1_better=quality[output1] > quality[output2])
+    judge.preference_judge = fake_preference
+    
+    candidates = ["answer 3", "answer 7", "answer 0", "answer 5",
+                  "answer 1", "answer 6", "answer 2", "answer 4"]
+    result = judge.rank(candidates, max_workers=4)
+    assert result.ranking == [f"answer {i}" for i in range(7, -1, -1)]
+    assert [candidates[i] for i in result.order] == result.ranking
+    assert result.lm_calls == len(calls) <= 8 * 3, "Should need about N log N comparisons"
+    assert judge.rank(["only"]).ranking == ["only"] and judge.rank([]).lm_calls == 0
+
+def test_verdict_cache(tmp_path):
+    """Test that verdicts persist across judges and reset on new instructions."""
+    from socratic.utils.cache import SQLiteCache, TieredCache
+    path = str(tmp_path / "verdicts.sqlite")
+    
+    def make_judge():
+        cache = TieredCache(disk=SQLiteCache(path, namespace="judge_verdict"))
+        judge = ReasoningJudge(verdict_cache=cache)
+        judge.rating_judge = lambda output: calls.append(output) or dspy.Prediction(rating=0.8)
+        judge.preference_judge = lambda output1, output2: dspy.Prediction(output_1_better=True)
+        return judge
+    
+    calls = []
+    first = make_judge()
+    assert first.forward("An answer").score == 0.8
+    assert first.forward("An answer", "Another").output_1_better is True
+    
+    second = make_judge()
+    assert second.forward("An answer").score == 0.8
+    assert [p.score for p in second.rate_many(["An answer", "New answer"])] == [0.8, 0.8]
+    assert calls == ["An answer", "New answer"], "Cached outputs should not be re-rated"
+    ranked = second.rank(["Another", "An answer"])
+    assert ranked.ranking == ["An answer", "Another"]
+    assert ranked.cache_hits == 1 and ranked.lm_calls == 0
+    
+    # New instructions make stored verdicts unreachable
+    second.rating_judge = SocraticPredictor(signature="output -> rating: float",
+                                            instructions="Rate strictly.")
+    assert second._cached_verdict("preference", "An answer", "Another") is None
+    
+    # Verdicts under the original instructions are kept, not cleared
+    assert make_judge()._cached_verdict("preference", "An answer", "Another") is True
+
+def test_cascading_judge():
+    """Test that clear-cut outputs are settled without the model."""
+    from socratic.core.cascade import HeuristicScorer
+    scorer = HeuristicScorer(references=[
+        ("Barack Obama was born on August 4, 1961 in Honolulu, Hawaii.", 1.0),
+        ("Obama was born sometime in the sixties, probably in Chicago.", 0.5),
+    ])
+    judge = ReasoningJudge(cascade=scorer)
+    rated = []
+    judge.rating_judge = lambda output: rated.append(output) or dspy.Prediction(rating=0.7)
+    judge.batch_rating_judge = lambda outputs: dspy.Prediction(ratings=[0.7] * len(outputs))
+    
+    prompt = "When and where was Barack Obama born?"
+    outputs = [
+        "",                                                              # empty
+        "1961",                                                          # short but valid
+        "I'm sorry, but I cannot answer questions about people.",        # refusal
+        "When and where was Barack Obama born?",                         # echo
+        "Barack Obama was born on August 4, 1961 in Honolulu, Hawaii.",  # reference
+        "Obama was born sometime in the sixties, probably in Chicago.",  # uncertain reference
+        "He was born in Honolulu in 1961 to a Kenyan father.",           # no rule applies
+    ]
+    scores = [p.score for p in judge.rate_many(outputs, prompt=prompt)]
+    assert scores == [0.0, 0.7, 0.0, 0.0, 1.0, 0.7, 0.7], "Short answers go to the model"
+    
+    # A repeated output is settled as a duplicate of its earlier rating
+    assert judge.forward(outputs[-1], prompt=prompt).score == 0.7
+    assert rated == []
+    stats = judge.get_stage_stats()
+    assert stats['total'] == 8 and stats['lm'] == 3 and stats['heuristic'] == 5
+    assert stats['reasons']['duplicate'] == 1 and stats['reasons']['echo'] == 1
+    assert stats['lm_rate'] == 0.375
+    assert HeuristicScorer(min_words=3).score("1961").reason == "too_short"
+
 if __name__ == "__main__":
     # Run all tests
     print("\nRunning Socratic Framework Tests")
     print("================================")
     
     test_socratic_lm()
+    test_shared_lm_registry()
     test_reasoning_judge()
+    test_context_builder()
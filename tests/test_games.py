@@ -2,14 +2,19 @@
 
 import os
 import sys
+import asyncio
+from unittest.mock import AsyncMock
 from dotenv import load_dotenv
+import dspy
 from mem0 import Memory
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from socratic.games.reasoning import ReasoningGame
+from socratic.games.creativity import CreativityGame
 from socratic.utils.config import MEM0_CONFIG
+from socratic.utils.monitoring import PerformanceMonitor
 
 # Load environment variables
 load_dotenv()
@@ -102,6 +107,318 @@ def test_memory_operations():
     assert len(insights) > 0
     print("Memory type filtering test passed\n")
 
+def test_async_reasoning(mock_memory_client):
+    """Test the async reasoning path with background memory writes."""
+    print("=== Testing Async Reasoning ===\n")
+    
+    game = ReasoningGame(memory_client=mock_memory_client)
+    game.reason.aforward = AsyncMock(return_value=dspy.Prediction(answer="42"))
+    
+    async def run():
+        results = await asyncio.gather(*[
+            game.areason_with_memory(f"Question {i}?", store_output=True)
+            for i in range(5)
+        ])
+        await game.wait_for_writes()
+        return results
+    
+    results = asyncio.run(run())
+    assert [r.answer for r in results] == ["42"] * 5
+    assert len(game.conversation_history) == 5
+    assert mock_memory_client.add.call_count == 5
+    assert mock_memory_client.add.call_args.kwargs["metadata"]["type"] == "reasoning_output"
+    
+    found = asyncio.run(game.asearch_memories("Obama"))
+    assert found[0]["id"] == "test_id"
+    print("Async reasoning test passed\n")
+
+def test_forward_batch(mock_memory_client):
+    """Test batch reasoning keeps input order and isolates failures."""
+    print("=== Testing Batch Reasoning ===\n")
+    
+    game = ReasoningGame(memory_client=mock_memory_client)
+    
+    def fake_forward(question, context):
+        if question == "bad":
+            raise RuntimeError("Prediction failed: boom")
+        return dspy.Prediction(answer=question.upper())
+    game.reason.forward = fake_forward
+    
+    results = game.forward_batch(["a", "bad", "c"], max_workers=3)
+    assert results[0].answer == "A"
+    assert results[1] == {'error': "Prediction failed: boom"}
+    assert results[2].answer == "C"
+    assert [turn['question'] for turn in game.conversation_history] == ["a", "c"]
+    assert game.last_context is None and game.memory_context == ""
+    assert game.forward_batch([]) == []
+    print("Batch reasoning test passed\n")
+
+def test_search_cache(mock_memory_client):
+    """Test memory search caching and invalidation on writes."""
+    print("=== Testing Memory Search Cache ===\n")
+    
+    monitor = PerformanceMonitor()
+    game = ReasoningGame(memory_client=mock_memory_client, monitor=monitor)
+    
+    game.search_memories("Obama")
+    game.search_memories("Obama")
+    game.get_relevant_memories("Obama")
+    assert mock_memory_client.search.call_count == 1
+    game.search_memories("Obama", limit=3)
+    assert mock_memory_client.search.call_count == 2
+    
+    game.store_insight("Barack Obama was born on August 4, 1961")
+    game.search_memories("Obama")
+    assert mock_memory_client.search.call_count == 3
+    
+    counters = monitor.get_counters()
+    assert counters["memory_search_cache.hits"] == 2
+    assert counters["memory_search_cache.misses"] == 3
+    assert counters["memory_search_cache.invalidations"] == 1
+    
+    uncached = ReasoningGame(memory_client=mock_memory_client, search_cache_size=0)
+    uncached.search_memories("Obama")
+    uncached.search_memories("Obama")
+    assert mock_memory_client.search.call_count == 5
+    print("Memory search cache test passed\n")
+
+def test_question_keyed_retrieval(mock_memory_client):
+    """Test retrieval keyed on the question with reuse for follow-ups."""
+    print("=== Testing Question-Keyed Retrieval ===\n")
+    
+    game = ReasoningGame(memory_client=mock_memory_client, search_cache_size=0)
+    game.reason.forward = lambda question, context: dspy.Prediction(answer="ok")
+    
+    game.reason_with_memory("When was Barack Obama born?")
+    assert mock_memory_client.search.call_args.kwargs["query"] == "When was Barack Obama born?"
+    assert game.memory_context == "Test memory content"
+    
+    game.reason_with_memory("Where was Barack Obama born?")
+    assert mock_memory_client.search.call_count == 1, "Overlapping follow-up should reuse hits"
+    
+    game.reason_with_memory("What is the capital of France?")
+    assert mock_memory_client.search.call_count == 2
+    assert mock_memory_client.search.call_args.kwargs["query"] == "What is the capital of France?"
+    
+    game.store_insight("Paris is the capital of France")
+    game.reason_with_memory("What is the capital of France?")
+    assert mock_memory_client.search.call_count == 3, "Writes should invalidate reuse"
+    print("Question-keyed retrieval test passed\n")
+
+def test_streaming(mock_memory_client):
+    """Test that streams yield partial text and record the full result."""
+    print("=== Testing Streaming ===\n")
+    
+    def fake_stream(field, **kwargs):
+        yield "Barack Obama "
+        yield "was born in 1961."
+        yield dspy.Prediction(**{field: "Barack Obama was born in 1961."})
+    
+    async def fake_astream(field, **kwargs):
+        for item in fake_stream(field, **kwargs):
+            yield item
+    
+    game = ReasoningGame(memory_client=mock_memory_client)
+    game.reason.stream = fake_stream
+    game.reason.astream = fake_astream
+    
+    chunks = list(game.stream("When was Obama born?", store_output=True))
+    assert chunks == ["Barack Obama ", "was born in 1961."]
+    assert game.conversation_history[-1]['answer'] == "Barack Obama was born in 1961."
+    assert mock_memory_client.add.call_count == 1
+    
+    async def run():
+        chunks = [chunk async for chunk in game.astream("And Michelle?", store_output=True)]
+        await game.wait_for_writes()
+        return chunks
+    assert "".join(asyncio.run(run())) == "Barack Obama was born in 1961."
+    assert len(game.conversation_history) == 2
+    assert mock_memory_client.add.call_count == 2
+    
+    creativity = CreativityGame(memory_client=mock_memory_client)
+    creativity.create.stream = fake_stream
+    creativity.create.astream = fake_astream
+    assert "".join(creativity.stream("A haiku", store_output=True)) == "Barack Obama was born in 1961."
+    asyncio.run(run_async_creativity(creativity))
+    history = creativity.get_conversation_history()
+    assert [turn['question'] for turn in history] == ["A haiku", "A limerick"]
+    assert mock_memory_client.add.call_args.kwargs["metadata"]["type"] == "creative_output"
+    print("Streaming test passed\n")
+
+async def run_async_creativity(game):
+    """Consume an async creativity stream."""
+    return [chunk async for chunk in game.astream("A limerick")]
+
+def test_record_replay(mock_memory_client, tmp_path, monkeypatch):
+    """Test that recorded LM and memory calls replay offline."""
+    print("=== Testing Record/Replay ===\n")
+    from dspy.utils import DummyLM
+    from socratic.utils.trace import TraceRecorder, TraceReplayer, TraceMissError
+    
+    path = str(tmp_path / "session.trace.jsonl.gz")
+    with TraceRecorder(path) as recorder:
+        game = ReasoningGame(memory_client=mock_memory_client, search_cache_size=0)
+        game.reason.lm = DummyLM([{"answer": "August 4, 1961"}, {"answer": "47 years old"}])
+        first = game.forward("When was Obama born?")
+        second = asyncio.run(game.aforward("How old was he in 2009?"))
+        game.store_insight("Obama was born in 1961")
+    assert recorder.records >= 5
+    recorded_calls = mock_memory_client.search.call_count + mock_memory_client.add.call_count
+    
+    monkeypatch.delenv("OPENAI_API_KEY")
+    with TraceReplayer(path, speed=None) as replayer:
+        game = ReasoningGame(search_cache_size=0)
+        assert game.forward("When was Obama born?")['answer'] == first['answer']
+        replayed = asyncio.run(game.aforward("How old was he in 2009?"))
+        assert replayed['answer'] == second['answer'] == "47 years old"
+        assert game.store_insight("Obama was born in 1961") == {"status": "success"}
+        try:
+            game.memory.search("never recorded")
+            assert False, "Unrecorded calls should miss"
+        except TraceMissError:
+            pass
+    assert replayer.misses == 1 and replayer.hits >= 5
+    assert mock_memory_client.search.call_count + mock_memory_client.add.call_count == recorded_calls
+    print("Record/replay test passed\n")
+
+def test_concurrent_async_turns(mock_memory_client):
+    """Test that concurrent async turns keep their own memory context."""
+    print("=== Testing Concurrent Async Turns ===\n")
+    game = ReasoningGame(memory_client=mock_memory_client, search_cache_size=0)
+    searched = []
+    
+    async def search(query, limit=5):
+        searched.append(query)
+        # Both searches are in flight before either context is built
+        while len(searched) < 2:
+            await asyncio.sleep(0)
+        return [{"memory": f"Memory for {query}", "score": 1.0}]
+    
+    async def answer(question, context):
+        return dspy.Prediction(answer=context)
+    
+    game.asearch_memories = search
+    game.reason.aforward = answer
+    
+    async def run():
+        return await asyncio.gather(game.aforward("Obama?"), game.aforward("Paris?"))
+    
+    obama, paris = asyncio.run(run())
+    assert obama.answer == "Memory for Obama?" and paris.answer == "Memory for Paris?"
+    assert game.memory_context == "" and game.last_context is None
+    assert {turn['context'] for turn in game.conversation_history} == {
+        "Memory for Obama?", "Memory for Paris?"
+    }
+    print("Concurrent async turns test passed\n")
+
+def test_pipelined_session(mock_memory_client):
+    """Test the call graph of a pipelined session turn."""
+    print("=== Testing Pipelined Session ===\n")
+    from socratic.games.session import SocraticSession
+    
+    events = []
+    questions_started = asyncio.Event()
+    followups_started = asyncio.Event()
+    
+    async def gated(event, name):
+        # Only completes if the stage that sets the event runs concurrently
+        try:
+            await asyncio.wait_for(event.wait(), timeout=1.0)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"{name} did not overlap")
+    
+    async def answer(question, context):
+        events.append(f"answer start: {question}")
+        if question in followup_questions:
+            if sum(e.startswith("answer start: ") for e in events) - 1 == len(followup_questions):
+                followups_started.set()
+            await gated(followups_started, "follow-ups")
+        elif pipelined:
+            await gated(questions_started, "questions")
+        events.append(f"answer end: {question}")
+        return dspy.Prediction(answer=f"Answer to {question}")
+    
+    async def generate(context):
+        events.append("questions start")
+        questions_started.set()
+        return followup_questions + ["Says who?"]
+    
+    followup_questions = ["Why?", "How?", "What if not?"]
+    game = ReasoningGame(memory_client=mock_memory_client)
+    game.reason.aforward = answer
+    game.dialogue.generate.aforward = generate
+    
+    # Default: questions follow the answer, follow-ups fan out
+    pipelined = False
+    session = SocraticSession(game, max_concurrency=4, max_followups=3)
+    assert session.questions_from == "answer"
+    result = session.run_turn("When was Obama born?", store_output=True)
+    assert result.answer == "Answer to When was Obama born?"
+    assert [f['question'] for f in result.followups] == followup_questions
+    assert all(f['answer'].startswith("Answer to") for f in result.followups)
+    assert events.index("questions start") > events.index("answer end: When was Obama born?")
+    assert game.conversation_history[-1]['question'] == "When was Obama born?"
+    assert mock_memory_client.add.call_count == 1
+    assert set(result.timings) >= {"retrieve", "answer", "questions", "followups", "turn", "serial"}
+    
+    # Opt-in: questions are generated while the answer is in flight
+    events.clear()
+    questions_started.clear()
+    followups_started.clear()
+    pipelined = True
+    overlapped = SocraticSession(game, max_followups=0, questions_from="question").run_turn("And Michelle?")
+    assert overlapped.answer == "Answer to And Michelle?"
+    assert events.index("questions start") < events.index("answer end: And Michelle?")
+    assert overlapped.followups == [] and 'followups' not in overlapped.timings
+    print("Pipelined session test passed\n")
+
+def test_best_of(mock_memory_client):
+    """Test concurrent best-of-N sampling with early stopping."""
+    print("=== Testing Best-of-N ===\n")
+    quality = [0.9, 0.4, 0.8, 1.0]
+    blocked, started, cancelled, rollouts = set(), [], [], set()
+    
+    async def sample(prompt, config):
+        rollouts.add(config["rollout_id"])
+        i = config["rollout_id"] & 0xFFFF
+        assert config["temperature"] > 0
+        started.append(i)
+        if i in blocked:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(i)
+                raise
+        return dspy.Prediction(creative_output=f"candidate {i}")
+    
+    class Judge:
+        def forward(self, output, prompt=None):
+            return dspy.Prediction(score=quality[int(output.split()[-1])])
+    
+    game = CreativityGame(memory_client=mock_memory_client)
+    game.create.aforward = sample
+    
+    best = game.forward_best_of("A haiku", n=4, judge=Judge(), store_output=True)
+    assert best.creative_output == "candidate 3" and best.score == 1.0
+    assert best.stopped == "exhausted" and best.scores == quality
+    assert sorted(started) == [0, 1, 2, 3] and cancelled == []
+    assert game.get_conversation_history()[-1]['answer'] == "candidate 3"
+    assert mock_memory_client.add.call_count == 1
+    
+    # Candidates 0 and 3 never finish on their own
+    blocked.update({0, 3})
+    early = game.forward_best_of("A haiku", n=4, judge=Judge(), target_score=0.75)
+    assert early.stopped == "target" and early.creative_output == "candidate 2"
+    assert early.scores[2] == 0.8 and early.scores[0] is None and early.scores[3] is None
+    assert sorted(cancelled) == [0, 3]
+    
+    cancelled.clear()
+    budget = game.forward_best_of("A haiku", n=4, judge=Judge(), time_budget=1.0)
+    assert budget.stopped == "time_budget" and budget.creative_output == "candidate 2"
+    assert budget.scores == [None, 0.4, 0.8, None] and sorted(cancelled) == [0, 3]
+    assert len(rollouts) == 12, "Every sample should bypass the LM cache"
+    print("Best-of-N test passed\n")
+
 if __name__ == "__main__":
     try:
         # Run tests
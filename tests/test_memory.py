@@ -0,0 +1,257 @@
+"""Test the local memory backend of the Socratic framework."""
+
+import os
+import sys
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Add the package directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from socratic.memory.local import LocalMemory
+
+def test_local_memory_search():
+    """Test add and top-k cosine search with user isolation."""
+    memory = LocalMemory(initial_capacity=2)
+    memory.add("Barack Obama was born on August 4, 1961", user_id="u1",
+               metadata={"type": "insight"})
+    memory.add("Michelle Obama was born on January 17, 1964", user_id="u1")
+    memory.add("The Eiffel Tower is in Paris", user_id="u1")
+    memory.add("Barack Obama private note", user_id="u2")
+
+    results = memory.search("When was Barack Obama born?", user_id="u1", limit=2)
+    assert len(results) == 2
+    assert results[0]["memory"].startswith("Barack Obama was born")
+    assert results[0]["metadata"] == {"type": "insight"}
+    assert results[0]["score"] >= results[1]["score"]
+    assert all(r["user_id"] == "u1" for r in results)
+    assert memory.search("Obama", user_id="nobody") == []
+
+    assert memory.delete(results[0]["id"])
+    assert memory.get(results[0]["id"]) is None
+    assert len(memory) == 3
+    assert len(memory.get_all(user_id="u1")) == 2
+
+def test_local_memory_search_paths_agree():
+    """Test that broad (masked) and selective (gathered) searches rank alike."""
+    memory = LocalMemory()
+    for i in range(40):
+        memory.add(f"Obama fact number {i} about {'Hawaii' if i % 2 else 'Chicago'}",
+                   user_id="u1" if i < 36 else "u2", metadata={"type": "insight" if i < 4 else "note"})
+    query = "Obama fact about Hawaii"
+    broad = memory.search(query, user_id="u1", limit=40)
+    selective = memory.search(query, user_id="u2", limit=40)
+    assert len(broad) == 36 and len(selective) == 4
+    assert all(r["user_id"] == "u1" for r in broad)
+    typed = memory.search(query, filters={"type": "insight"}, limit=10)
+    assert {r["memory"] for r in typed} == {r["memory"] for r in broad if r["metadata"]["type"] == "insight"}
+    everything = memory.search(query, limit=40)
+    ranked = [r for r in everything if r["user_id"] == "u1"]
+    assert {r["id"]: r["score"] for r in ranked} == {r["id"]: r["score"] for r in broad}
+    assert [r["score"] for r in broad] == sorted((r["score"] for r in broad), reverse=True)
+    assert [r["score"] for r in typed] == sorted((r["score"] for r in typed), reverse=True)
+
+def test_local_memory_persistence(tmp_path):
+    """Test that a store reopens from its memory-mapped files."""
+    path = str(tmp_path / "store")
+    memory = LocalMemory(path=path, initial_capacity=1)
+    for i in range(5):
+        memory.add(f"fact number {i}", user_id="u1", metadata={"i": i})
+    memory.close()
+
+    reopened = LocalMemory(path=path)
+    assert isinstance(reopened._vectors, np.memmap)
+    assert len(reopened) == 5
+    top = reopened.search("fact number 3", user_id="u1", limit=1)[0]
+    assert top["metadata"] == {"i": 3}
+
+    with pytest.raises(ValueError):
+        LocalMemory(path=path, dim=64)
+
+def test_local_memory_type_index():
+    """Test exact type filtering, pagination and filtered search."""
+    memory = LocalMemory()
+    for i in range(6):
+        memory_type = "insight" if i % 2 == 0 else "reasoning_output"
+        memory.add(f"Obama fact {i}", user_id="u1", metadata={"type": memory_type, "i": i})
+
+    insights = memory.get_all(user_id="u1", filters={"type": "insight"}, limit=2)
+    assert [m["metadata"]["i"] for m in insights] == [0, 2]
+    page = memory.get_all(user_id="u1", filters={"type": "insight"}, limit=2, offset=2)
+    assert [m["metadata"]["i"] for m in page] == [4]
+    assert memory.count(user_id="u1", filters={"type": "reasoning_output"}) == 3
+    assert memory.get_all(user_id="u1", filters={"type": "missing"}) == []
+
+    found = memory.search("Obama fact 3", user_id="u1", limit=5,
+                          filters={"type": "reasoning_output"})
+    assert found[0]["metadata"]["i"] == 3
+    assert all(m["metadata"]["type"] == "reasoning_output" for m in found)
+    assert [m["metadata"]["i"] for m in memory.get_all(filters={"i": 5})] == [5]
+
+def test_reasoning_game_type_lookup():
+    """Test that get_memory_by_type uses the metadata index."""
+    from socratic.games.reasoning import ReasoningGame
+
+    memory = LocalMemory()
+    game = ReasoningGame(memory_client=memory)
+    game.store_insight("Barack Obama was born on August 4, 1961")
+    game.store_reasoning_output("Barack Obama is 62 years old in 2024")
+    game.store_insight("Michelle Obama was born on January 17, 1964")
+
+    insights = game.get_memory_by_type("insight")
+    assert [m["memory"] for m in insights] == [
+        "Barack Obama was born on August 4, 1961",
+        "Michelle Obama was born on January 17, 1964"
+    ]
+    assert len(game.get_memory_by_type("insight", limit=1, offset=1)) == 1
+    ranked = game.get_memory_by_type("insight", query="Michelle Obama birthday")
+    assert ranked[0]["memory"].startswith("Michelle")
+
+    # Wrapped clients still get the offset instead of an over-fetch
+    calls = []
+    get_all = memory.get_all
+    memory.get_all = lambda **kwargs: calls.append(kwargs) or get_all(**kwargs)
+    wrapped = ReasoningGame(memory_client=memory, dedup=True, write_behind=True, search_cache_size=0)
+    page = wrapped.get_memory_by_type("insight", limit=1, offset=1)
+    assert [m["memory"] for m in page] == ["Michelle Obama was born on January 17, 1964"]
+    assert calls[-1]["offset"] == 1 and calls[-1]["limit"] == 1
+    wrapped.close()
+
+def test_write_behind_batches_adds():
+    """Test bulk flushing, read-your-writes and flush on close."""
+    from socratic.memory.buffer import WriteBehindMemory
+
+    local = LocalMemory()
+    buffer = WriteBehindMemory(local, max_batch=1000, max_delay=60, index_delay=0)
+    for i in range(3):
+        assert buffer.add(f"insight {i}", user_id="u1")["status"] == "queued"
+    assert len(local) == 0 and buffer.pending == 3
+
+    results = buffer.search("insight 2", user_id="u1", limit=1)
+    assert results[0]["memory"] == "insight 2", "Reads should see queued writes"
+    assert buffer.stats["flushes"] == 1 and buffer.stats["written"] == 3
+
+    buffer.add("insight 3", user_id="u1")
+    buffer.close()
+    assert len(local) == 4
+    with pytest.raises(RuntimeError):
+        buffer.add("too late", user_id="u1")
+
+def test_write_behind_waits_for_index_only_after_writes():
+    """Test that the index delay applies only to users with recent writes."""
+    import time
+    from unittest.mock import Mock
+    from socratic.memory.buffer import WriteBehindMemory
+
+    client = Mock(spec=["add", "search"])
+    client.search.return_value = []
+    with WriteBehindMemory(client, max_batch=2, max_delay=60, index_delay=0.2) as buffer:
+        start = time.monotonic()
+        buffer.search("q", user_id="reader")
+        assert time.monotonic() - start < 0.1
+
+        buffer.add("a", user_id="writer")
+        start = time.monotonic()
+        buffer.search("q", user_id="writer")
+        assert time.monotonic() - start >= 0.15
+        assert client.add.call_count == 1
+
+def test_write_behind_requeues_only_unwritten_adds():
+    """Test that a failure mid-batch keeps earlier writes and drops bad entries."""
+    from socratic.memory.buffer import WriteBehindMemory
+    from unittest.mock import Mock
+    from socratic.utils.config import MEM0_CONFIG
+    from socratic.utils.ratelimit import RetryScheduler
+
+    stored, failures = [], {"m2": [ConnectionError("reset")], "bad": [ValueError("invalid")] * 3}
+
+    def add(messages, **kwargs):
+        if failures.get(messages):
+            raise failures[messages].pop(0)
+        stored.append(messages)
+
+    client = Mock(spec=["add", "search"])
+    client.add.side_effect = add
+    client.search.return_value = []
+    buffer = WriteBehindMemory(client, max_batch=1000, max_delay=60,
+                               scheduler=RetryScheduler("test", max_retries=0))
+    for text in ["m0", "m1", "m2", "bad", "m3"]:
+        buffer.add(text, user_id="u1")
+    with pytest.raises(ConnectionError):
+        buffer.flush()
+    assert stored == ["m0", "m1"] and buffer.pending == 3
+    assert buffer.flush() == 2
+    assert stored == ["m0", "m1", "m2", "m3"] and buffer.pending == 0
+    assert buffer.stats["dropped"] == 1 and buffer.dead_letters[0]["entry"]["messages"] == "bad"
+
+    # Sync in-process backends are not waited for after a write
+    assert buffer.index_delay == MEM0_CONFIG["index_delay"]
+    with WriteBehindMemory(LocalMemory(), max_batch=1000, max_delay=60) as local:
+        assert local.index_delay == 0
+    buffer.close()
+
+def test_dedup_suppresses_near_duplicates():
+    """Test MinHash suppression, metadata merging and scoping by user and type."""
+    from socratic.memory.dedup import DedupMemory
+
+    local = LocalMemory()
+    memory = DedupMemory(local, threshold=0.7)
+    text = "Barack Obama was born on August 4, 1961 in Honolulu, Hawaii, United States"
+    first = memory.add(text, user_id="u1", metadata={"type": "insight", "source": "a"})
+    memory_id = first["results"][0]["id"]
+
+    repeat = memory.add(text + ".", user_id="u1", metadata={"type": "insight", "turn": 2})
+    assert repeat["results"][0] == {"id": memory_id, "event": "UPDATE", "duplicate": True}
+    assert local.get(memory_id)["metadata"] == {"type": "insight", "source": "a",
+                                                "turn": 2, "duplicates": 1}
+    assert len(local) == 1
+
+    memory.add(text, user_id="u2", metadata={"type": "insight"})
+    memory.add(text, user_id="u1", metadata={"type": "reasoning_output"})
+    memory.add("The Eiffel Tower is in Paris and was completed in 1889", user_id="u1",
+               metadata={"type": "insight"})
+    batch = memory.add_many([
+        {"messages": "Michelle Obama was born on January 17, 1964 in Chicago", "user_id": "u1"},
+        {"messages": "Michelle Obama was born on January 17, 1964 in Chicago!", "user_id": "u1"},
+    ])
+    assert batch["results"][1]["duplicate"] and len(local) == 5
+
+    stats = memory.get_stats()
+    assert stats["checked"] == 7 and stats["suppressed"] == 2 and stats["added"] == 5
+    assert stats["merged"] == 1, "In-batch duplicates have no stored memory to merge into yet"
+
+    fresh = DedupMemory(local, threshold=0.7)
+    assert fresh.index_existing(user_id="u1") == 4
+    assert fresh.add(text, user_id="u1", metadata={"type": "insight"})["results"][0]["duplicate"]
+
+def test_dedup_matches_mem0_results_to_writes():
+    """Test indexing against a client returning several or no memories per add."""
+    from unittest.mock import Mock
+    from socratic.memory.dedup import DedupMemory
+
+    texts = ["Obama was born in 1961 and served two terms as president",
+             "Michelle Obama was born in Chicago in 1964",
+             "Paris is the capital city of France"]
+    responses = {
+        texts[0]: {"results": [{"id": "m1", "memory": "Born in 1961", "event": "ADD"},
+                               {"id": "m2", "memory": "Served two terms", "event": "ADD"}]},
+        texts[1]: {"results": [{"id": "m3", "memory": texts[1], "event": "ADD"}]},
+        texts[2]: {"results": [{"id": "m4", "memory": texts[2], "event": "NOOP"}]},
+    }
+    client = Mock(spec=["add", "update"])
+    client.add.side_effect = lambda messages, **kwargs: responses[messages]
+    client.update.side_effect = RuntimeError("update rejected")
+    memory = DedupMemory(client, threshold=0.7)
+
+    batch = memory.add_many([{"messages": text, "user_id": "u1"} for text in texts])
+    assert batch["results"][0] == responses[texts[0]] and batch["results"][1]["id"] == "m3"
+    stats = memory.get_stats()
+    assert stats["added"] == 1 and stats["unindexed"] == 2 and stats["indexed"] == 1
+
+    # Only the write that stored exactly one memory is matched to an id
+    repeat = memory.add(texts[1], user_id="u1")
+    assert repeat["results"][0]["id"] == "m3"
+    assert client.update.call_args.args[0] == "m3"
+    assert memory.get_stats()["merge_failures"] == 1
+    assert memory.add(texts[2], user_id="u1") == responses[texts[2]]
@@ -0,0 +1,216 @@
+"""Test the utility components of the Socratic framework."""
+
+import os
+import sys
+import time
+import asyncio
+import pytest
+
+# Add the package directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from socratic.utils.history import ConversationHistory, Turn
+from socratic.utils.ratelimit import (
+    TokenBucket, RetryScheduler, RetryDeadlineExceeded, get_scheduler, is_retryable_error
+)
+
+class RateLimitError(Exception):
+    """Stand-in for a provider rate-limit error."""
+    status_code = 429
+
+def test_token_bucket_smooths_bursts():
+    """Test that a bucket allows its burst and then throttles."""
+    bucket = TokenBucket(rate=50, capacity=2)
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+    assert elapsed >= 0.03, "Calls beyond the burst should wait"
+    metrics = bucket.get_metrics()
+    assert metrics["throttled"] == 2
+    assert metrics["queue_depth"] == 0
+
+    async def run():
+        await asyncio.gather(*[bucket.aacquire() for _ in range(3)])
+    asyncio.run(run())
+    assert bucket.get_metrics()["max_queue_depth"] >= 2
+
+def test_retry_scheduler_retries_transient_errors():
+    """Test jittered retries for transient errors only."""
+    scheduler = RetryScheduler("test", max_retries=2, retry_delay=0.001, rate_limit_delay=0.002)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimitError("slow down")
+        return "ok"
+
+    assert scheduler.call(flaky) == "ok"
+    metrics = scheduler.get_metrics()
+    assert metrics["retries"] == 2 and metrics["rate_limited"] == 2
+
+    with pytest.raises(ValueError):
+        scheduler.call(lambda: (_ for _ in ()).throw(ValueError("bad input")))
+    assert scheduler.get_metrics()["failures"] == 1
+
+    async def always_timeout():
+        raise TimeoutError("timed out")
+    with pytest.raises(TimeoutError):
+        asyncio.run(scheduler.acall(always_timeout))
+    assert scheduler.get_metrics()["retries"] == 4
+
+    assert is_retryable_error(ConnectionError())
+    assert not is_retryable_error(KeyError())
+    assert get_scheduler("mem0") is get_scheduler("mem0")
+    assert get_scheduler("mem0").limiter is not None
+    assert get_scheduler("lm").limiter is None and get_scheduler("lm").max_retries == 0
+
+def test_retry_scheduler_bounds_backoff():
+    """Test that backoff is capped per attempt and retries stop at the deadline."""
+    scheduler = RetryScheduler("test", max_retries=5, retry_delay=60, rate_limit_delay=3600,
+                               max_delay=0.01, deadline=0.05)
+    assert scheduler.backoff(0, RateLimitError()) <= 0.01
+    assert scheduler.backoff(10, ConnectionError()) <= 0.01
+
+    scheduler.max_delay = 1.0
+    start = time.monotonic()
+    with pytest.raises(RetryDeadlineExceeded):
+        scheduler.call(lambda: (_ for _ in ()).throw(ConnectionError("reset")))
+    assert time.monotonic() - start < 0.5
+    assert scheduler.get_metrics()["deadline_exceeded"] == 1
+
+def test_conversation_history_is_bounded_and_interned():
+    """Test ring-buffer eviction, context interning and dict compatibility."""
+    history = ConversationHistory(capacity=3)
+    assert history == []
+    shared = "Barack Obama was born in 1961"
+    for i in range(5):
+        context = "".join(["Barack Obama was born ", "in 1961"])  # distinct object
+        history.append({'question': f"q{i}", 'answer': f"a{i}", 'context': context})
+    history.append({'type': 'questions', 'content': ["Why?"], 'context': "other"})
+
+    assert len(history) == 3
+    assert [turn.get('question') for turn in history] == ["q3", "q4", None]
+    assert history[0] == {'question': "q3", 'answer': "a3", 'context': shared}
+    assert history[-1] == {'type': 'questions', 'content': ["Why?"], 'context': "other"}
+    assert history.unique_contexts == 2
+
+    records = history.turns()
+    assert records[0].context is records[1].context, "Equal contexts should be shared"
+    assert not hasattr(records[0], "__dict__"), "Turns should use __slots__"
+    assert Turn.from_dict({'question': "q", 'context': "", 'score': 1}).to_dict()['score'] == 1
+    assert Turn.from_dict({'question': "q"}).to_dict() == {'question': "q"}, "Unset context is omitted"
+
+    history.clear()
+    assert history.to_list() == [] and history.unique_contexts == 0
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda i: history.append({'question': f"q{i}", 'context': f"c{i % 4}"}),
+                          range(400)))
+    assert len(history) == 3
+    assert history.unique_contexts == len({turn['context'] for turn in history})
+
+def test_lightweight_imports_skip_heavy_dependencies():
+    """Test that importing utilities does not load DSPy or Mem0."""
+    import subprocess
+    probe = ("import socratic, socratic.utils.monitoring, sys; "
+             "print([m for m in ('dspy', 'mem0') if m in sys.modules])")
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    output = subprocess.run([sys.executable, "-c", probe], capture_output=True,
+                            text=True, env=env, check=True).stdout.strip()
+    assert output == "[]", f"Heavy modules loaded at import: {output}"
+
+def test_performance_monitor_spans_and_percentiles():
+    """Test overlapping spans, nesting and histogram percentiles."""
+    from socratic.utils.monitoring import LatencyHistogram, PerformanceMonitor
+    monitor = PerformanceMonitor()
+    
+    # Overlapping operations with the same name no longer overwrite each other
+    first = monitor.start_operation("search")
+    second = monitor.start_operation("search")
+    time.sleep(0.01)
+    monitor.end_operation(second)
+    monitor.end_operation("search", success=False)
+    metrics = monitor.get_metrics("search")
+    assert metrics["count"] == 2 and metrics["success_rate"] == 0.5
+    assert first.duration >= 0.01
+    
+    with monitor.span("turn") as outer:
+        with monitor.span("lm") as inner:
+            assert inner.parent is outer
+    with pytest.raises(ValueError):
+        with monitor.span("lm"):
+            raise ValueError("boom")
+    assert monitor.get_metrics("lm")["success_count"] == 1
+    
+    async def task(i):
+        async with monitor.span("async_call"):
+            await asyncio.sleep(0.001 * i)
+    async def run():
+        await asyncio.gather(*[task(i) for i in range(10)])
+    asyncio.run(run())
+    assert monitor.get_metrics("async_call")["count"] == 10
+    
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms * 1_000_000)
+    assert abs(histogram.percentile(50) / 1e6 - 50) < 50 * 0.05
+    assert abs(histogram.percentile(99) / 1e6 - 99) < 99 * 0.05
+    assert len(histogram.counts) < 1000, "Histogram memory should be fixed"
+    
+    metrics = monitor.get_metrics()
+    assert {"p50_duration", "p95_duration", "p99_duration"} <= set(metrics["search"])
+    monitor.reset()
+    assert monitor.get_metrics() == {}
+
+def test_global_instrumentation_and_export(tmp_path):
+    """Test opt-in hot-path instrumentation and both exporters."""
+    import json
+    import urllib.request
+    import dspy
+    from dspy.utils import DummyLM
+    from socratic.core.agent import SocraticPredictor
+    from socratic.utils.export import JsonSnapshotWriter, start_prometheus_server, to_prometheus
+    from socratic.utils.monitoring import PerformanceMonitor, set_monitor
+    
+    monitor = PerformanceMonitor()
+    previous = set_monitor(monitor)
+    try:
+        predictor = SocraticPredictor(signature="question -> answer")
+        predictor.lm = DummyLM([{"answer": "42"}])
+        assert predictor.forward(question="Meaning of life?").answer == "42"
+        
+        scheduler = RetryScheduler("mem0", max_retries=1, retry_delay=0.001)
+        attempts = []
+        def search(query):
+            attempts.append(query)
+            if len(attempts) == 1:
+                raise ConnectionError("reset")
+            return []
+        scheduler.call(search, "Obama")
+        
+        metrics = monitor.get_metrics()
+        assert metrics["lm.forward"]["count"] == 1
+        assert metrics["mem0.search"]["count"] == 1
+        assert monitor.get_counters()["mem0.retries"] == 1
+        
+        text = to_prometheus(monitor)
+        assert 'socratic_operation_duration_seconds{operation="mem0.search",quantile="0.99"}' in text
+        assert "socratic_mem0_retries_total 1" in text
+        
+        server = start_prometheus_server(monitor, port=0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            assert urllib.request.urlopen(url).read().decode() == to_prometheus(monitor)
+        finally:
+            server.shutdown()
+        
+        path = tmp_path / "metrics.json"
+        writer = JsonSnapshotWriter(monitor, str(path), interval=0.01).start()
+        writer.stop()
+        snapshot = json.loads(path.read_text())
+        assert snapshot["operations"]["lm.forward"]["count"] == 1
+    finally:
+        set_monitor(previous)
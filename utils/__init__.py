@@ -1,6 +1,31 @@
 """Utility functions and configurations."""
 
-from .config import load_config, MEM0_CONFIG, OPENAI_CONFIG
-from .monitoring import PerformanceMonitor
+from typing import TYPE_CHECKING
 
-__all__ = ['load_config', 'MEM0_CONFIG', 'OPENAI_CONFIG', 'PerformanceMonitor']
+from ._lazy import make_lazy
+
+if TYPE_CHECKING:
+    from .config import load_config, MEM0_CONFIG, OPENAI_CONFIG
+    from .monitoring import PerformanceMonitor, enable_monitoring, get_monitor, set_monitor
+    from .trace import TraceRecorder, TraceReplayer, get_trace, set_trace
+
+# Imported on first access so that using one utility does not load the others
+_LAZY_IMPORTS = {
+    'load_config': '.config',
+    'MEM0_CONFIG': '.config',
+    'OPENAI_CONFIG': '.config',
+    'PerformanceMonitor': '.monitoring',
+    'get_monitor': '.monitoring',
+    'set_monitor': '.monitoring',
+    'enable_monitoring': '.monitoring',
+    'TraceRecorder': '.trace',
+    'TraceReplayer': '.trace',
+    'get_trace': '.trace',
+    'set_trace': '.trace',
+}
+
+__getattr__, __dir__ = make_lazy(globals(), _LAZY_IMPORTS)
+
+__all__ = ['load_config', 'MEM0_CONFIG', 'OPENAI_CONFIG', 'PerformanceMonitor',
+           'get_monitor', 'set_monitor', 'enable_monitoring', 'TraceRecorder',
+           'TraceReplayer', 'get_trace', 'set_trace']
@@ -0,0 +1,36 @@
+"""Lazy package exports.
+
+Packages list their public names with the submodule defining each one and
+only import a submodule when one of its names is first accessed, so that
+importing a package (or a light submodule) does not pull in dspy, mem0,
+openai or numpy.
+"""
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+def make_lazy(module_globals: Dict[str, Any],
+              mapping: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Build module-level __getattr__ and __dir__ for lazy exports.
+
+    Args:
+        module_globals: globals() of the package
+        mapping: Public name to relative submodule defining it
+
+    Returns:
+        (__getattr__, __dir__) to assign in the package
+    """
+    package = module_globals['__name__']
+
+    def __getattr__(name: str) -> Any:
+        module_name = mapping.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        module_globals[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(module_globals) | set(mapping))
+
+    return __getattr__, __dir__
@@ -0,0 +1,405 @@
+"""Caching utilities for the Socratic framework.
+
+This module provides the cache tiers used to avoid repeated model and
+memory round-trips:
+
+1. LRUCache: bounded, thread-safe in-memory cache with optional TTL
+2. SQLiteCache: persistent on-disk cache with size and TTL eviction
+3. TieredCache: in-memory tier in front of an optional on-disk tier
+
+All caches track hit/miss/eviction counts in a CacheStats object.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+def hash_key(*parts: Any) -> str:
+    """Build a stable cache key from JSON-serializable parts.
+
+    Args:
+        *parts: Values identifying the cached entry
+
+    Returns:
+        Hex SHA-256 digest of the parts
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class CacheStats:
+    """Hit, miss and eviction counters for a cache."""
+
+    __slots__ = ("hits", "misses", "evictions", "expirations")
+
+    def __init__(self):
+        """Initialize counters."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that were hits."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the counters as a dictionary.
+
+        Returns:
+            Dictionary of counters and hit rate
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': self.hit_rate
+        }
+
+    def reset(self) -> None:
+        """Reset all counters."""
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+class LRUCache:
+    """Bounded, thread-safe least-recently-used cache."""
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries kept
+            ttl: Optional time-to-live in seconds for each entry
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Look up a cached value.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or default on a miss
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.stats.misses += 1
+                return default
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a single entry if present.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+class SQLiteCache:
+    """Persistent cache stored in a SQLite database.
+
+    Values are stored as JSON. Entries are evicted least-recently-accessed
+    first once max_entries is exceeded and expire after ttl seconds.
+    Entries are grouped by namespace so unrelated users of one database
+    file can be cleared independently.
+    """
+
+    # Number of writes between eviction passes
+    EVICT_INTERVAL = 64
+
+    def __init__(self, path: str, max_entries: int = 100_000,
+                 ttl: Optional[float] = None, namespace: str = "default"):
+        """Initialize the cache.
+
+        Args:
+            path: Path to the SQLite database file
+            max_entries: Maximum number of entries kept in this namespace
+            ttl: Optional time-to-live in seconds for each entry
+            namespace: Namespace for the entries of this cache
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.namespace = namespace
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_accessed ON cache (namespace, accessed)"
+            )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Look up a cached value.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or default on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return default
+            value, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                with self._conn:
+                    self._conn.execute(
+                        "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                        (self.namespace, key)
+                    )
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE cache SET accessed = ? WHERE namespace = ? AND key = ?",
+                    (now, self.namespace, key)
+                )
+            self.stats.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        now = time.time()
+        payload = json.dumps(value, default=str, ensure_ascii=False)
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (namespace, key, value, created, accessed)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (self.namespace, key, payload, now, now)
+                )
+            self._writes += 1
+            if self._writes % self.EVICT_INTERVAL == 0:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Remove expired entries and entries beyond max_entries.
+
+        Must be called with the lock held.
+
+        Args:
+            now: Current wall-clock time
+        """
+        with self._conn:
+            if self.ttl is not None:
+                cursor = self._conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND created < ?",
+                    (self.namespace, now - self.ttl)
+                )
+                self.stats.expirations += max(cursor.rowcount, 0)
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key IN ("
+                " SELECT key FROM cache WHERE namespace = ?"
+                " ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.max_entries)
+            )
+            self.stats.evictions += max(cursor.rowcount, 0)
+
+    def evict(self) -> None:
+        """Run an eviction pass immediately."""
+        with self._lock:
+            self._evict(time.time())
+
+    def invalidate(self, key: str) -> None:
+        """Remove a single entry if present.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            )
+
+    def clear(self) -> None:
+        """Remove all entries in this namespace."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+class TieredCache:
+    """In-memory LRU tier in front of an optional persistent tier."""
+
+    def __init__(self, memory: Optional[LRUCache] = None,
+                 disk: Optional[SQLiteCache] = None):
+        """Initialize the cache.
+
+        Args:
+            memory: In-memory tier (creates a default LRUCache if None)
+            disk: Optional on-disk tier
+        """
+        self.memory = memory or LRUCache()
+        self.disk = disk
+        self.stats = CacheStats()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Look up a value, promoting disk hits into memory.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or default on a miss
+        """
+        value = self.memory.get(key, _MISSING)
+        if value is _MISSING and self.disk is not None:
+            value = self.disk.get(key, _MISSING)
+            if value is not _MISSING:
+                self.memory.set(key, value)
+        if value is _MISSING:
+            self.stats.misses += 1
+            return default
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value in every tier.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def invalidate(self, key: str) -> None:
+        """Remove a single entry from every tier.
+
+        Args:
+            key: Cache key
+        """
+        self.memory.invalidate(key)
+        if self.disk is not None:
+            self.disk.invalidate(key)
+
+    def clear(self) -> None:
+        """Remove all entries from every tier."""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics for the cache and each tier.
+
+        Returns:
+            Dictionary of overall and per-tier statistics
+        """
+        stats = self.stats.as_dict()
+        stats['memory'] = self.memory.stats.as_dict()
+        if self.disk is not None:
+            stats['disk'] = self.disk.stats.as_dict()
+        return stats
+
+def build_cache(config: Dict[str, Any], namespace: str = "default") -> TieredCache:
+    """Build a tiered cache from a configuration dictionary.
+
+    Args:
+        config: Dictionary with memory_size, path, max_entries and ttl keys
+        namespace: Namespace for entries in the on-disk tier
+
+    Returns:
+        Configured TieredCache (memory-only if no path is configured)
+    """
+    ttl = config.get("ttl")
+    memory = LRUCache(max_size=config.get("memory_size", 1024), ttl=ttl)
+    disk = None
+    if config.get("path"):
+        disk = SQLiteCache(
+            config["path"],
+            max_entries=config.get("max_entries", 100_000),
+            ttl=ttl,
+            namespace=namespace
+        )
+    return TieredCache(memory=memory, disk=disk)
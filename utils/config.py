@@ -12,7 +12,12 @@ def load_config() -> None:
 # OpenAI configuration
 OPENAI_CONFIG: Dict[str, Any] = {
     "api_key": os.getenv("OPENAI_API_KEY"),
-    "model": "gpt-4-turbo-preview"
+    "model": "gpt-4-turbo-preview",
+    "rate_limit": {
+        "max_retries": 0,  # The LM client already retries (dspy/litellm num_retries)
+        "requests_per_second": None,  # Opt-in process-wide request rate (None disables)
+        "burst": None  # Requests allowed above the sustained rate
+    }
 }
 
 # Mem0 configuration
@@ -23,10 +28,33 @@ MEM0_CONFIG: Dict[str, Any] = {
     "api_version": "v1.1",
     "rate_limit": {
         "max_retries": 3,
-        "retry_delay": 60,  # Delay in seconds between retries
-        "rate_limit_delay": 3600  # 1 hour delay when rate limit is hit
+        "retry_delay": 60,  # Legacy setting, not used by the retry scheduler
+        "rate_limit_delay": 3600,  # Legacy setting, not used by the retry scheduler
+        "backoff_delay": 0.5,  # Base retry backoff in seconds
+        "rate_limit_backoff": 2.0,  # Backoff after a rate-limit error
+        "max_backoff": 5.0,  # Maximum seconds slept before any one retry
+        "deadline": 30.0,  # Seconds after which a failing call stops retrying
+        "requests_per_second": 20,  # Sustained request rate shared by the process
+        "burst": 40  # Requests allowed above the sustained rate
+    },
+    "index_delay": 5,  # Wait 5 seconds for indexing after add operations
+    "write_behind": {
+        "max_batch": 100,  # Queued adds that trigger a bulk write
+        "max_delay": 1.0  # Maximum seconds an add stays queued
     },
-    "index_delay": 5  # Wait 5 seconds for indexing after add operations
+    "dedup": {
+        "enabled": os.getenv("SOCRATIC_MEMORY_DEDUP", "").lower() in ("1", "true", "yes"),
+        "threshold": 0.85,  # Estimated shingle similarity at which writes are duplicates
+        "num_perm": 64,  # MinHash permutations per signature
+        "bands": 16,  # LSH bands (num_perm must be divisible by this)
+        "shingle_size": 3,  # Words per shingle
+        "merge_metadata": True,  # Merge duplicate metadata into the existing memory
+        "max_entries": 100_000  # Indexed memories kept, oldest dropped first
+    },
+    "search_cache": {
+        "max_size": 256,  # Cached search results per user (0 disables)
+        "ttl": 300  # Seconds before a cached search result expires
+    }
 }
 
 # Memory client configuration
@@ -40,9 +68,68 @@ DSPY_CONFIG: Dict[str, Any] = {
     "temperature": 0.7
 }
 
+# LM response cache configuration (opt-in)
+CACHE_CONFIG: Dict[str, Any] = {
+    "enabled": os.getenv("SOCRATIC_CACHE", "").lower() in ("1", "true", "yes"),
+    "path": os.getenv("SOCRATIC_CACHE_PATH", ".socratic_cache.sqlite"),
+    "memory_size": 1024,  # Entries kept in the in-memory LRU tier
+    "max_entries": 100_000,  # Entries kept in the on-disk tier
+    "ttl": 7 * 24 * 3600  # Seconds before a cached response expires
+}
+
+# Judge verdict cache configuration (shares the response cache database file)
+JUDGE_CACHE_CONFIG: Dict[str, Any] = {
+    "enabled": os.getenv("SOCRATIC_JUDGE_CACHE", "").lower() in ("1", "true", "yes"),
+    "path": CACHE_CONFIG["path"],
+    "memory_size": 4096,  # Verdicts kept in the in-memory LRU tier
+    "max_entries": 500_000,  # Verdicts kept on disk
+    "ttl": None  # Verdicts do not expire; they are keyed on the judge instructions
+}
+
+# Built-in instrumentation and metrics export (see utils/monitoring.py)
+MONITORING_CONFIG: Dict[str, Any] = {
+    "enabled": os.getenv("SOCRATIC_METRICS", "").lower() in ("1", "true", "yes"),
+    "prometheus_port": os.getenv("SOCRATIC_METRICS_PORT"),  # Serve /metrics when set
+    "snapshot_path": os.getenv("SOCRATIC_METRICS_SNAPSHOT"),  # Write JSON snapshots when set
+    "snapshot_interval": 30.0  # Seconds between JSON snapshots
+}
+
+# Record/replay of LM and memory calls (see utils/trace.py)
+TRACE_CONFIG: Dict[str, Any] = {
+    "record_path": os.getenv("SOCRATIC_TRACE_RECORD"),  # Record calls to this trace file
+    "replay_path": os.getenv("SOCRATIC_TRACE_REPLAY"),  # Serve calls from this trace file
+    "replay_speed": float(os.getenv("SOCRATIC_TRACE_SPEED", "1.0")),  # 0 replays without delay
+    "include_requests": True  # Store request bodies in recorded traces
+}
+
+# Heuristic first stage of the cascading judge
+JUDGE_CASCADE_CONFIG: Dict[str, Any] = {
+    "min_words": 1,  # Outputs with fewer words score 0 (keep low: "1961" can be a full answer)
+    "max_chars": None,  # Outputs longer than this score 0 (None disables)
+    "refusal_patterns": [
+        r"^\s*(i'?m sorry|i apologi[sz]e)\b.{0,40}\b(can(no|')t|unable|not able)\b",
+        r"^\s*i (can(no|')t|am unable to|won'?t) (help|assist|answer|provide)\b",
+        r"\bas an ai (language )?model\b"
+    ],
+    "echo_threshold": 0.9,  # Shingle similarity to the prompt that counts as an echo
+    "reference_threshold": 0.9,  # Shingle similarity that reuses a reference score
+    "uncertainty_band": (0.2, 0.8),  # Heuristic scores in this band go to the LM judge
+    "remembered_verdicts": 10_000  # Scored outputs kept for duplicate detection
+}
+
 # Default configuration
 DEFAULTS: Dict[str, Any] = {
     "max_workers": 4,
     "timeout": 30,
-    "retry_attempts": 3
+    "retry_attempts": 3,
+    "history_size": 1000,  # Conversation turns kept per game or dialogue
+    "context_token_budget": 1500,  # Tokens of memory context sent to the model
+    "context_dedup_threshold": 0.85,  # Similarity at which memories are duplicates
+    "retrieval_history_turns": 0,  # Recent questions mixed into the retrieval query
+    "retrieval_reuse_threshold": 0.6,  # Query overlap at which prior hits are reused
+    "judge_batch_size": 8,  # Outputs rated per call by ReasoningJudge.rate_many
+    "session_concurrency": 4,  # Model calls in flight per SocraticSession turn
+    "session_followups": 3,  # Generated questions answered per SocraticSession turn
+    "best_of_n": 4,  # Candidates sampled by CreativityGame.forward_best_of
+    "best_of_temperature": 0.9  # Sampling temperature for best-of-N candidates
 }
@@ -0,0 +1,169 @@
+"""Metrics exporters for PerformanceMonitor.
+
+Two exporters are provided:
+
+1. Prometheus text exposition format, served over HTTP at /metrics
+2. Periodic JSON snapshot files, replaced atomically on each write
+
+Operation timings are exported as Prometheus summaries
+(socratic_operation_duration_seconds with p50/p95/p99 quantiles) and
+counters as socratic_<counter name>_total.
+"""
+
+import os
+import re
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+from .monitoring import PerformanceMonitor
+
+logger = logging.getLogger(__name__)
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+
+def _metric_name(name: str, prefix: str) -> str:
+    """Turn a counter name into a valid Prometheus metric name.
+
+    Args:
+        name: Counter name, e.g. "lm.prompt_tokens"
+        prefix: Metric name prefix
+
+    Returns:
+        Sanitized metric name
+    """
+    return f"{prefix}_{_INVALID_NAME_CHARS.sub('_', name)}"
+
+def _label(value: str) -> str:
+    """Escape a Prometheus label value.
+
+    Args:
+        value: Raw label value
+
+    Returns:
+        Escaped value
+    """
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def to_prometheus(monitor: PerformanceMonitor, prefix: str = "socratic") -> str:
+    """Render monitor metrics in the Prometheus text exposition format.
+
+    Args:
+        monitor: Monitor to export
+        prefix: Metric name prefix
+
+    Returns:
+        Metrics text
+    """
+    lines: List[str] = []
+    operations = monitor.get_metrics()
+    if operations:
+        duration = f"{prefix}_operation_duration_seconds"
+        failures = f"{prefix}_operation_failures_total"
+        lines.append(f"# HELP {duration} Duration of timed operations.")
+        lines.append(f"# TYPE {duration} summary")
+        for name, metrics in sorted(operations.items()):
+            label = _label(name)
+            for quantile, key in (("0.5", "p50_duration"), ("0.95", "p95_duration"),
+                                  ("0.99", "p99_duration")):
+                lines.append(f'{duration}{{operation="{label}",quantile="{quantile}"}} {metrics[key]:.9g}')
+            lines.append(f'{duration}_sum{{operation="{label}"}} {metrics["total_duration"]:.9g}')
+            lines.append(f'{duration}_count{{operation="{label}"}} {metrics["count"]}')
+        lines.append(f"# HELP {failures} Timed operations that failed.")
+        lines.append(f"# TYPE {failures} counter")
+        for name, metrics in sorted(operations.items()):
+            lines.append(f'{failures}{{operation="{_label(name)}"}} '
+                         f'{metrics["count"] - metrics["success_count"]}')
+    for name, value in sorted(monitor.get_counters().items()):
+        metric = _metric_name(name, prefix) + "_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value:.9g}")
+    return "\n".join(lines) + "\n"
+
+def start_prometheus_server(monitor: PerformanceMonitor, port: int = 9464,
+                            host: str = "127.0.0.1",
+                            prefix: str = "socratic") -> ThreadingHTTPServer:
+    """Serve monitor metrics for Prometheus in a background thread.
+
+    Args:
+        monitor: Monitor to export
+        port: Port to listen on (0 picks a free port)
+        host: Interface to bind
+        prefix: Metric name prefix
+
+    Returns:
+        The running server; call shutdown() to stop it
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = to_prometheus(monitor, prefix).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("metrics: " + format, *args)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="socratic-metrics", daemon=True).start()
+    logger.info(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+class JsonSnapshotWriter:
+    """Periodically write monitor snapshots to a JSON file."""
+
+    def __init__(self, monitor: PerformanceMonitor, path: str, interval: float = 30.0):
+        """Initialize the writer.
+
+        Args:
+            monitor: Monitor to export
+            path: File the snapshot is written to
+            interval: Seconds between snapshots
+        """
+        self.monitor = monitor
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self) -> None:
+        """Write one snapshot, replacing the previous file atomically."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.monitor.snapshot(), f, indent=2, default=str)
+        os.replace(tmp_path, self.path)
+
+    def _run(self) -> None:
+        """Write snapshots until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except Exception as e:
+                logger.error(f"Error writing metrics snapshot: {str(e)}")
+
+    def start(self) -> "JsonSnapshotWriter":
+        """Start writing snapshots in a background thread.
+
+        Returns:
+            The writer
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="socratic-snapshot", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background thread and write a final snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
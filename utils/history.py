@@ -0,0 +1,199 @@
+"""Bounded conversation history.
+
+Conversation turns are stored as __slots__ records in a ring buffer with a
+fixed capacity; once full, the oldest turn is dropped for each new one.
+Context strings, which are often identical across turns, are interned by
+content so that repeated contexts share one string object and are released
+once no retained turn refers to them.
+
+ConversationHistory accepts and returns the plain turn dictionaries used
+throughout the framework, so it can replace a list of dicts. Appends are
+serialized by a lock, so turns may be recorded from worker threads.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Optional, Union
+
+from .config import DEFAULTS
+
+class Turn:
+    """A single conversation turn."""
+
+    __slots__ = ("kind", "question", "answer", "content", "context", "extra")
+
+    def __init__(self, kind: Optional[str] = None, question: Optional[str] = None,
+                 answer: Optional[str] = None, content: Any = None,
+                 context: Optional[str] = None, extra: Optional[Dict[str, Any]] = None):
+        """Initialize the turn.
+
+        Args:
+            kind: Optional turn type (stored as "type" in dictionaries)
+            question: Question asked in this turn
+            answer: Answer given in this turn
+            content: Other turn content, e.g. generated questions
+            context: Memory or dialogue context used for the turn (None if
+                the turn had no context)
+            extra: Any additional fields
+        """
+        self.kind = kind
+        self.question = question
+        self.answer = answer
+        self.content = content
+        self.context = context
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Turn":
+        """Build a turn from a turn dictionary.
+
+        Args:
+            data: Dictionary with question/answer/type/content/context keys
+
+        Returns:
+            The turn record
+        """
+        known = {"type", "question", "answer", "content", "context"}
+        extra = {k: v for k, v in data.items() if k not in known}
+        return cls(
+            kind=data.get("type"),
+            question=data.get("question"),
+            answer=data.get("answer"),
+            content=data.get("content"),
+            context=data.get("context"),
+            extra=extra or None
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the turn to a turn dictionary.
+
+        Returns:
+            Dictionary containing the fields set on this turn
+        """
+        data: Dict[str, Any] = {}
+        if self.kind is not None:
+            data['type'] = self.kind
+        if self.question is not None:
+            data['question'] = self.question
+        if self.answer is not None:
+            data['answer'] = self.answer
+        if self.content is not None:
+            data['content'] = self.content
+        if self.context is not None:
+            data['context'] = self.context
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+class ConversationHistory:
+    """Ring buffer of conversation turns with interned context strings."""
+
+    def __init__(self, capacity: Optional[int] = None):
+        """Initialize the history.
+
+        Args:
+            capacity: Maximum number of turns kept (defaults to
+                DEFAULTS["history_size"])
+        """
+        if capacity is None:
+            capacity = DEFAULTS["history_size"]
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._turns: Deque[Turn] = deque()
+        # context text -> [shared string, number of retained turns using it]
+        self._contexts: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def _intern(self, context: str) -> str:
+        """Return the shared copy of a context string.
+
+        Args:
+            context: Context text
+
+        Returns:
+            The interned string
+        """
+        entry = self._contexts.get(context)
+        if entry is None:
+            entry = [context, 0]
+            self._contexts[context] = entry
+        entry[1] += 1
+        return entry[0]
+
+    def _release(self, context: str) -> None:
+        """Drop one reference to an interned context string.
+
+        Args:
+            context: Context text
+        """
+        entry = self._contexts.get(context)
+        if entry is not None:
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._contexts[context]
+
+    def append(self, turn: Union[Turn, Mapping[str, Any]]) -> None:
+        """Add a turn, dropping the oldest turn when full.
+
+        Args:
+            turn: Turn record or turn dictionary
+        """
+        if not isinstance(turn, Turn):
+            turn = Turn.from_dict(turn)
+        with self._lock:
+            if len(self._turns) >= self.capacity:
+                evicted = self._turns.popleft()
+                if evicted.context is not None:
+                    self._release(evicted.context)
+            if turn.context is not None:
+                turn.context = self._intern(turn.context)
+            self._turns.append(turn)
+
+    def clear(self) -> None:
+        """Remove all turns."""
+        with self._lock:
+            self._turns.clear()
+            self._contexts.clear()
+
+    def turns(self) -> List[Turn]:
+        """Get the retained turn records, oldest first.
+
+        Returns:
+            List of turn records
+        """
+        return list(self._turns)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Get the retained turns as dictionaries, oldest first.
+
+        Returns:
+            List of turn dictionaries
+        """
+        return [turn.to_dict() for turn in list(self._turns)]
+
+    @property
+    def unique_contexts(self) -> int:
+        """Number of distinct context strings currently retained."""
+        return len(self._contexts)
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (turn.to_dict() for turn in list(self._turns))
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [turn.to_dict() for turn in list(self._turns)[index]]
+        return self._turns[index].to_dict()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ConversationHistory):
+            return self.to_list() == other.to_list()
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ConversationHistory(turns={len(self)}, capacity={self.capacity})"
@@ -1,73 +1,472 @@
-"""Performance monitoring and metrics tracking."""
+"""Performance monitoring and metrics tracking.
 
+Operations are timed with span handles that use a monotonic nanosecond
+clock (time.perf_counter_ns), so concurrent and nested operations with the
+same name never interfere with each other. Spans work as plain handles,
+as context managers and as async context managers:
+
+    with monitor.span("memory.search"):
+        ...
+    async with monitor.span("lm.call"):
+        ...
+    span = monitor.start_operation("judge")
+    ...
+    monitor.end_operation(span)
+
+Durations are recorded in fixed-memory log-bucket histograms, giving
+p50/p95/p99 latencies per operation alongside count, min, avg and max.
+
+Built-in instrumentation (LM calls, token usage, memory calls, retries,
+cache lookups and judge verdicts) reports to a process-wide monitor that
+is opt-in: install one with set_monitor()/enable_monitoring(), or set
+SOCRATIC_METRICS to create one on first use. See utils/export.py for the
+Prometheus and JSON snapshot exporters.
+"""
+
+import math
 import time
 import logging
-from typing import Dict, Any, Optional
+import threading
+import contextvars
+from typing import Dict, Any, List, Optional, Union
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+# Innermost active span of the current thread or task
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "socratic_current_span", default=None
+)
+
+class LatencyHistogram:
+    """Fixed-memory histogram of durations with logarithmic buckets.
+
+    Bucket boundaries grow by a constant factor, so percentiles have a
+    bounded relative error (about 4% with the default 16 buckets per
+    doubling) regardless of how many samples are recorded.
+    """
+
+    __slots__ = ("buckets_per_doubling", "min_ns", "counts", "count",
+                 "total_ns", "min_seen_ns", "max_seen_ns")
+
+    def __init__(self, buckets_per_doubling: int = 16, min_ns: int = 1_000,
+                 max_ns: int = 3_600 * 10**9):
+        """Initialize the histogram.
+
+        Args:
+            buckets_per_doubling: Buckets for each factor-of-two range
+            min_ns: Upper bound of the lowest bucket (default 1 microsecond)
+            max_ns: Lower bound of the highest bucket (default 1 hour)
+        """
+        self.buckets_per_doubling = buckets_per_doubling
+        self.min_ns = min_ns
+        size = self._index(max_ns) + 1
+        self.counts: List[int] = [0] * size
+        self.count = 0
+        self.total_ns = 0
+        self.min_seen_ns = 0
+        self.max_seen_ns = 0
+
+    def _index(self, duration_ns: int) -> int:
+        """Get the bucket index of a duration.
+
+        Args:
+            duration_ns: Duration in nanoseconds
+
+        Returns:
+            Bucket index
+        """
+        if duration_ns <= self.min_ns:
+            return 0
+        return 1 + int(math.log2(duration_ns / self.min_ns) * self.buckets_per_doubling)
+
+    def _upper_bound(self, index: int) -> float:
+        """Get the upper bound of a bucket in nanoseconds.
+
+        Args:
+            index: Bucket index
+
+        Returns:
+            Upper bound of the bucket
+        """
+        return self.min_ns * 2 ** (index / self.buckets_per_doubling)
+
+    def record(self, duration_ns: int) -> None:
+        """Add a duration.
+
+        Args:
+            duration_ns: Duration in nanoseconds
+        """
+        index = min(self._index(duration_ns), len(self.counts) - 1)
+        self.counts[index] += 1
+        if self.count == 0 or duration_ns < self.min_seen_ns:
+            self.min_seen_ns = duration_ns
+        if duration_ns > self.max_seen_ns:
+            self.max_seen_ns = duration_ns
+        self.count += 1
+        self.total_ns += duration_ns
+
+    def percentile(self, q: float) -> float:
+        """Estimate a percentile.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Estimated duration in nanoseconds (0 if empty)
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                # Geometric midpoint of the bucket, clamped to observed values
+                upper = self._upper_bound(index)
+                lower = self._upper_bound(index - 1) if index > 0 else 0.0
+                estimate = math.sqrt(lower * upper) if lower > 0 else upper
+                return float(min(max(estimate, self.min_seen_ns), self.max_seen_ns))
+        return float(self.max_seen_ns)
+
+class Span:
+    """Handle for one timed operation."""
+
+    __slots__ = ("monitor", "name", "parent", "start_ns", "end_ns", "success", "_token")
+
+    def __init__(self, monitor: "PerformanceMonitor", name: str):
+        """Start the span.
+
+        Args:
+            monitor: Monitor that records the span
+            name: Operation name
+        """
+        self.monitor = monitor
+        self.name = name
+        self.parent = _current_span.get()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.success = True
+        self._token = None
+
+    @property
+    def duration(self) -> float:
+        """Elapsed seconds (up to now if the span is still open)."""
+        end = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end - self.start_ns) / 1e9
+
+    def end(self, success: bool = True) -> None:
+        """End the span and record its duration.
+
+        Ending a span more than once has no effect.
+
+        Args:
+            success: Whether the operation succeeded
+        """
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.perf_counter_ns()
+        self.success = success
+        self.monitor._record(self, success)
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+        self.end(success=exc_type is None)
+
+    async def __aenter__(self) -> "Span":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.__exit__(exc_type, exc, tb)
+
+    def __repr__(self) -> str:
+        return f"Span(name={self.name!r}, duration={self.duration:.6f})"
+
+class _OperationStats:
+    """Aggregated timings of one operation."""
+
+    __slots__ = ("success_count", "histogram")
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.success_count = 0
+        self.histogram = LatencyHistogram()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the statistics as a metrics dictionary (durations in seconds)."""
+        histogram = self.histogram
+        count = histogram.count
+        return {
+            'count': count,
+            'success_count': self.success_count,
+            'total_duration': histogram.total_ns / 1e9,
+            'min_duration': histogram.min_seen_ns / 1e9,
+            'max_duration': histogram.max_seen_ns / 1e9,
+            'avg_duration': histogram.total_ns / count / 1e9 if count else 0.0,
+            'success_rate': self.success_count / count if count else 0.0,
+            'p50_duration': histogram.percentile(50) / 1e9,
+            'p95_duration': histogram.percentile(95) / 1e9,
+            'p99_duration': histogram.percentile(99) / 1e9
+        }
+
 class PerformanceMonitor:
     """Monitor and track performance metrics."""
-    
+
     def __init__(self):
         """Initialize performance monitor."""
-        self.metrics: Dict[str, Dict[str, Any]] = defaultdict(dict)
-        self.start_times: Dict[str, float] = {}
-        
-    def start_operation(self, operation_name: str) -> None:
+        self._operations: Dict[str, _OperationStats] = {}
+        # Spans opened with start_operation(name), innermost last per name
+        self._open: Dict[str, List[Span]] = defaultdict(list)
+        self.counters: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def span(self, operation_name: str) -> Span:
+        """Start timing an operation and return its handle.
+
+        The handle can be ended explicitly with end(), or used as a
+        (sync or async) context manager, which marks the operation as
+        failed if the block raises.
+
+        Args:
+            operation_name: Name of the operation to time
+
+        Returns:
+            The started span
+        """
+        return Span(self, operation_name)
+
+    def start_operation(self, operation_name: str) -> Span:
         """Start timing an operation.
-        
+
         Args:
             operation_name: Name of the operation to time
+
+        Returns:
+            The started span; pass it to end_operation to end this exact
+            operation when several with the same name overlap
         """
-        self.start_times[operation_name] = time.time()
-        
-    def end_operation(self, operation_name: str, success: bool = True) -> None:
+        span = Span(self, operation_name)
+        with self._lock:
+            self._open[operation_name].append(span)
+        return span
+
+    def end_operation(self, operation: Union[str, Span], success: bool = True) -> None:
         """End timing an operation and record metrics.
-        
+
+        Args:
+            operation: Span returned by start_operation, or an operation
+                name (ends the most recently started open span of that name)
+            success: Whether the operation succeeded
+        """
+        if isinstance(operation, Span):
+            span: Optional[Span] = operation
+        else:
+            with self._lock:
+                open_spans = self._open.get(operation)
+                span = open_spans[-1] if open_spans else None
+        if span is not None:
+            span.end(success)
+
+    def _record(self, span: Span, success: bool) -> None:
+        """Record the duration of a finished span.
+
         Args:
-            operation_name: Name of the operation
+            span: The ended span
             success: Whether the operation succeeded
         """
-        if operation_name in self.start_times:
-            duration = time.time() - self.start_times[operation_name]
-            
-            if operation_name not in self.metrics:
-                self.metrics[operation_name] = {
-                    'count': 0,
-                    'success_count': 0,
-                    'total_duration': 0,
-                    'min_duration': float('inf'),
-                    'max_duration': 0
-                }
-                
-            metrics = self.metrics[operation_name]
-            metrics['count'] += 1
+        with self._lock:
+            open_spans = self._open.get(span.name)
+            if open_spans and span in open_spans:
+                open_spans.remove(span)
+                if not open_spans:
+                    del self._open[span.name]
+            stats = self._operations.get(span.name)
+            if stats is None:
+                stats = self._operations[span.name] = _OperationStats()
+            stats.histogram.record(span.end_ns - span.start_ns)
             if success:
-                metrics['success_count'] += 1
-            metrics['total_duration'] += duration
-            metrics['min_duration'] = min(metrics['min_duration'], duration)
-            metrics['max_duration'] = max(metrics['max_duration'], duration)
-            metrics['avg_duration'] = metrics['total_duration'] / metrics['count']
-            metrics['success_rate'] = metrics['success_count'] / metrics['count']
-            
-            del self.start_times[operation_name]
-            
+                stats.success_count += 1
+
+    def increment(self, counter_name: str, amount: float = 1) -> None:
+        """Increment a named counter.
+
+        Args:
+            counter_name: Name of the counter
+            amount: Amount to add
+        """
+        with self._lock:
+            self.counters[counter_name] += amount
+
+    def get_counters(self) -> Dict[str, float]:
+        """Get all counters.
+
+        Returns:
+            Dictionary of counter values
+        """
+        with self._lock:
+            return dict(self.counters)
+
+    @property
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics of all recorded operations."""
+        return self.get_metrics()
+
     def get_metrics(self, operation_name: Optional[str] = None) -> Dict[str, Any]:
         """Get metrics for an operation or all operations.
-        
+
+        Durations are in seconds; p50/p95/p99 are histogram estimates.
+
         Args:
             operation_name: Optional name of specific operation
-            
+
         Returns:
             Dictionary of metrics
         """
-        if operation_name:
-            return self.metrics.get(operation_name, {})
-        return dict(self.metrics)
-        
+        with self._lock:
+            if operation_name:
+                stats = self._operations.get(operation_name)
+                return stats.as_dict() if stats is not None else {}
+            return {name: stats.as_dict() for name, stats in self._operations.items()}
+
     def reset(self) -> None:
         """Reset all metrics."""
-        self.metrics.clear()
-        self.start_times.clear()
+        with self._lock:
+            self._operations.clear()
+            self._open.clear()
+            self.counters.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a point-in-time copy of all metrics and counters.
+
+        Returns:
+            Dictionary with timestamp, operations and counters
+        """
+        return {
+            'timestamp': time.time(),
+            'operations': self.get_metrics(),
+            'counters': self.get_counters()
+        }
+
+_global_monitor: Optional[PerformanceMonitor] = None
+_global_lock = threading.Lock()
+_configured = False
+
+def get_monitor() -> Optional[PerformanceMonitor]:
+    """Get the process-wide monitor used by built-in instrumentation.
+
+    Instrumentation is opt-in: this returns None unless a monitor was
+    installed with set_monitor()/enable_monitoring(), or
+    MONITORING_CONFIG["enabled"] is set (e.g. via SOCRATIC_METRICS), in
+    which case a monitor and the configured exporters are started on
+    first use.
+
+    Returns:
+        The global monitor, or None if instrumentation is disabled
+    """
+    global _configured
+    if _global_monitor is None and not _configured:
+        with _global_lock:
+            if not _configured:
+                _configured = True
+                # Imported here to keep this module free of config side effects
+                from .config import MONITORING_CONFIG
+                if MONITORING_CONFIG["enabled"]:
+                    enable_monitoring()
+    return _global_monitor
+
+def set_monitor(monitor: Optional[PerformanceMonitor]) -> Optional[PerformanceMonitor]:
+    """Install (or with None, remove) the process-wide monitor.
+
+    Args:
+        monitor: Monitor receiving built-in instrumentation
+
+    Returns:
+        The previously installed monitor
+    """
+    global _global_monitor, _configured
+    with _global_lock:
+        previous = _global_monitor
+        _global_monitor = monitor
+        _configured = True
+    return previous
+
+def enable_monitoring(monitor: Optional[PerformanceMonitor] = None,
+                      start_exporters: bool = True) -> PerformanceMonitor:
+    """Install a process-wide monitor and start the configured exporters.
+
+    Exporters are taken from MONITORING_CONFIG: a Prometheus endpoint when
+    "prometheus_port" is set and a JSON snapshot file when
+    "snapshot_path" is set.
+
+    Args:
+        monitor: Monitor to install (creates a new one if None)
+        start_exporters: Whether to start the configured exporters
+
+    Returns:
+        The installed monitor
+    """
+    monitor = monitor or _global_monitor or PerformanceMonitor()
+    set_monitor(monitor)
+    if start_exporters:
+        from .config import MONITORING_CONFIG
+        from .export import JsonSnapshotWriter, start_prometheus_server
+        if MONITORING_CONFIG.get("prometheus_port"):
+            start_prometheus_server(monitor, port=int(MONITORING_CONFIG["prometheus_port"]))
+        if MONITORING_CONFIG.get("snapshot_path"):
+            JsonSnapshotWriter(
+                monitor,
+                MONITORING_CONFIG["snapshot_path"],
+                interval=MONITORING_CONFIG["snapshot_interval"]
+            ).start()
+    return monitor
+
+class _NoSpan:
+    """Stand-in span used when instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def end(self, success: bool = True) -> None:
+        pass
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+    async def __aenter__(self) -> "_NoSpan":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        pass
+
+_NO_SPAN = _NoSpan()
+
+def span(operation_name: str) -> Union[Span, _NoSpan]:
+    """Time an operation on the process-wide monitor, if one is installed.
+
+    Args:
+        operation_name: Name of the operation to time
+
+    Returns:
+        A started span, or a no-op stand-in when instrumentation is disabled
+    """
+    monitor = get_monitor()
+    return monitor.span(operation_name) if monitor is not None else _NO_SPAN
+
+def increment(counter_name: str, amount: float = 1) -> None:
+    """Increment a counter on the process-wide monitor, if one is installed.
+
+    Args:
+        counter_name: Name of the counter
+        amount: Amount to add
+    """
+    monitor = get_monitor()
+    if monitor is not None:
+        monitor.increment(counter_name, amount)
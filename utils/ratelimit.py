@@ -0,0 +1,436 @@
+"""Rate limiting and retry scheduling for remote calls.
+
+This module smooths traffic to Mem0 and the language model provider:
+
+1. TokenBucket: thread- and asyncio-safe token bucket that reserves
+   capacity up front, so waiting callers are served in arrival order
+2. RetryScheduler: runs a call through a token bucket and retries
+   transient failures with jittered exponential backoff, capped per attempt
+   and bounded by a total deadline
+3. get_scheduler: process-wide schedulers configured from
+   MEM0_CONFIG["rate_limit"] and OPENAI_CONFIG["rate_limit"]
+
+Schedulers expose queue-depth, throttle and retry metrics. When the
+process-wide monitor is installed (see utils/monitoring.get_monitor), each
+call is also timed as "<scheduler>.<function>" (e.g. "mem0.search") and
+retry, failure and throttle counters are reported as "<scheduler>.<counter>".
+"""
+
+import time
+import random
+import asyncio
+import logging
+import threading
+import functools
+from typing import Any, Callable, Dict, Optional
+
+from . import monitoring
+from .config import MEM0_CONFIG, OPENAI_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# HTTP status codes worth retrying
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# Exception class name fragments that indicate transient failures
+RETRYABLE_NAMES = ("RateLimit", "Timeout", "Connection", "ServiceUnavailable", "InternalServer")
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """Extract an HTTP status code from an exception, if any.
+
+    Args:
+        error: Exception raised by a client
+
+    Returns:
+        The status code, or None
+    """
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Check whether an exception signals a provider rate limit.
+
+    Args:
+        error: Exception raised by a client
+
+    Returns:
+        True for HTTP 429 or rate-limit exception types
+    """
+    return _status_code(error) == 429 or "RateLimit" in type(error).__name__
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Check whether an exception is a transient failure worth retrying.
+
+    Args:
+        error: Exception raised by a client
+
+    Returns:
+        True for rate limits, timeouts, connection and 5xx errors
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    name = type(error).__name__
+    return any(fragment in name for fragment in RETRYABLE_NAMES)
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Read a Retry-After hint from an exception's response, if any.
+
+    Args:
+        error: Exception raised by a client
+
+    Returns:
+        Seconds to wait, or None
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    try:
+        return float(headers.get("retry-after")) if headers else None
+    except (TypeError, ValueError):
+        return None
+
+class RetryDeadlineExceeded(TimeoutError):
+    """Raised when a call keeps failing past its scheduler's deadline."""
+
+class TokenBucket:
+    """Token bucket rate limiter shared by threads and async tasks.
+
+    Each acquire reserves its tokens immediately (the balance may go
+    negative) and then sleeps until the reservation is covered, so callers
+    are served in arrival order without polling.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to rate)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.max_waiting = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+    def _reserve(self, tokens: float) -> float:
+        """Reserve tokens and compute how long the caller must wait.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds to wait before proceeding
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            wait = -self._tokens / self.rate
+            self.throttled += 1
+            self.total_wait += wait
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            return wait
+
+    def _release_waiter(self) -> None:
+        """Mark a throttled caller as no longer waiting."""
+        with self._lock:
+            self.waiting -= 1
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Block the current thread until tokens are available.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            try:
+                time.sleep(wait)
+            finally:
+                self._release_waiter()
+        return wait
+
+    async def aacquire(self, tokens: float = 1) -> float:
+        """Wait without blocking the event loop until tokens are available.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._release_waiter()
+        return wait
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get throttling metrics.
+
+        Returns:
+            Dictionary with queue depth and throttle counters
+        """
+        with self._lock:
+            return {
+                'queue_depth': self.waiting,
+                'max_queue_depth': self.max_waiting,
+                'throttled': self.throttled,
+                'total_throttle_wait': self.total_wait
+            }
+
+class RetryScheduler:
+    """Run calls through a rate limiter and retry transient failures."""
+
+    def __init__(self, name: str, limiter: Optional[TokenBucket] = None,
+                 max_retries: int = 3, retry_delay: float = 0.5,
+                 rate_limit_delay: float = 2.0, max_delay: float = 5.0,
+                 deadline: Optional[float] = 30.0):
+        """Initialize the scheduler.
+
+        Args:
+            name: Name used in logs and metrics
+            limiter: Optional token bucket applied to every attempt
+            max_retries: Retries after the first attempt
+            retry_delay: Base backoff delay in seconds
+            rate_limit_delay: Delay after a rate-limit error
+            max_delay: Maximum seconds slept before any one retry
+            deadline: Seconds after the first attempt beyond which no
+                retry is started (None for no limit)
+        """
+        self.name = name
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.rate_limit_delay = rate_limit_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self._lock = threading.Lock()
+        self.stats: Dict[str, float] = {
+            'calls': 0, 'retries': 0, 'failures': 0, 'rate_limited': 0,
+            'deadline_exceeded': 0, 'backoff_time': 0.0
+        }
+
+    @classmethod
+    def from_config(cls, name: str, config: Dict[str, Any]) -> "RetryScheduler":
+        """Build a scheduler from a rate_limit configuration block.
+
+        Args:
+            name: Scheduler name
+            config: Dictionary with max_retries, backoff_delay,
+                rate_limit_backoff, max_backoff, deadline,
+                requests_per_second and burst keys
+
+        Returns:
+            Configured scheduler
+        """
+        rate = config.get("requests_per_second")
+        limiter = TokenBucket(rate, config.get("burst")) if rate else None
+        return cls(
+            name,
+            limiter=limiter,
+            max_retries=config.get("max_retries", 3),
+            retry_delay=config.get("backoff_delay", 0.5),
+            rate_limit_delay=config.get("rate_limit_backoff", 2.0),
+            max_delay=config.get("max_backoff", 5.0),
+            deadline=config.get("deadline", 30.0)
+        )
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self.stats[key] += amount
+        monitoring.increment(f"{self.name}.{key}", amount)
+
+    def _throttled(self, wait: float) -> None:
+        """Report time spent waiting for the rate limiter.
+
+        Args:
+            wait: Seconds waited
+        """
+        if wait > 0:
+            monitoring.increment(f"{self.name}.throttle_wait", wait)
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """Compute the jittered delay before the next attempt.
+
+        Uses the provider's Retry-After hint when present, rate_limit_delay
+        for rate-limit errors, and otherwise exponential backoff from
+        retry_delay, always capped at max_delay. The delay is jittered with
+        "equal jitter" (half fixed, half random) so retrying callers spread
+        out instead of returning in a burst.
+
+        Args:
+            attempt: Zero-based index of the failed attempt
+            error: The exception that caused the retry
+
+        Returns:
+            Seconds to wait
+        """
+        delay = _retry_after(error)
+        if delay is None and is_rate_limit_error(error):
+            delay = self.rate_limit_delay
+        if delay is None:
+            delay = self.retry_delay * (2 ** attempt)
+        delay = min(delay, self.max_delay)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _should_retry(self, attempt: int, error: BaseException) -> bool:
+        """Record a failure and decide whether to retry it.
+
+        Args:
+            attempt: Zero-based index of the failed attempt
+            error: The exception raised by the attempt
+
+        Returns:
+            True if another attempt should be made
+        """
+        if is_rate_limit_error(error):
+            self._count('rate_limited')
+        if attempt >= self.max_retries or not is_retryable_error(error):
+            self._count('failures')
+            return False
+        self._count('retries')
+        return True
+
+    def _next_delay(self, attempt: int, error: BaseException, started: float) -> float:
+        """Compute the delay before retrying, enforcing the deadline.
+
+        Args:
+            attempt: Zero-based index of the failed attempt
+            error: The exception raised by the attempt
+            started: time.monotonic() of the first attempt
+
+        Returns:
+            Seconds to wait
+
+        Raises:
+            RetryDeadlineExceeded: If the retry would start after the deadline
+        """
+        delay = self.backoff(attempt, error)
+        if self.deadline is not None and time.monotonic() - started + delay > self.deadline:
+            self._count('deadline_exceeded')
+            raise RetryDeadlineExceeded(
+                f"{self.name} call still failing after {self.deadline:.0f}s: {str(error)}"
+            ) from error
+        logger.warning(f"{self.name} call failed ({str(error)}); retrying in {delay:.1f}s")
+        self._count('backoff_time', delay)
+        return delay
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call a function under the rate limit, retrying transient errors.
+
+        Args:
+            func: Function to call
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            The function's result
+
+        Raises:
+            RetryDeadlineExceeded: If retries would run past the deadline
+        """
+        self._count('calls')
+        attempt = 0
+        started = time.monotonic()
+        with monitoring.span(f"{self.name}.{getattr(func, '__name__', 'call')}"):
+            while True:
+                if self.limiter is not None:
+                    self._throttled(self.limiter.acquire())
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if not self._should_retry(attempt, e):
+                        raise
+                    time.sleep(self._next_delay(attempt, e, started))
+                    attempt += 1
+
+    async def acall(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Asynchronously call a function under the rate limit with retries.
+
+        Coroutine functions are awaited; blocking functions run in the
+        default executor.
+
+        Args:
+            func: Function or coroutine function to call
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            The function's result
+
+        Raises:
+            RetryDeadlineExceeded: If retries would run past the deadline
+        """
+        self._count('calls')
+        attempt = 0
+        started = time.monotonic()
+        async with monitoring.span(f"{self.name}.{getattr(func, '__name__', 'call')}"):
+            while True:
+                if self.limiter is not None:
+                    self._throttled(await self.limiter.aacquire())
+                try:
+                    if asyncio.iscoroutinefunction(func):
+                        return await func(*args, **kwargs)
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+                except Exception as e:
+                    if not self._should_retry(attempt, e):
+                        raise
+                    await asyncio.sleep(self._next_delay(attempt, e, started))
+                    attempt += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get retry and throttling metrics.
+
+        Returns:
+            Dictionary of call, retry and limiter metrics
+        """
+        with self._lock:
+            metrics: Dict[str, Any] = dict(self.stats)
+        if self.limiter is not None:
+            metrics.update(self.limiter.get_metrics())
+        return metrics
+
+_SCHEDULER_CONFIGS: Dict[str, Dict[str, Any]] = {
+    "mem0": MEM0_CONFIG["rate_limit"],
+    "lm": OPENAI_CONFIG["rate_limit"],
+}
+_schedulers: Dict[str, RetryScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+def get_scheduler(name: str) -> RetryScheduler:
+    """Get the process-wide scheduler for a remote service.
+
+    Args:
+        name: "mem0" or "lm"; other names get an unlimited scheduler
+
+    Returns:
+        The shared scheduler for that service
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(name)
+        if scheduler is None:
+            scheduler = RetryScheduler.from_config(name, _SCHEDULER_CONFIGS.get(name, {}))
+            _schedulers[name] = scheduler
+        return scheduler
@@ -0,0 +1,383 @@
+"""Record and replay of language model and memory I/O.
+
+A TraceRecorder captures every SocraticPredictor call and every traced
+memory call (search, add, get_all) with its timing into an append-only
+JSON-lines trace file (gzip-compressed when the path ends in ".gz"). A
+TraceReplayer serves the recorded responses offline, sleeping for the
+recorded duration divided by a speed factor, so recorded sessions can be
+replayed through ReasoningGame and ReasoningJudge without API keys.
+
+Install a session process-wide with set_trace(), through TRACE_CONFIG
+(SOCRATIC_TRACE_RECORD / SOCRATIC_TRACE_REPLAY / SOCRATIC_TRACE_SPEED), or
+by using the recorder or replayer as a context manager:
+
+    with TraceRecorder("session.trace.jsonl.gz"):
+        game = ReasoningGame()
+        game.forward("When was Obama born?")
+
+    with TraceReplayer("session.trace.jsonl.gz", speed=2.0):
+        game = ReasoningGame()
+        game.forward("When was Obama born?")
+
+Calls are matched by a hash of their kind, operation and request. Repeated
+identical requests are served in recorded order.
+"""
+
+import gzip
+import json
+import time
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, IO, Optional, Union
+
+from .cache import hash_key
+
+logger = logging.getLogger(__name__)
+
+class TraceMissError(LookupError):
+    """Raised when a replayed call has no recorded response."""
+
+def _open(path: str, mode: str) -> IO[str]:
+    """Open a trace file, compressed if the path ends in ".gz".
+
+    Args:
+        path: Trace file path
+        mode: "a" to append or "r" to read
+
+    Returns:
+        Text file object
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def request_key(kind: str, operation: str, request: Any) -> str:
+    """Build the key that matches a replayed call to its recording.
+
+    Args:
+        kind: "lm" or "memory"
+        operation: Operation name, e.g. a signature or "search"
+        request: JSON-serializable request
+
+    Returns:
+        Request hash
+    """
+    return hash_key(kind, operation, request)
+
+class _TraceSession(ABC):
+    """Common interface of recorders and replayers."""
+
+    @abstractmethod
+    def call(self, kind: str, operation: str, request: Any, func: Callable[[], Any],
+             encode: Callable[[Any], Any] = lambda value: value,
+             decode: Callable[[Any], Any] = lambda value: value) -> Any:
+        """Run (or replay) a call.
+
+        Args:
+            kind: "lm" or "memory"
+            operation: Operation name
+            request: JSON-serializable request
+            func: Performs the call
+            encode: Converts the response to JSON-serializable data
+            decode: Converts recorded data back to a response
+
+        Returns:
+            The call's response
+        """
+
+    @abstractmethod
+    async def acall(self, kind: str, operation: str, request: Any, func: Callable[[], Any],
+                    encode: Callable[[Any], Any] = lambda value: value,
+                    decode: Callable[[Any], Any] = lambda value: value) -> Any:
+        """Run (or replay) an async call (see call)."""
+
+    def close(self) -> None:
+        """Release the session's resources."""
+
+    def __enter__(self):
+        self._previous = set_trace(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        set_trace(self._previous)
+        self.close()
+
+class TraceRecorder(_TraceSession):
+    """Record calls and their responses to an append-only trace file."""
+
+    def __init__(self, path: str, include_requests: bool = True):
+        """Initialize the recorder.
+
+        Args:
+            path: Trace file (appended to; gzip-compressed if it ends in ".gz")
+            include_requests: Whether to store request bodies alongside
+                their keys (useful for inspection, not needed for replay)
+        """
+        self.path = path
+        self.include_requests = include_requests
+        self.records = 0
+        self._file = _open(path, "a")
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def _write(self, kind: str, operation: str, request: Any, started: float,
+               duration: float, response: Any = None, error: Optional[str] = None) -> None:
+        """Append one record.
+
+        Args:
+            kind: "lm" or "memory"
+            operation: Operation name
+            request: JSON-serializable request
+            started: perf_counter value when the call started
+            duration: Call duration in seconds
+            response: Encoded response
+            error: Error message if the call failed
+        """
+        record: Dict[str, Any] = {
+            'k': kind,
+            'op': operation,
+            'key': request_key(kind, operation, request),
+            't': round(started - self._start, 6),
+            'd': round(duration, 6)
+        }
+        if self.include_requests:
+            record['req'] = request
+        if error is not None:
+            record['err'] = error
+        else:
+            record['res'] = response
+        line = json.dumps(record, separators=(",", ":"), default=str, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.records += 1
+
+    def call(self, kind: str, operation: str, request: Any, func: Callable[[], Any],
+             encode: Callable[[Any], Any] = lambda value: value,
+             decode: Callable[[Any], Any] = lambda value: value) -> Any:
+        """Run a call and record it.
+
+        Args:
+            kind: "lm" or "memory"
+            operation: Operation name
+            request: JSON-serializable request
+            func: Performs the call
+            encode: Converts the response to JSON-serializable data
+            decode: Unused when recording
+
+        Returns:
+            The call's response
+        """
+        started = time.perf_counter()
+        try:
+            response = func()
+        except Exception as e:
+            self._write(kind, operation, request, started, time.perf_counter() - started, error=str(e))
+            raise
+        self._write(kind, operation, request, started, time.perf_counter() - started, encode(response))
+        return response
+
+    async def acall(self, kind: str, operation: str, request: Any, func: Callable[[], Any],
+                    encode: Callable[[Any], Any] = lambda value: value,
+                    decode: Callable[[Any], Any] = lambda value: value) -> Any:
+        """Await a call and record it.
+
+        Args:
+            kind: "lm" or "memory"
+            operation: Operation name
+            request: JSON-serializable request
+            func: Returns an awaitable performing the call
+            encode: Converts the response to JSON-serializable data
+            decode: Unused when recording
+
+        Returns:
+            The call's response
+        """
+        started = time.perf_counter()
+        try:
+            response = await func()
+        except Exception as e:
+            self._write(kind, operation, request, started, time.perf_counter() - started, error=str(e))
+            raise
+        self._write(kind, operation, request, started, time.perf_counter() - started, encode(response))
+        return response
+
+    def close(self) -> None:
+        """Close the trace file."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+class TraceReplayer(_TraceSession):
+    """Serve recorded responses offline."""
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0):
+        """Load a trace.
+
+        Args:
+            path: Trace file written by TraceRecorder
+            speed: Replay speed relative to the recording (2.0 is twice as
+                fast); None replays without any delay
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive or None")
+        self.path = path
+        self.speed = speed
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._records: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._last: Dict[str, Dict[str, Any]] = {}
+        with _open(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self._records[record['key']].append(record)
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._records.values())
+
+    def _next(self, kind: str, operation: str, request: Any) -> Dict[str, Any]:
+        """Take the next recorded response for a request.
+
+        Once the recordings of a request are used up, the last one is
+        served again.
+
+        Args:
+            kind: "lm" or "memory"
+            operation: Operation name
+            request: JSON-serializable request
+
+        Returns:
+            The record
+
+        Raises:
+            TraceMissError: If the request was never recorded
+        """
+        key = request_key(kind, operation, request)
+        with self._lock:
+            records = self._records.get(key)
+            if records:
+                record = records.popleft()
+                self._last[key] = record
+            else:
+                record = self._last.get(key)
+            if record is None:
+                self.misses += 1
+                raise TraceMissError(f"No recorded {kind} response for {operation}")
+            self.hits += 1
+        return record
+
+    def _delay(self, record: Dict[str, Any]) -> float:
+        """Seconds to wait before serving a record."""
+        if self.speed is None:
+            return 0.0
+        return record.get('d', 0.0) / self.speed
+
+    @staticmethod
+    def _result(record: Dict[str, Any], decode: Callable[[Any], Any]) -> Any:
+        """Decode a record's response or re-raise its recorded error."""
+        if 'err' in record:
+            raise RuntimeError(record['err'])
+        return decode(record.get('res'))
+
+    def call(self, kind: str, operation: str, request: Any, func: Callable[[], Any],
+             encode: Callable[[Any], Any] = lambda value: value,
+             decode: Callable[[Any], Any] = lambda value: value) -> Any:
+        """Serve a recorded response instead of making the call.
+
+        Args:
+            kind: "lm" or "memory"
+            operation: Operation name
+            request: JSON-serializable request
+            func: Not called
+            encode: Unused when replaying
+            decode: Converts recorded data back to a response
+
+        Returns:
+            The recorded response
+        """
+        record = self._next(kind, operation, request)
+        delay = self._delay(record)
+        if delay > 0:
+            time.sleep(delay)
+        return self._result(record, decode)
+
+    async def acall(self, kind: str, operation: str, request: Any, func: Callable[[], Any],
+                    encode: Callable[[Any], Any] = lambda value: value,
+                    decode: Callable[[Any], Any] = lambda value: value) -> Any:
+        """Serve a recorded response without blocking the event loop.
+
+        Args:
+            kind: "lm" or "memory"
+            operation: Operation name
+            request: JSON-serializable request
+            func: Not called
+            encode: Unused when replaying
+            decode: Converts recorded data back to a response
+
+        Returns:
+            The recorded response
+        """
+        record = self._next(kind, operation, request)
+        delay = self._delay(record)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self._result(record, decode)
+
+TraceSession = Union[TraceRecorder, TraceReplayer]
+
+_trace: Optional[TraceSession] = None
+_configured = False
+_trace_lock = threading.Lock()
+
+def get_trace() -> Optional[TraceSession]:
+    """Get the active process-wide trace session.
+
+    Tracing is opt-in: this returns None unless a session was installed
+    with set_trace(), or TRACE_CONFIG names a file to record to or replay
+    from, in which case that session is started on first use.
+
+    Returns:
+        The recorder or replayer, or None if tracing is off
+    """
+    global _trace, _configured
+    if _trace is None and not _configured:
+        with _trace_lock:
+            if not _configured:
+                _configured = True
+                # Imported here to keep this module free of config side effects
+                from .config import TRACE_CONFIG
+                if TRACE_CONFIG["replay_path"]:
+                    _trace = TraceReplayer(TRACE_CONFIG["replay_path"],
+                                           speed=TRACE_CONFIG["replay_speed"] or None)
+                elif TRACE_CONFIG["record_path"]:
+                    _trace = TraceRecorder(TRACE_CONFIG["record_path"],
+                                           include_requests=TRACE_CONFIG["include_requests"])
+    return _trace
+
+def set_trace(trace: Optional[TraceSession]) -> Optional[TraceSession]:
+    """Install (or with None, remove) the process-wide trace session.
+
+    Args:
+        trace: Recorder or replayer
+
+    Returns:
+        The previously installed session
+    """
+    global _trace, _configured
+    with _trace_lock:
+        _configured = True
+        previous, _trace = _trace, trace
+    return previous
+
+def is_replaying() -> bool:
+    """Whether responses are currently served from a trace.
+
+    Returns:
+        True if a TraceReplayer is installed
+    """
+    return isinstance(get_trace(), TraceReplayer)